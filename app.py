@@ -4,15 +4,15 @@ import numpy as np
 import requests
 import time
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, as_completed, Future
 from urllib.parse import quote
 import re
 from collections import Counter, defaultdict
 import json
 from datetime import datetime, timedelta
 import io
+import calendar
 import plotly.graph_objects as go
-import plotly.express as px
 from plotly.subplots import make_subplots
 import base64
 import os
@@ -28,7 +28,24 @@ import httpx
 import asyncio
 from contextlib import asynccontextmanager
 import diskcache
-from functools import wraps
+import itertools
+import uuid
+import importlib.util
+from functools import wraps, lru_cache
+from types import MappingProxyType
+from openpyxl.styles import Font
+from openpyxl.cell import WriteOnlyCell
+
+# Fast Excel writer backend (xlsxwriter is the default engine; openpyxl remains the fallback)
+# Только проверяем наличие пакета: сам модуль импортирует pandas при создании ExcelWriter
+FAST_EXCEL_AVAILABLE = importlib.util.find_spec('xlsxwriter') is not None
+
+# Fast JSON backend for packed session payloads (stdlib json is the fallback)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Import translation manager
 from languages import translation_manager
@@ -49,12 +66,23 @@ _orcid_search_cache = {}
 _article_data_cache = {}
 _journal_info_cache = {}
 
+def work_cache_key(metadata):
+    """Ключ кэша по идентификатору работы (DOI / OpenAlex ID) вместо сериализации всего JSON"""
+    if isinstance(metadata, dict):
+        crossref = metadata.get('crossref') or {}
+        openalex = metadata.get('openalex') or {}
+        work_id = crossref.get('DOI') or openalex.get('id') or metadata.get('id')
+        if work_id:
+            return work_id
+        return hash(json.dumps(metadata, sort_keys=True, default=str))
+    return hash(str(metadata))
+
 def cached_extract_article_data(metadata):
     """Кэшированное извлечение всех данных статьи"""
     if not metadata:
         return {'authors': [], 'affiliations': [], 'countries': []}
     
-    cache_key = hash(json.dumps(metadata, sort_keys=True) if isinstance(metadata, dict) else str(metadata))
+    cache_key = work_cache_key(metadata)
     if cache_key in _article_data_cache:
         return _article_data_cache[cache_key]
     
@@ -74,7 +102,7 @@ def cached_extract_journal_info(metadata):
     if not metadata:
         return {'issn': [], 'journal_name': '', 'publisher': ''}
     
-    cache_key = hash(json.dumps(metadata, sort_keys=True) if isinstance(metadata, dict) else str(metadata))
+    cache_key = work_cache_key(metadata)
     if cache_key in _journal_info_cache:
         return _journal_info_cache[cache_key]
     
@@ -82,8 +110,18 @@ def cached_extract_journal_info(metadata):
     _journal_info_cache[cache_key] = result
     return result
 
+# Результаты извлечения по работам ключуются только DOI / OpenAlex ID, поэтому живут
+# в пределах одного анализа: после обновления метаданных старые поля не возвращаются
+_work_extraction_caches = (_article_data_cache, _journal_info_cache, _author_extraction_cache)
+
+def clear_work_caches():
+    """Очистить кэши извлечения данных по работам (начало/конец анализа, очистка кэша DOI)"""
+    for cache_dict in _work_extraction_caches:
+        cache_dict.clear()
+
 def clear_old_cache():
     """Clear outdated caches to free memory"""
+    clear_work_caches()
     current_time = time.time()
     cache_dicts = [
         _issn_normalization_cache, _journal_search_cache, _author_extraction_cache,
@@ -124,7 +162,7 @@ def cached_extract_authors(openalex_data):
     if not openalex_data:
         return [], [], []
     
-    cache_key = hash(json.dumps(openalex_data, sort_keys=True) if isinstance(openalex_data, dict) else str(openalex_data))
+    cache_key = work_cache_key(openalex_data)
     if cache_key in _author_extraction_cache:
         return _author_extraction_cache[cache_key]
     
@@ -785,7 +823,7 @@ class APIClientBase:
     def _make_request(self, url: str, headers: Optional[Dict] = None, timeout: int = 30) -> Optional[Dict]:
         """Make HTTP request with retry logic"""
         try:
-            response = requests.get(url, headers=headers, timeout=timeout)
+            response = HTTP_SESSION.get(url, headers=headers, timeout=timeout)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -992,7 +1030,7 @@ class DataProcessor:
     
     def _extract_publication_date(self, crossref_data: Dict) -> Optional[datetime]:
         """Extract publication date from Crossref data"""
-        date_parts = crossref_data.get('published', {}).get('date-parts', [[]])[0]
+        date_parts = crossref_data.get('published', EMPTY_MAPPING).get('date-parts', NO_DATE_PARTS)[0]
         if date_parts and len(date_parts) >= 1:
             try:
                 year = date_parts[0]
@@ -1056,7 +1094,7 @@ class DataProcessor:
                 continue
             
             # Validate publication date
-            date_parts = item.get('created', {}).get('date-parts', [[]])[0]
+            date_parts = item.get('created', EMPTY_MAPPING).get('date-parts', NO_DATE_PARTS)[0]
             if not date_parts or date_parts[0] < 1900:
                 skipped_count += 1
                 continue
@@ -1229,6 +1267,7 @@ class AnalysisState:
         self.progress_text = ""
         self.analysis_complete = False
         self.excel_buffer = None
+        self.excel_filename = None
         self.if_data = None
         self.cs_data = None
         self.is_special_analysis = False
@@ -1236,11 +1275,15 @@ class AnalysisState:
         self.ror_cache = {}  # NEW: In-memory cache for ROR data
         self.include_author_id_data = False  # NEW: Flag for Author ID data inclusion
         self.author_id_cache = {}  # NEW: In-memory cache for Author ID data
+        self.pipeline_cache = {}  # Результаты анализа по (ISSN, период, режимы): (время, данные)
+        self.figure_cache = {}  # Фигуры дашборда по (id результатов, язык, имя графика)
         
         # Initialize components
         self.config = AnalysisConfig()
         self.logger = AnalysisLogger()
         self.cache_manager = CacheManager()
+        # Метаданные DOI - в отдельном дисковом кэше: кнопка очистки не трогает кэш клиентов API
+        self.doi_cache = CacheManager(cache_dir=DOI_CACHE_DIR)
         self.crossref_client = CrossrefClient(self.config, self.logger, self.cache_manager)
         self.openalex_client = OpenAlexClient(self.config, self.logger, self.cache_manager)
         self.data_processor = DataProcessor(self.logger)
@@ -1261,8 +1304,41 @@ st.set_page_config(
 # --- Global Settings ---
 EMAIL = st.secrets.get("EMAIL", "your.email@example.com") if hasattr(st, 'secrets') else "your.email@example.com"
 MAX_WORKERS = 5
+PIPELINE_CACHE_TTL = 24 * 3600  # Время жизни кэша результатов анализа в сессии (сек)
+PIPELINE_CACHE_MAX_ENTRIES = 3  # Сколько последних анализов держать в кэше сессии
+DOI_CACHE_TTL = 7 * 24 * 3600  # Время жизни дискового кэша метаданных DOI (сек)
+DOI_CACHE_DIR = "./journal_cache_doi"  # Каталог дискового кэша метаданных DOI
 RETRIES = 3
+
+# Общие неизменяемые значения по умолчанию для dict.get: не создаются заново при каждом вызове
+EMPTY_MAPPING = MappingProxyType({})
+NO_DATE_PARTS = ((),)  # 'date-parts' отсутствует -> [0] дает пустую дату
+NA_PAIR = ('N/A', 'N/A')
+
+# Одна HTTP-сессия на процесс: потоки загрузки переиспользуют keep-alive соединения
+# с Crossref/OpenAlex вместо нового TCP/TLS рукопожатия на каждый DOI
+@st.cache_resource
+def get_http_session():
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=MAX_WORKERS * 2)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+HTTP_SESSION = get_http_session()
 DELAYS = [0.2, 0.5, 0.7, 1.0, 1.3, 1.5, 2.0]
+USE_FAST_EXCEL = st.secrets.get("USE_FAST_EXCEL", True) if hasattr(st, 'secrets') else True
+EXCEL_ENGINE = 'xlsxwriter' if USE_FAST_EXCEL and FAST_EXCEL_AVAILABLE else 'openpyxl'
+# Потоковые режимы движков: xlsxwriter constant_memory сбрасывает каждую строку сразу,
+# openpyxl write_only не держит объекты Cell всех листов в памяти (строки только добавляются)
+EXCEL_ENGINE_KWARGS = (
+    {'options': {'constant_memory': True, 'use_zip64': True}} if EXCEL_ENGINE == 'xlsxwriter'
+    else {'write_only': True}
+)
+
+# Фрагменты UI перезапускаются только при взаимодействии с их виджетами (st.fragment в Streamlit >= 1.37,
+# st.experimental_fragment с 1.33); в более старых версиях функция просто выполняется целиком
+ui_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None) or (lambda func: func)
 
 # --- State Storage Classes ---
 class OriginalAnalysisState:
@@ -1278,6 +1354,7 @@ class OriginalAnalysisState:
         self.progress_text = ""
         self.analysis_complete = False
         self.excel_buffer = None
+        self.excel_filename = None
         self.if_data = None
         self.cs_data = None
         self.is_special_analysis = False  # New flag for Special Analysis mode
@@ -1409,9 +1486,16 @@ class JournalAnalysisGlossary:
             'Technical': '⚫',
             'Databases': '🟤'
         }
+        
+        # Термины статичны: подписи для списка выбора и результаты запросов считаются один раз
+        self.term_labels = {term: f"{term} ({info['category']})" for term, info in self.terms.items()}
+        self._tooltip_cache = {}
+        self._detailed_info_cache = {}
     
     def get_tooltip(self, term):
         """Generate text for tooltip"""
+        if term in self._tooltip_cache:
+            return self._tooltip_cache[term]
         if term not in self.terms:
             return f"Term '{term}' not found in dictionary"
         
@@ -1422,11 +1506,14 @@ class JournalAnalysisGlossary:
             tooltip += f"\n\n**Calculation:** {info['calculation']}"
         if 'interpretation' in info:
             tooltip += f"\n\n**Interpretation:** {info['interpretation']}"
-            
+        
+        self._tooltip_cache[term] = tooltip
         return tooltip
     
     def get_detailed_info(self, term):
         """Complete term information for extended tooltips"""
+        if term in self._detailed_info_cache:
+            return self._detailed_info_cache[term]
         if term not in self.terms:
             return None
         
@@ -1442,6 +1529,7 @@ class JournalAnalysisGlossary:
             'example': info.get('example', 'Example not provided')
         }
         
+        self._detailed_info_cache[term] = detailed
         return detailed
     
     def get_terms_by_category(self, category):
@@ -1452,8 +1540,32 @@ class JournalAnalysisGlossary:
         """Random term for learning"""
         return random.choice(list(self.terms.keys()))
 
-# Initialize global dictionary
-glossary = JournalAnalysisGlossary()
+# Глоссарий строится один раз на процесс для каждого языка, а не заново при каждом rerun скрипта.
+# JournalAnalysisGlossary берет часть определений из активного языка, поэтому language - ключ кэша,
+# а сборка выполняется только через get_glossary() после translation_manager.set_language
+@st.cache_resource(show_spinner=False)
+def _glossary_for_language(language):
+    return JournalAnalysisGlossary()
+
+def get_glossary():
+    """Глоссарий для текущего языка интерфейса"""
+    return _glossary_for_language(translation_manager.current_language)
+
+# Термины глоссария статичны - результаты запросов из UI кэшируются между rerun Streamlit
+# (language в аргументах - ключ кэша, сам глоссарий берется для текущего языка)
+@st.cache_data(show_spinner=False)
+def _cached_detailed_info(term, language):
+    return get_glossary().get_detailed_info(term)
+
+@st.cache_data(show_spinner=False)
+def _cached_tooltip(term, language):
+    return get_glossary().get_tooltip(term)
+
+def cached_detailed_info(term):
+    return _cached_detailed_info(term, translation_manager.current_language)
+
+def cached_tooltip(term):
+    return _cached_tooltip(term, translation_manager.current_language)
 
 # --- State Initialization ---
 def initialize_analysis_state():
@@ -1506,10 +1618,23 @@ class AdaptiveDelayer:
             else:
                 self.delay_index = min(self.delay_index + 1, len(DELAYS) - 1)
             delay = DELAYS[self.delay_index]
-            time.sleep(delay)
-            return delay
+        # Спим вне блокировки: общий на процесс delayer не должен выстраивать в очередь
+        # потоки других анализов (сессий) за чужой задержкой
+        time.sleep(delay)
+        return delay
+
+# Задержка и пул потоков загрузки создаются один раз на процесс, а не на каждый rerun/анализ.
+# Состояние задержки общее для всех сессий (один и тот же API) и между анализами не сбрасывается
+@st.cache_resource
+def get_delayer():
+    return AdaptiveDelayer()
+
+@st.cache_resource
+def get_fetch_executor():
+    """Общий пул потоков для загрузки метаданных и цитирований (не закрывается)"""
+    return ThreadPoolExecutor(max_workers=MAX_WORKERS)
 
-delayer = AdaptiveDelayer()
+delayer = get_delayer()
 
 # --- Configuration ---
 class JournalAnalyzerConfig:
@@ -1579,7 +1704,7 @@ def validate_and_clean_data(items):
             skipped_count += 1
             continue
             
-        date_parts = item.get('created', {}).get('date-parts', [[]])[0]
+        date_parts = item.get('created', EMPTY_MAPPING).get('date-parts', NO_DATE_PARTS)[0]
         if not date_parts or date_parts[0] < 1900:
             skipped_count += 1
             continue
@@ -1600,7 +1725,7 @@ def get_journal_name(issn):
     for _ in range(RETRIES):
         try:
             rate_limiter.wait_if_needed()
-            resp = requests.get(url, timeout=10)
+            resp = HTTP_SESSION.get(url, timeout=10)
             if resp.status_code == 200:
                 data = resp.json()
                 if data['meta']['count'] > 0:
@@ -1621,15 +1746,22 @@ def get_crossref_metadata(doi, state):
         return state.crossref_cache[doi]
     if not doi or doi == 'N/A':
         return None
+    # Дисковый кэш (diskcache) переживает перезапуски и новые сессии
+    disk_key = f"crossref:{doi}"
+    data = state.doi_cache.get(disk_key)
+    if data is not None:
+        state.crossref_cache[doi] = data
+        return data
     url = f"https://api.crossref.org/works/{quote(doi)}"
     headers = {'User-Agent': f"YourApp/1.0 (mailto:{EMAIL})"}
     for _ in range(RETRIES):
         try:
             rate_limiter.wait_if_needed()
-            resp = requests.get(url, headers=headers, timeout=15)
+            resp = HTTP_SESSION.get(url, headers=headers, timeout=15)
             if resp.status_code == 200:
                 data = resp.json()['message']
                 state.crossref_cache[doi] = data
+                state.doi_cache.set(disk_key, data, ttl=DOI_CACHE_TTL)
                 delayer.wait(success=True)
                 return data
         except:
@@ -1643,15 +1775,21 @@ def get_openalex_metadata(doi, state):
         return state.openalex_cache[doi]
     if not doi or doi == 'N/A':
         return None
+    disk_key = f"openalex:{doi}"
+    data = state.doi_cache.get(disk_key)
+    if data is not None:
+        state.openalex_cache[doi] = data
+        return data
     normalized = doi if doi.startswith('http') else f"https://doi.org/{doi}"
     url = f"https://api.openalex.org/works/{quote(normalized)}"
     for _ in range(RETRIES):
         try:
             rate_limiter.wait_if_needed()
-            resp = requests.get(url, timeout=10)
+            resp = HTTP_SESSION.get(url, timeout=10)
             if resp.status_code == 200:
                 data = resp.json()
                 state.openalex_cache[doi] = data
+                state.doi_cache.set(disk_key, data, ttl=DOI_CACHE_TTL)
                 delayer.wait(success=True)
                 return data
         except:
@@ -1675,11 +1813,100 @@ def get_unified_metadata(args):
     state.unified_cache[doi] = result
     return result
 
+# === 4a. Batch Metadata Prefetch ===
+# Crossref (filter=doi:a,doi:b) и OpenAlex (filter=doi:a|b) отдают до 50 работ за запрос.
+# Пакетная загрузка заполняет те же кэши, что и get_crossref_metadata/get_openalex_metadata,
+# поэтому последующие запросы по одному DOI обслуживаются из кэша; не найденные DOI
+# по-прежнему запрашиваются по одному.
+METADATA_BATCH_SIZE = 50
+
+def bare_doi(doi):
+    """DOI без префикса https://doi.org/ в нижнем регистре (ключ сопоставления ответов)"""
+    return doi.lower().removeprefix('https://doi.org/')
+
+def _pending_batch_dois(dois, memory_cache, disk_prefix, state):
+    """DOI пакета, которых нет ни в кэше сессии, ни на диске: {bare_doi: исходный DOI}"""
+    pending = {}
+    for doi in dois:
+        # Запятая и | - разделители фильтров, такие DOI остаются на поштучную загрузку
+        if not doi or doi == 'N/A' or doi in memory_cache or ',' in doi or '|' in doi:
+            continue
+        data = state.doi_cache.get(f"{disk_prefix}:{doi}")
+        if data is not None:
+            memory_cache[doi] = data
+            continue
+        pending[bare_doi(doi)] = doi
+    return pending
+
+def _fetch_metadata_batch(url, params, headers, extract_items):
+    for _ in range(RETRIES):
+        try:
+            rate_limiter.wait_if_needed()
+            resp = HTTP_SESSION.get(url, params=params, headers=headers, timeout=30)
+            if resp.status_code == 200:
+                items = extract_items(resp.json())
+                delayer.wait(success=True)
+                return items
+        except:
+            pass
+        delayer.wait(success=False)
+    return []
+
+def fetch_crossref_batch(dois, state):
+    """Метаданные Crossref для пакета DOI (до METADATA_BATCH_SIZE) одним запросом"""
+    pending = _pending_batch_dois(dois, state.crossref_cache, 'crossref', state)
+    if not pending:
+        return
+    items = _fetch_metadata_batch(
+        "https://api.crossref.org/works",
+        {'filter': ','.join(f"doi:{doi}" for doi in pending), 'rows': len(pending)},
+        {'User-Agent': f"YourApp/1.0 (mailto:{EMAIL})"},
+        lambda data: data['message'].get('items', [])
+    )
+    for item in items:
+        doi = pending.get(bare_doi(item.get('DOI') or ''))
+        if doi:
+            state.crossref_cache[doi] = item
+            state.doi_cache.set(f"crossref:{doi}", item, ttl=DOI_CACHE_TTL)
+
+def fetch_openalex_batch(dois, state):
+    """Метаданные OpenAlex для пакета DOI (до METADATA_BATCH_SIZE) одним запросом"""
+    pending = _pending_batch_dois(dois, state.openalex_cache, 'openalex', state)
+    if not pending:
+        return
+    items = _fetch_metadata_batch(
+        "https://api.openalex.org/works",
+        {'filter': 'doi:' + '|'.join(pending), 'per-page': len(pending)},
+        None,
+        lambda data: data.get('results', [])
+    )
+    for item in items:
+        doi = pending.get(bare_doi(item.get('doi') or ''))
+        if doi:
+            state.openalex_cache[doi] = item
+            state.doi_cache.set(f"openalex:{doi}", item, ttl=DOI_CACHE_TTL)
+
+def prefetch_metadata_batches(dois, state):
+    """Пакетная предзагрузка Crossref и OpenAlex для списка DOI (пакеты обрабатываются параллельно)"""
+    chunks = [dois[i:i + METADATA_BATCH_SIZE] for i in range(0, len(dois), METADATA_BATCH_SIZE)]
+    executor = get_fetch_executor()
+    futures = [executor.submit(fetch, chunk, state) for chunk in chunks for fetch in (fetch_crossref_batch, fetch_openalex_batch)]
+    for future in as_completed(futures):
+        try:
+            future.result()
+        except Exception as e:
+            print(f"⚠️ Batch metadata prefetch failed: {e}")
+
 # === 5. Citing DOI Retrieval and Their Metadata ===
 def get_citing_dois_and_metadata(args):
     analyzed_doi, state = args
     if analyzed_doi in state.citing_cache:
         return state.citing_cache[analyzed_doi]
+    disk_key = f"citing:{analyzed_doi}"
+    citing_list = state.doi_cache.get(disk_key)
+    if citing_list is not None:
+        state.citing_cache[analyzed_doi] = citing_list
+        return citing_list
     citing_list = []
     oa_data = get_openalex_metadata(analyzed_doi, state)
     if not oa_data or oa_data.get('cited_by_count', 0) == 0:
@@ -1694,16 +1921,21 @@ def get_citing_dois_and_metadata(args):
         for _ in range(RETRIES):
             try:
                 rate_limiter.wait_if_needed()
-                resp = requests.get(f"{url}&cursor={cursor}", timeout=15)
+                resp = HTTP_SESSION.get(f"{url}&cursor={cursor}", timeout=15)
                 if resp.status_code == 200:
                     data = resp.json()
-                    for w in data.get('results', []):
+                    page_works = data.get('results', [])
+                    # Страница уже содержит полные записи OpenAlex; Crossref для нее - пакетами
+                    page_dois = [w.get('doi') for w in page_works if w.get('doi')]
+                    for i in range(0, len(page_dois), METADATA_BATCH_SIZE):
+                        fetch_crossref_batch(page_dois[i:i + METADATA_BATCH_SIZE], state)
+                    for w in page_works:
                         c_doi = w.get('doi')
                         if c_doi:
+                            if c_doi not in state.openalex_cache:
+                                state.openalex_cache[c_doi] = w
                             if c_doi not in state.crossref_cache:
                                 get_crossref_metadata(c_doi, state)
-                            if c_doi not in state.openalex_cache:
-                                get_openalex_metadata(c_doi, state)
                             citing_list.append({
                                 'doi': c_doi,
                                 'pub_date': w.get('publication_date'),
@@ -1720,6 +1952,9 @@ def get_citing_dois_and_metadata(args):
         if not success:
             break
     state.citing_cache[analyzed_doi] = citing_list
+    # Неполный список (обрыв пагинации) на диск не сохраняется
+    if success:
+        state.doi_cache.set(disk_key, citing_list, ttl=DOI_CACHE_TTL)
     return citing_list
 
 # === 6. Affiliation and Country Extraction ===
@@ -1806,20 +2041,24 @@ def fetch_articles_by_issn_period(issn, from_date, until_date):
     with progress_container:
         st.info("📥 " + translation_manager.get_text('loading_articles') + " **Crossref** " + translation_manager.get_text('and') + " **OpenAlex**. " + translation_manager.get_text('analysis_may_take_time') + " " + translation_manager.get_text('reduce_period_recommended'))
     
+    # Шаблоны статуса берутся один раз до цикла по страницам; в цикле только подстановка счетчика
+    loaded_template = "📥 " + translation_manager.get_text('loaded_articles')
+    error_template = translation_manager.get_text('loading_error')
+    
     while cursor:
         params['cursor'] = cursor
         success = False
         for _ in range(RETRIES):
             try:
                 rate_limiter.wait_if_needed()
-                resp = requests.get(base_url, params=params, timeout=15)
+                resp = HTTP_SESSION.get(base_url, params=params, timeout=15)
                 if resp.status_code == 200:
                     data = resp.json()
                     new_items = data['message']['items']
                     items.extend(new_items)
                     cursor = data['message'].get('next-cursor')
                     
-                    status_text.text(f"📥 {translation_manager.get_text('loaded_articles').format(count=len(items))}")
+                    status_text.text(loaded_template.format(count=len(items)))
                     if cursor:
                         progress = min(len(items) / (len(items) + 100), 0.95)
                         progress_bar.progress(progress)
@@ -1828,7 +2067,7 @@ def fetch_articles_by_issn_period(issn, from_date, until_date):
                     success = True
                     break
             except Exception as e:
-                st.error(translation_manager.get_text('loading_error').format(error=e))
+                st.error(error_template.format(error=e))
             delayer.wait(success=False)
         if not success:
             break
@@ -1851,6 +2090,13 @@ def get_doi_prefix(doi):
     return doi.split('/')[0] if '/' in doi else doi[:7]
 
 # === 10. Processing with Progress Bar ===
+# Каждое обновление прогресс-бара - отдельное сообщение во frontend; за цикл их не больше ~200
+PROGRESS_UPDATES = 200
+
+def should_update_progress(i, total):
+    """Обновлять ли прогресс на итерации i из total (каждые total // PROGRESS_UPDATES и на последней)"""
+    return i == total - 1 or i % max(1, total // PROGRESS_UPDATES) == 0
+
 def process_with_progress(items, func, desc="Processing", unit="items"):
     results = []
     progress_bar = st.progress(0)
@@ -1866,9 +2112,10 @@ def process_with_progress(items, func, desc="Processing", unit="items"):
                 st.error(f"Error in {desc}: {e}")
                 results.append(None)
             
-            progress = (i + 1) / len(items)
-            progress_bar.progress(progress)
-            status_text.text(f"{desc}: {i + 1}/{len(items)}")
+            if should_update_progress(i, len(items)):
+                progress = (i + 1) / len(items)
+                progress_bar.progress(progress)
+                status_text.text(f"{desc}: {i + 1}/{len(items)}")
     
     progress_bar.empty()
     status_text.empty()
@@ -2214,7 +2461,7 @@ def calculate_citation_timing_stats(analyzed_metadata, state):
             if not analyzed_doi:
                 continue
                 
-            analyzed_date_parts = analyzed['crossref'].get('published', {}).get('date-parts', [[]])[0]
+            analyzed_date_parts = analyzed['crossref'].get('published', EMPTY_MAPPING).get('date-parts', NO_DATE_PARTS)[0]
             if not analyzed_date_parts or len(analyzed_date_parts) < 1:
                 continue
                 
@@ -2971,32 +3218,22 @@ def calculate_all_fast_metrics(analyzed_metadata, citing_metadata, state, journa
         }
         
         # Calculate overall data quality score with safe array handling
-        quality_indicators = []
-        
-        # Safe checks for each indicator
-        refs_analyzed = fast_metrics.get('total_refs_analyzed', 0)
-        quality_indicators.append(refs_analyzed > 0 if not hasattr(refs_analyzed, 'size') else refs_analyzed.size > 0)
-        
-        total_cites = fast_metrics.get('total_cites', 0)
-        quality_indicators.append(total_cites > 0 if not hasattr(total_cites, 'size') else total_cites.size > 0)
-        
-        articles_chl = fast_metrics.get('articles_with_chl', 0)
-        quality_indicators.append(articles_chl > 0 if not hasattr(articles_chl, 'size') else articles_chl.size > 0)
-        
-        articles_velocity = fast_metrics.get('articles_with_velocity', 0)
-        quality_indicators.append(articles_velocity > 0 if not hasattr(articles_velocity, 'size') else articles_velocity.size > 0)
-        
-        oa_articles = fast_metrics.get('OA_articles', 0)
-        non_oa_articles = fast_metrics.get('non_OA_articles', 0)
-        oa_check = (oa_articles > 0 if not hasattr(oa_articles, 'size') else oa_articles.size > 0)
-        non_oa_check = (non_oa_articles > 0 if not hasattr(non_oa_articles, 'size') else non_oa_articles.size > 0)
-        quality_indicators.append(oa_check or non_oa_check)
-        
-        total_authors = fast_metrics.get('total_authors', 0)
-        quality_indicators.append(total_authors > 0 if not hasattr(total_authors, 'size') else total_authors.size > 0)
-        
-        unique_concepts = fast_metrics.get('unique_concepts', 0)
-        quality_indicators.append(unique_concepts > 0 if not hasattr(unique_concepts, 'size') else unique_concepts.size > 0)
+        # (fast_metrics.get связывается один раз; для массивов numpy проверяется размер)
+        fm_get = fast_metrics.get
+        
+        def has_data(key):
+            value = fm_get(key, 0)
+            return value.size > 0 if hasattr(value, 'size') else value > 0
+        
+        quality_indicators = [
+            has_data('total_refs_analyzed'),
+            has_data('total_cites'),
+            has_data('articles_with_chl'),
+            has_data('articles_with_velocity'),
+            has_data('OA_articles') or has_data('non_OA_articles'),
+            has_data('total_authors'),
+            has_data('unique_concepts')
+        ]
         
         # Calculate quality score safely
         if quality_indicators:
@@ -3040,9 +3277,7 @@ def calculate_all_fast_metrics(analyzed_metadata, citing_metadata, state, journa
                     fast_metrics[key] = 0
         
         # Clean up any None values and convert numpy types to Python types
-        for key in list(fast_metrics.keys()):
-            value = fast_metrics[key]
-            
+        for key, value in list(fast_metrics.items()):
             # Handle numpy arrays and types
             if hasattr(value, 'item'):  # numpy scalar
                 try:
@@ -3146,6 +3381,10 @@ def normalize_issn_for_comparison(issn):
     
     return normalized
 
+# Колонки справочников, которые использует get_journal_metrics (остальные не загружаются)
+IF_DATA_COLUMNS = ['ISSN', 'eISSN', 'IF', 'Quartile']
+CS_DATA_COLUMNS = ['Print ISSN', 'E-ISSN', 'CiteScore', 'Quartile']
+
 def load_metrics_data():
     """Load IF and CS data from Excel files"""
     state = get_analysis_state()
@@ -3153,7 +3392,7 @@ def load_metrics_data():
     # Load IF data (Web of Science)
     try:
         if os.path.exists('IF.xlsx'):
-            state.if_data = pd.read_excel('IF.xlsx')
+            state.if_data = pd.read_excel('IF.xlsx', usecols=IF_DATA_COLUMNS)
             # Removed success message to avoid showing in interface
         else:
             # Removed warning message to avoid showing in interface
@@ -3165,7 +3404,7 @@ def load_metrics_data():
     # Load CS data (Scopus) - UPDATED: Now loading CS.xlsx
     try:
         if os.path.exists('CS.xlsx'):
-            state.cs_data = pd.read_excel('CS.xlsx')
+            state.cs_data = pd.read_excel('CS.xlsx', usecols=CS_DATA_COLUMNS)
             # Removed success message to avoid showing in interface
         else:
             # Removed warning message to avoid showing in interface
@@ -3253,30 +3492,33 @@ def get_journal_metrics(journal_issns):
 
 def analyze_citation_seasonality(analyzed_metadata, state, median_days_to_first_citation):
     """Analyze citation seasonality and predict optimal publication months"""
-    citation_months = Counter()
     publication_months = Counter()
     
-    # Collect citation months
+    # Collect citation months: даты собираются в один список, месяцы считаются векторно (bincount)
+    citation_dates = []
     for analyzed in analyzed_metadata:
         if analyzed and analyzed.get('crossref'):
             analyzed_doi = analyzed['crossref'].get('DOI')
             if not analyzed_doi:
                 continue
-                
-            citings = state.citing_cache.get(analyzed_doi, [])
-            
-            for citing in citings:
-                if citing.get('pub_date'):
-                    try:
-                        cite_date = datetime.fromisoformat(citing['pub_date'].replace('Z', '+00:00'))
-                        citation_months[cite_date.month] += 1
-                    except:
-                        continue
+            citation_dates.extend(
+                citing['pub_date'] for citing in state.citing_cache.get(analyzed_doi, []) if citing.get('pub_date')
+            )
+    
+    # Некорректные даты (NaT) отбрасываются, как раньше при ошибке fromisoformat
+    parsed_dates = pd.to_datetime(pd.Series(citation_dates, dtype=object).str.slice(0, 10), format='%Y-%m-%d', errors='coerce')
+    month_counts = np.bincount(parsed_dates.dt.month.dropna().astype(np.int64).to_numpy(), minlength=13)
+    # Месяцы по убыванию числа цитирований (при равенстве - по номеру месяца)
+    citation_months = {
+        int(month): int(month_counts[month])
+        for month in np.argsort(-month_counts[1:], kind='stable') + 1
+        if month_counts[month] > 0
+    }
     
     # Collect publication months of analyzed articles
     for analyzed in analyzed_metadata:
         if analyzed and analyzed.get('crossref'):
-            date_parts = analyzed['crossref'].get('published', {}).get('date-parts', [[]])[0]
+            date_parts = analyzed['crossref'].get('published', EMPTY_MAPPING).get('date-parts', NO_DATE_PARTS)[0]
             if len(date_parts) >= 2:  # Has at least year and month
                 publication_months[date_parts[1]] += 1
     
@@ -3284,7 +3526,7 @@ def analyze_citation_seasonality(analyzed_metadata, state, median_days_to_first_
     optimal_months = []
     if citation_months and median_days_to_first_citation > 0:
         # Find months with highest citations
-        top_citation_months = [month for month, count in citation_months.most_common(3)]
+        top_citation_months = list(citation_months)[:3]
         
         # Calculate recommended publication months (considering median time to first citation)
         for citation_month in top_citation_months:
@@ -3302,10 +3544,10 @@ def analyze_citation_seasonality(analyzed_metadata, state, median_days_to_first_
             })
     
     return {
-        'citation_months': dict(citation_months),
+        'citation_months': citation_months,
         'publication_months': dict(publication_months),
         'optimal_publication_months': optimal_months,
-        'total_citations_by_month': sum(citation_months.values())
+        'total_citations_by_month': int(month_counts.sum())
     }
 
 def find_potential_reviewers(analyzed_metadata, citing_metadata, overlap_details, state):
@@ -3318,12 +3560,12 @@ def find_potential_reviewers(analyzed_metadata, citing_metadata, overlap_details
             authors, _, _ = extract_affiliations_and_countries(analyzed.get('openalex'))
             journal_authors.update(authors)
     
-    # Get overlap authors (those who already have connections with the journal)
-    overlap_authors = set()
-    for overlap in overlap_details:
-        overlap_authors.update(overlap['common_authors'])
+    # Get overlap authors (those who already have connections with the journal) - одно объединение множеств
+    overlap_authors = set().union(*(overlap['common_authors'] for overlap in overlap_details))
     
     # Find citing authors who are NOT in journal authors and NOT in overlap authors
+    # (одна проверка по объединенному множеству исключений вместо трех сравнений на автора)
+    excluded_authors = journal_authors | overlap_authors | {'Unknown'}
     potential_reviewer_candidates = Counter()
     reviewer_citation_details = defaultdict(list)
     
@@ -3336,19 +3578,23 @@ def find_potential_reviewers(analyzed_metadata, citing_metadata, overlap_details
         
         for author in authors:
             # Check if author is NOT a journal author and NOT an overlap author
-            if author not in journal_authors and author not in overlap_authors and author != 'Unknown':
+            if author not in excluded_authors:
                 potential_reviewer_candidates[author] += 1
                 reviewer_citation_details[author].append(citing_doi)
     
-    # Prepare detailed results - filter out authors with only 1 citation
-    potential_reviewers = []
-    for author, citation_count in potential_reviewer_candidates.most_common():
-        if citation_count > 1:  # Only include authors with more than 1 citation
-            potential_reviewers.append({
-                'author': author,
-                'citation_count': citation_count,
-                'citing_dois': reviewer_citation_details[author]  # Keep all DOIs for detailed analysis
-            })
+    # Prepare detailed results - filter out authors with only 1 citation.
+    # Фильтр до сортировки: большинство кандидатов с одним цитированием не сортируются
+    # (stable sort по убыванию - тот же порядок, что у most_common)
+    repeat_candidates = [(author, count) for author, count in potential_reviewer_candidates.items() if count > 1]
+    repeat_candidates.sort(key=lambda candidate: candidate[1], reverse=True)
+    potential_reviewers = [
+        {
+            'author': author,
+            'citation_count': citation_count,
+            'citing_dois': reviewer_citation_details[author]  # Keep all DOIs for detailed analysis
+        }
+        for author, citation_count in repeat_candidates
+    ]
     
     return {
         'potential_reviewers': potential_reviewers,
@@ -3574,13 +3820,17 @@ def extract_titles_from_metadata(metadata_list):
     
     return titles
 
+_DOUBLE_DOT_RE = re.compile(r'\.\.')
+_INITIAL_RE = re.compile(r'[A-Z]\.')
+
+@lru_cache(maxsize=100_000)
 def normalize_author_name(author_name):
-    """Нормализация имени автора - оставляем только первый инициал"""
+    """Нормализация имени автора - оставляем только первый инициал (с кэшем: имена сильно повторяются)"""
     if not author_name:
         return author_name
     
     # Убираем лишние точки (исправляем Pikalova E..Y. -> Pikalova E.Y.)
-    author_name = re.sub(r'\.\.', '.', author_name)
+    author_name = _DOUBLE_DOT_RE.sub('.', author_name)
     
     # Разделяем фамилию и инициалы
     parts = author_name.split()
@@ -3594,7 +3844,7 @@ def normalize_author_name(author_name):
     # Берем только первую букву инициалов (первый инициал)
     if '.' in initials:
         # Если инициалы с точками: "E.Y." -> берем "E."
-        first_initials = re.findall(r'[A-Z]\.', initials)
+        first_initials = _INITIAL_RE.findall(initials)
         if first_initials:
             first_initial = first_initials[0]
         else:
@@ -3606,19 +3856,23 @@ def normalize_author_name(author_name):
     
     return f"{surname} {first_initial}".strip()
 
-def normalize_keywords_data(keywords_data):
-    """Нормализация данных ключевых слов для объединенного листа с правильной сортировкой"""
-    normalized_data = []
-    
-    # Получаем общие количества статей
-    analyzed_total = keywords_data['analyzed']['total_titles']
-    citing_total = keywords_data['citing']['total_titles']
-    
-    # Собираем ВСЕ данные сначала, без предварительных рангов
-    
-    # 1. Content words
-    for word, analyzed_count in keywords_data['analyzed']['content_words']:
-        citing_count = next((c for w, c in keywords_data['citing']['content_words'] if w == word), 0)
+# Типы ключевых слов: (ключ в результатах analyze_titles, подпись в листе)
+KEYWORD_TYPES = (
+    ('content_words', 'Content'),
+    ('compound_words', 'Compound'),
+    ('scientific_words', 'Scientific'),
+)
+
+# Колонки листа Combined_Title_Keywords (ранг добавляется после сортировки)
+KEYWORD_SHEET_COLUMNS = ('Keyword Type', 'Keyword', 'Norm_Analyzed', 'Norm_Citing', 'Total_Norm', 'Ratio_Analyzed/Citing', 'Rank')
+
+@lru_cache(maxsize=64)
+def normalized_keyword_rows(analyzed_words, citing_words, analyzed_total, citing_total):
+    """Нормализованные частоты одного типа ключевых слов (аргументы - кортежи пар (слово, число))"""
+    citing_counts = dict(citing_words)  # поиск по словарю вместо линейного прохода для каждого слова
+    rows = []
+    for word, analyzed_count in analyzed_words:
+        citing_count = citing_counts.get(word, 0)
         
         # Нормализация частот
         norm_analyzed = analyzed_count / analyzed_total if analyzed_total > 0 else 0
@@ -3626,59 +3880,37 @@ def normalize_keywords_data(keywords_data):
         total_norm = norm_analyzed + norm_citing
         ratio = norm_analyzed / norm_citing if norm_citing > 0 else float('inf')
         
-        normalized_data.append({
-            'Keyword Type': 'Content',
-            'Keyword': word,
-            'Norm_Analyzed': round(norm_analyzed, 4),
-            'Norm_Citing': round(norm_citing, 4),
-            'Total_Norm': round(total_norm, 4),
-            'Ratio_Analyzed/Citing': round(ratio, 2)
-        })
+        rows.append((word, round(norm_analyzed, 4), round(norm_citing, 4), round(total_norm, 4), round(ratio, 2)))
+    return tuple(rows)
+
+def normalize_keywords_data(keywords_data):
+    """Нормализация данных ключевых слов для объединенного листа с правильной сортировкой
+    (строки - кортежи в порядке KEYWORD_SHEET_COLUMNS)"""
+    normalized_data = []
     
-    # 2. Compound words
-    for word, analyzed_count in keywords_data['analyzed']['compound_words']:
-        citing_count = next((c for w, c in keywords_data['citing']['compound_words'] if w == word), 0)
-        
-        norm_analyzed = analyzed_count / analyzed_total if analyzed_total > 0 else 0
-        norm_citing = citing_count / citing_total if citing_total > 0 else 0
-        total_norm = norm_analyzed + norm_citing
-        ratio = norm_analyzed / norm_citing if norm_citing > 0 else float('inf')
-        
-        normalized_data.append({
-            'Keyword Type': 'Compound',
-            'Keyword': word,
-            'Norm_Analyzed': round(norm_analyzed, 4),
-            'Norm_Citing': round(norm_citing, 4),
-            'Total_Norm': round(total_norm, 4),
-            'Ratio_Analyzed/Citing': round(ratio, 2)
-        })
+    # Получаем общие количества статей
+    analyzed_total = keywords_data['analyzed']['total_titles']
+    citing_total = keywords_data['citing']['total_titles']
     
-    # 3. Scientific stopwords
-    for word, analyzed_count in keywords_data['analyzed']['scientific_words']:
-        citing_count = next((c for w, c in keywords_data['citing']['scientific_words'] if w == word), 0)
-        
-        norm_analyzed = analyzed_count / analyzed_total if analyzed_total > 0 else 0
-        norm_citing = citing_count / citing_total if citing_total > 0 else 0
-        total_norm = norm_analyzed + norm_citing
-        ratio = norm_analyzed / norm_citing if norm_citing > 0 else float('inf')
-        
-        normalized_data.append({
-            'Keyword Type': 'Scientific',
-            'Keyword': word,
-            'Norm_Analyzed': round(norm_analyzed, 4),
-            'Norm_Citing': round(norm_citing, 4),
-            'Total_Norm': round(total_norm, 4),
-            'Ratio_Analyzed/Citing': round(ratio, 2)
-        })
+    # Собираем ВСЕ данные сначала, без предварительных рангов
+    # (строки каждого типа кэшируются по кортежам слов - повторный отчет по тем же данным не пересчитывается)
+    for words_key, keyword_type in KEYWORD_TYPES:
+        analyzed_words = keywords_data['analyzed'][words_key]
+        if not analyzed_words:
+            continue  # пустой тип не дает строк - кортежи и словарь цитирующих не строим
+        rows = normalized_keyword_rows(
+            tuple(map(tuple, analyzed_words)),
+            tuple(map(tuple, keywords_data['citing'][words_key])),
+            analyzed_total,
+            citing_total
+        )
+        normalized_data.extend((keyword_type,) + row for row in rows)
     
     # СОРТИРОВКА по Norm_Citing (убывание) - ГЛАВНОЕ ИСПРАВЛЕНИЕ
-    normalized_data.sort(key=lambda x: x['Norm_Citing'], reverse=True)
+    normalized_data.sort(key=lambda row: row[3], reverse=True)
     
     # ДОБАВЛЕНИЕ РАНГОВ только после финальной сортировки
-    for i, item in enumerate(normalized_data, 1):
-        item['Rank'] = i
-    
-    return normalized_data
+    return [row + (rank,) for rank, row in enumerate(normalized_data, 1)]
 
 # === NEW FUNCTION FOR SPECIAL ANALYSIS METRICS ===
 def create_issn_lookup_cache(state):
@@ -3816,7 +4048,7 @@ def calculate_special_analysis_metrics(analyzed_metadata, citing_metadata, state
         # Try Crossref first
         cr = metadata.get('crossref')
         if cr:
-            date_parts = cr.get('published', {}).get('date-parts', [[]])[0]
+            date_parts = cr.get('published', EMPTY_MAPPING).get('date-parts', NO_DATE_PARTS)[0]
             if date_parts and len(date_parts) >= 1:
                 try:
                     year = date_parts[0]
@@ -4019,7 +4251,7 @@ def search_ror_organization(affiliation_name):
         # Search ROR API
         url = "https://api.ror.org/organizations"
         params = {'query': affiliation_name.strip()}
-        response = requests.get(url, params=params, timeout=10)
+        response = HTTP_SESSION.get(url, params=params, timeout=10)
         response.raise_for_status()
         
         items = response.json().get('items', [])
@@ -4165,9 +4397,10 @@ def process_ror_data_parallel(affiliations_list, state):
                 processed_count += 1
                 
                 # Update progress
-                progress = (i + 1) / total_affiliations
-                ror_progress.progress(progress)
-                ror_status.text(f"🔍 Processing ROR data: {i + 1}/{total_affiliations}")
+                if should_update_progress(i, total_affiliations):
+                    progress = (i + 1) / total_affiliations
+                    ror_progress.progress(progress)
+                    ror_status.text(f"🔍 Processing ROR data: {i + 1}/{total_affiliations}")
                 
             except Exception as e:
                 print(f"⚠️ Error processing ROR for '{affiliation_name}': {str(e)}")
@@ -4180,71 +4413,90 @@ def process_ror_data_parallel(affiliations_list, state):
     print(f"✅ ROR processing completed: {processed_count}/{total_affiliations} affiliations processed")
     return ror_results
     
+def count_percentages(counts, total):
+    """Векторный расчет долей (%) для массива счетчиков, округление до 2 знаков"""
+    counts = np.asarray(counts, dtype=np.float64)
+    if total <= 0:
+        return np.zeros(len(counts))
+    return np.round(counts / total * 100, 2)
+
+def count_array(values, length):
+    """Счетчики из итератора в массив int64"""
+    return np.fromiter(values, dtype=np.int64, count=length)
+
+def add_percentage_column(df, total, count_column='Articles_Count', pct_column='Percentage'):
+    """Колонка долей (%) одним векторным умножением, округление до 2 знаков"""
+    if len(df) == 0:
+        return df
+    factor = 100.0 / total if total > 0 else 0.0
+    df[pct_column] = (df[count_column] * factor).round(2)
+    return df
+
+def order_by_total(names, analyzed_counts, citing_counts):
+    """Упорядочивает имена и счетчики по убыванию суммы (стабильный argsort вместо сортировки словарей)"""
+    order = np.argsort(-(analyzed_counts + citing_counts), kind='stable')
+    return [names[i] for i in order.tolist()], analyzed_counts[order], citing_counts[order]
+
+def presence_status(analyzed_counts, citing_counts):
+    """Статус для combined-листов по массивам счетчиков: Both / Analyzed Only / Citing Only"""
+    return np.where(analyzed_counts > 0, np.where(citing_counts > 0, 'Both', 'Analyzed Only'), 'Citing Only')
+
+def share_percentages(counts, totals):
+    """Доля (%) counts в totals поэлементно; 0 там, где totals == 0"""
+    return np.divide(counts * 100.0, totals, out=np.zeros(len(counts)), where=totals > 0)
+
+def activity_balance(status, share_pct):
+    """Activity Balance по статусу и доле публикаций в анализируемом журнале"""
+    return np.select(
+        [status == 'Analyzed Only', status == 'Citing Only', share_pct >= 70, share_pct >= 30],
+        ['Publishing-Only', 'Citing-Only', 'Publishing-Heavy', 'Balanced'],
+        default='Citing-Heavy'
+    )
+
+def percent_strings(values):
+    """Форматирование долей как '12.3%'"""
+    return [f"{value:.1f}%" for value in values.tolist()]
+
 def create_combined_authors_sheet(analyzed_authors_data, citing_authors_data, analyzed_total_articles, citing_total_articles):
     """Создает объединенный лист авторов анализируемых и цитирующих статей"""
     
-    # Нормализуем имена авторов и объединяем счетчики
+    # Нормализуем имена авторов и объединяем счетчики (группировка pandas вместо Counter по одному ключу)
     def normalize_and_aggregate(authors_list):
-        normalized_counts = Counter()
-        for author, count in authors_list:
-            normalized_name = normalize_author_name(author)
-            normalized_counts[normalized_name] += count
-        return normalized_counts
+        if not authors_list:
+            return Counter()
+        authors, counts = zip(*authors_list)
+        counts_series = pd.Series(counts, index=authors)
+        normalized_names = counts_series.index.map(normalize_author_name)
+        grouped = counts_series.groupby(normalized_names, dropna=False, sort=False).sum()
+        return Counter(grouped.to_dict())
     
     analyzed_authors = normalize_and_aggregate(analyzed_authors_data)
     citing_authors = normalize_and_aggregate(citing_authors_data)
     
-    combined_data = []
-    all_authors = set(analyzed_authors.keys()) | set(citing_authors.keys())
+    all_authors = list(set(analyzed_authors.keys()) | set(citing_authors.keys()))
     
-    for author in all_authors:
-        analyzed_count = analyzed_authors.get(author, 0)
-        citing_count = citing_authors.get(author, 0)
-        total_publications = analyzed_count + citing_count
-        
-        # Рассчитываем проценты
-        analyzed_pct = (analyzed_count / analyzed_total_articles * 100) if analyzed_total_articles > 0 else 0
-        citing_pct = (citing_count / citing_total_articles * 100) if citing_total_articles > 0 else 0
-        
-        # Определяем статус автора
-        if analyzed_count > 0 and citing_count > 0:
-            author_status = "Both"
-        elif analyzed_count > 0:
-            author_status = "Analyzed Only"
-        else:
-            author_status = "Citing Only"
-        
-        # Рассчитываем Loyalty Score (процент публикаций от общей активности)
-        loyalty_score_pct = (analyzed_count / total_publications * 100) if total_publications > 0 else 0
-        
-        # Определяем Activity Balance
-        if author_status == "Analyzed Only":
-            activity_balance = "Publishing-Only"
-        elif author_status == "Citing Only":
-            activity_balance = "Citing-Only"
-        elif loyalty_score_pct >= 70:
-            activity_balance = "Publishing-Heavy"
-        elif loyalty_score_pct >= 30:
-            activity_balance = "Balanced"
-        else:
-            activity_balance = "Citing-Heavy"
-        
-        combined_data.append({
-            'Author': author,
-            'Total': total_publications,
-            'Status': author_status,
-            'Analyzed_Count': analyzed_count,
-            'Citing_Count': citing_count,
-            'Loyalty_Score': f"{loyalty_score_pct:.1f}%",
-            'Activity_Balance': activity_balance,
-            'Analyzed_Pct': round(analyzed_pct, 2),
-            'Citing_Pct': round(citing_pct, 2)
-        })
+    # Рассчитываем проценты сразу для всех авторов
+    analyzed_counts = count_array((analyzed_authors.get(author, 0) for author in all_authors), len(all_authors))
+    citing_counts = count_array((citing_authors.get(author, 0) for author in all_authors), len(all_authors))
+    all_authors, analyzed_counts, citing_counts = order_by_total(all_authors, analyzed_counts, citing_counts)
     
-    # Сортируем по общему количеству публикаций (убывание)
-    combined_data.sort(key=lambda x: x['Total'], reverse=True)
+    # Колонки листа считаются целиком по массивам (структура массивов вместо списка словарей по строкам)
+    total_publications = analyzed_counts + citing_counts
+    author_status = presence_status(analyzed_counts, citing_counts)
+    # Loyalty Score - процент публикаций от общей активности
+    loyalty_score_pct = share_percentages(analyzed_counts, total_publications)
     
-    return combined_data
+    return {
+        'Author': all_authors,
+        'Total': total_publications.tolist(),
+        'Status': author_status.tolist(),
+        'Analyzed_Count': analyzed_counts.tolist(),
+        'Citing_Count': citing_counts.tolist(),
+        'Loyalty_Score': percent_strings(loyalty_score_pct),
+        'Activity_Balance': activity_balance(author_status, loyalty_score_pct).tolist(),
+        'Analyzed_Pct': count_percentages(analyzed_counts, analyzed_total_articles).tolist(),
+        'Citing_Pct': count_percentages(citing_counts, citing_total_articles).tolist()
+    }
 
 def create_combined_affiliations_sheet(analyzed_affiliations_data, citing_affiliations_data, analyzed_total_mentions, citing_total_mentions, state):
     """Создает объединенный лист аффилиаций анализируемых и цитирующих статей"""
@@ -4252,8 +4504,7 @@ def create_combined_affiliations_sheet(analyzed_affiliations_data, citing_affili
     analyzed_affiliations = Counter(dict(analyzed_affiliations_data))
     citing_affiliations = Counter(dict(citing_affiliations_data))
     
-    combined_data = []
-    all_affiliations = set(analyzed_affiliations.keys()) | set(citing_affiliations.keys())
+    all_affiliations = list(set(analyzed_affiliations.keys()) | set(citing_affiliations.keys()))
     
     # NEW: Process ROR data in parallel if enabled
     ror_results = {}
@@ -4265,39 +4516,20 @@ def create_combined_affiliations_sheet(analyzed_affiliations_data, citing_affili
             print(f"Warning: ROR data processing failed: {e}")
             ror_results = {}
     
+    # Рассчитываем проценты сразу для всех аффилиаций
+    analyzed_counts = count_array((analyzed_affiliations.get(a, 0) for a in all_affiliations), len(all_affiliations))
+    citing_counts = count_array((citing_affiliations.get(a, 0) for a in all_affiliations), len(all_affiliations))
+    all_affiliations, analyzed_counts, citing_counts = order_by_total(all_affiliations, analyzed_counts, citing_counts)
+    
+    total_mentions = analyzed_counts + citing_counts
+    affiliation_status = presence_status(analyzed_counts, citing_counts)
+    # Engagement Score - процент публикаций от общей активности
+    engagement_score_pct = share_percentages(analyzed_counts, total_mentions)
+    
+    # NEW: Get ROR information from cache or API results
+    colab_rors = []
+    websites = []
     for affiliation in all_affiliations:
-        analyzed_count = analyzed_affiliations.get(affiliation, 0)
-        citing_count = citing_affiliations.get(affiliation, 0)
-        total_mentions = analyzed_count + citing_count
-        
-        # Рассчитываем проценты
-        analyzed_pct = (analyzed_count / analyzed_total_mentions * 100) if analyzed_total_mentions > 0 else 0
-        citing_pct = (citing_count / citing_total_mentions * 100) if citing_total_mentions > 0 else 0
-        
-        # Определяем статус аффилиации
-        if analyzed_count > 0 and citing_count > 0:
-            affiliation_status = "Both"
-        elif analyzed_count > 0:
-            affiliation_status = "Analyzed Only"
-        else:
-            affiliation_status = "Citing Only"
-        
-        # Рассчитываем Engagement Score (процент публикаций от общей активности)
-        engagement_score_pct = (analyzed_count / total_mentions * 100) if total_mentions > 0 else 0
-        
-        # Определяем Activity Balance
-        if affiliation_status == "Analyzed Only":
-            activity_balance = "Publishing-Only"
-        elif affiliation_status == "Citing Only":
-            activity_balance = "Citing-Only"
-        elif engagement_score_pct >= 70:
-            activity_balance = "Publishing-Heavy"
-        elif engagement_score_pct >= 30:
-            activity_balance = "Balanced"
-        else:
-            activity_balance = "Citing-Heavy"
-        
-        # NEW: Get ROR information from cache or API results
         colab_ror = ""
         website = ""
         if state.include_ror_data and hasattr(state, 'ror_cache'):
@@ -4309,25 +4541,22 @@ def create_combined_affiliations_sheet(analyzed_affiliations_data, citing_affili
                     colab_ror, website = search_ror_organization_cached(affiliation, state.ror_cache)
                 except Exception as e:
                     print(f"Warning: ROR search failed for {affiliation}: {e}")
-        
-        combined_data.append({
-            'Affiliation': affiliation,
-            'Colab-ROR': colab_ror if colab_ror else '',
-            'Website': website if website else '',
-            'Total': total_mentions,
-            'Status': affiliation_status,
-            'Analyzed_Count': analyzed_count,
-            'Citing_Count': citing_count,
-            'Engagement_Score': f"{engagement_score_pct:.1f}%",
-            'Activity_Balance': activity_balance,
-            'Analyzed_Pct': round(analyzed_pct, 2),
-            'Citing_Pct': round(citing_pct, 2)
-        })
-    
-    # Сортируем по общему количеству упоминаний (убывание)
-    combined_data.sort(key=lambda x: x['Total'], reverse=True)
+        colab_rors.append(colab_ror if colab_ror else '')
+        websites.append(website if website else '')
     
-    return combined_data
+    return {
+        'Affiliation': all_affiliations,
+        'Colab-ROR': colab_rors,
+        'Website': websites,
+        'Total': total_mentions.tolist(),
+        'Status': affiliation_status.tolist(),
+        'Analyzed_Count': analyzed_counts.tolist(),
+        'Citing_Count': citing_counts.tolist(),
+        'Engagement_Score': percent_strings(engagement_score_pct),
+        'Activity_Balance': activity_balance(affiliation_status, engagement_score_pct).tolist(),
+        'Analyzed_Pct': count_percentages(analyzed_counts, analyzed_total_mentions).tolist(),
+        'Citing_Pct': count_percentages(citing_counts, citing_total_mentions).tolist()
+    }
 
 def create_combined_countries_sheet(analyzed_countries_data, citing_countries_data, analyzed_total_mentions, citing_total_mentions):
     """Создает объединенный лист стран анализируемых и цитирующих статей"""
@@ -4335,48 +4564,27 @@ def create_combined_countries_sheet(analyzed_countries_data, citing_countries_da
     analyzed_countries = Counter(dict(analyzed_countries_data))
     citing_countries = Counter(dict(citing_countries_data))
     
-    combined_data = []
-    all_countries = set(analyzed_countries.keys()) | set(citing_countries.keys())
+    all_countries = list(set(analyzed_countries.keys()) | set(citing_countries.keys()))
     
-    for country in all_countries:
-        analyzed_count = analyzed_countries.get(country, 0)
-        citing_count = citing_countries.get(country, 0)
-        total_mentions = analyzed_count + citing_count
-        
-        # Рассчитываем проценты
-        analyzed_pct = (analyzed_count / analyzed_total_mentions * 100) if analyzed_total_mentions > 0 else 0
-        citing_pct = (citing_count / citing_total_mentions * 100) if citing_total_mentions > 0 else 0
-        
-        # Определяем статус страны
-        if analyzed_count > 0 and citing_count > 0:
-            country_status = "Both"
-        elif analyzed_count > 0:
-            country_status = "Analyzed Only"
-        else:
-            country_status = "Citing Only"
-        
-        # Рассчитываем Self-Sufficiency (доля локальной активности)
-        self_sufficiency_pct = (analyzed_count / total_mentions * 100) if total_mentions > 0 else 0
-        
-        # Рассчитываем Global Reach (доля международной активности)
-        global_reach_pct = (citing_count / total_mentions * 100) if total_mentions > 0 else 0
-        
-        combined_data.append({
-            'Country': country,
-            'Total': total_mentions,
-            'Status': country_status,
-            'Analyzed_Count': analyzed_count,
-            'Citing_Count': citing_count,
-            'Self_Sufficiency': f"{self_sufficiency_pct:.1f}%",
-            'Global_Reach': f"{global_reach_pct:.1f}%",
-            'Analyzed_Pct': round(analyzed_pct, 2),
-            'Citing_Pct': round(citing_pct, 2)
-        })
+    # Рассчитываем проценты сразу для всех стран
+    analyzed_counts = count_array((analyzed_countries.get(c, 0) for c in all_countries), len(all_countries))
+    citing_counts = count_array((citing_countries.get(c, 0) for c in all_countries), len(all_countries))
+    all_countries, analyzed_counts, citing_counts = order_by_total(all_countries, analyzed_counts, citing_counts)
     
-    # Сортируем по общему количеству упоминаний (убывание)
-    combined_data.sort(key=lambda x: x['Total'], reverse=True)
+    total_mentions = analyzed_counts + citing_counts
     
-    return combined_data
+    return {
+        'Country': all_countries,
+        'Total': total_mentions.tolist(),
+        'Status': presence_status(analyzed_counts, citing_counts).tolist(),
+        'Analyzed_Count': analyzed_counts.tolist(),
+        'Citing_Count': citing_counts.tolist(),
+        # Self-Sufficiency (доля локальной активности) и Global Reach (доля международной активности)
+        'Self_Sufficiency': percent_strings(share_percentages(analyzed_counts, total_mentions)),
+        'Global_Reach': percent_strings(share_percentages(citing_counts, total_mentions)),
+        'Analyzed_Pct': count_percentages(analyzed_counts, analyzed_total_mentions).tolist(),
+        'Citing_Pct': count_percentages(citing_counts, citing_total_mentions).tolist()
+    }
 
 # === NEW FUNCTIONS FOR AUTHOR ID DATA ===
 
@@ -4436,7 +4644,7 @@ def get_work_by_doi(doi):
     doi = doi.strip()
     url = f"https://api.openalex.org/works/https://doi.org/{doi}"
     try:
-        r = requests.get(url, timeout=15)
+        r = HTTP_SESSION.get(url, timeout=15)
         r.raise_for_status()
         return r.json()
     except:
@@ -4472,7 +4680,7 @@ def search_orcid_author(surname, given_name, affiliation):
         
         print(f"📡 ORCID API Request: {url}")
         
-        response = requests.get(url, headers=headers, timeout=15)
+        response = HTTP_SESSION.get(url, headers=headers, timeout=15)
         
         if response.status_code == 200:
             data = response.json()
@@ -4512,7 +4720,7 @@ def get_detailed_orcid_info(orcid_id):
         person_url = f"https://pub.orcid.org/v3.0/{orcid_id}/person"
         headers = {'Accept': 'application/json', 'User-Agent': 'JournalAnalysisTool/1.0'}
         
-        response = requests.get(person_url, headers=headers, timeout=15)
+        response = HTTP_SESSION.get(person_url, headers=headers, timeout=15)
         
         if response.status_code == 200:
             person_data = response.json()
@@ -4638,9 +4846,10 @@ def process_author_id_data_parallel(author_list, state):
                 processed_count += 1
                 
                 # Обновляем прогресс
-                progress = (i + 1) / len(args_list)
-                author_progress.progress(progress)
-                author_status.text(f"🔍 Processing Author ID data: {i + 1}/{len(args_list)}")
+                if should_update_progress(i, len(args_list)):
+                    progress = (i + 1) / len(args_list)
+                    author_progress.progress(progress)
+                    author_status.text(f"🔍 Processing Author ID data: {i + 1}/{len(args_list)}")
                 
                 # Добавляем небольшую задержку для избежания rate limiting
                 time.sleep(0.2)
@@ -4797,70 +5006,175 @@ def create_author_id_sheet(analyzed_metadata, citing_metadata, state):
         'WoS ID'
     ]
     
-    # Фильтруем только нужные колонки для итогового листа
-    final_data = []
-    for record in author_id_data:
-        final_record = {col: record[col] for col in final_columns}
-        final_data.append(final_record)
-    
-    return final_data
+    # Фильтруем только нужные колонки для итогового листа (словарь колонок вместо словаря на строку)
+    if not author_id_data:
+        return {}
+    return {col: [record[col] for record in author_id_data] for col in final_columns}
 
 # === 17. Enhanced Excel Report Creation ===
-def precompute_excel_data(analyzed_data, citing_data, analyzed_stats, citing_stats, enhanced_stats, citation_timing, overlap_details, fast_metrics, additional_data, state):
-    """Предварительный расчет всех данных для Excel отчетов"""
-    
-    print("🔍 Precomputing data for Excel generation...")
-    
-    # Предварительно извлекаем все данные и кэшируем
-    analyzed_precomputed = []
-    for item in analyzed_data:
-        if item and item.get('crossref'):
-            cr = item['crossref']
-            oa = item.get('openalex', {})
-            
-            # Используем кэшированные функции
-            article_data = cached_extract_article_data({'openalex': oa})
-            journal_info = cached_extract_journal_info(item)
-            
-            analyzed_precomputed.append({
-                'cr': cr,
-                'oa': oa,
-                'article_data': article_data,
-                'journal_info': journal_info,
-                'doi': cr.get('DOI', '')
-            })
-    
-    citing_precomputed = []
-    for item in citing_data:
-        if item and item.get('crossref'):
-            cr = item['crossref']
-            oa = item.get('openalex', {})
-            
-            article_data = cached_extract_article_data({'openalex': oa})
-            journal_info = cached_extract_journal_info(item)
-            
-            citing_precomputed.append({
-                'cr': cr,
-                'oa': oa, 
-                'article_data': article_data,
-                'journal_info': journal_info,
-                'doi': cr.get('DOI', '')
-            })
-    
-    # Предварительно вычисляем usage данные для Special Analysis
-    special_metrics = additional_data.get('special_analysis_metrics', {})
-    analyzed_articles_usage = special_metrics.get('debug_info', {}).get('analyzed_articles_usage', {})
-    citing_articles_usage = special_metrics.get('debug_info', {}).get('citing_articles_usage', {})
+
+# Названия месяцев (январь = индекс 0) - из calendar, без 12 вызовов strftime при импорте
+MONTH_NAMES = tuple(calendar.month_name[1:13])
+
+# Фиксированные наборы колонок листов Excel (строки листов собираются кортежами в этом порядке)
+ANALYZED_ARTICLES_COLUMNS = (
+    'DOI', 'Title', 'Authors_Crossref', 'Authors_OpenAlex', 'Affiliations', 'Countries',
+    'Publication_Year', 'Journal', 'Publisher', 'ISSN', 'Reference_Count',
+    'Citations_Crossref', 'Citations_OpenAlex', 'Author_Count', 'Work_Type',
+    'Used for SC', 'Used for IF'
+)
+CITING_WORKS_COLUMNS = (
+    'DOI', 'Title', 'Authors_Crossref', 'Authors_OpenAlex', 'Affiliations', 'Countries',
+    'Publication_Year', 'Journal', 'Publisher', 'ISSN', 'Reference_Count',
+    'Citations_Crossref', 'Citations_OpenAlex', 'Author_Count', 'Work_Type',
+    'Used for SC', 'Used for SC_corr', 'Used for IF', 'Used for IF_corr'
+)
+WORK_OVERLAPS_COLUMNS = (
+    'Analyzed_DOI', 'Citing_DOI', 'Common_Authors', 'Common_Authors_Count',
+    'Common_Affiliations', 'Common_Affiliations_Count'
+)
+FIRST_CITATIONS_COLUMNS = (
+    'Analyzed_DOI', 'First_Citing_DOI', 'Publication_Date', 'First_Citation_Date',
+    'Days_to_First_Citation', 'Same_DOI_Prefix', 'Same_Publication_Date'
+)
+CITATIONS_BY_YEAR_COLUMNS = ('Year', 'Citations_Count')
+CITATION_NETWORK_COLUMNS = ('Publication_Year', 'Citation_Year', 'Citations_Count')
+ALL_JOURNALS_CITING_COLUMNS = (
+    'Journal', 'ISSN_1', 'ISSN_2', 'Articles_Count', 'Percentage', '',
+    'IF (WoS)', 'Q(WoS)', 'SC(Scopus)', 'Q(Scopus)'
+)
+ALL_PUBLISHERS_CITING_COLUMNS = ('Publisher', 'Articles_Count', 'Percentage')
+OPTIMAL_PUBLICATION_MONTHS_COLUMNS = (
+    'High_Citation_Month', 'Citation_Count', 'Recommended_Publication_Month', 'Reasoning'
+)
+POTENTIAL_REVIEWERS_COLUMNS = ('Author', 'Citation_Count', 'Citing_DOI')
+# Плоское представление цитирующих работ: колонки Citing_Works без usage + служебные поля
+CITING_FLAT_COLUMNS = CITING_WORKS_COLUMNS[:-4] + ('Container_Title', 'Crossref_ISSNs')
+CITING_WORKS_TEXT_LIMITS = {
+    'DOI': 100, 'Title': 200, 'Authors_Crossref': 300, 'Authors_OpenAlex': 300,
+    'Affiliations': 500, 'Countries': 100, 'Journal': 100, 'Publisher': 100,
+    'ISSN': 50, 'Work_Type': 50
+}
+
+# Спецификация листа Statistics: (название метрики, ключ в stats, формат).
+# Ключ None - строка-заголовок группы, в значение пишется само название.
+STATISTICS_METRICS = (
+    ('Total Articles', 'n_items', None),
+    ('Total References', 'total_refs', None),
+    ('References with DOI', None, None),
+    ('References with DOI Count', 'refs_with_doi', None),
+    ('References with DOI Percentage', 'refs_with_doi_pct', '{:.1f}%'),
+    ('References without DOI', None, None),
+    ('References without DOI Count', 'refs_without_doi', None),
+    ('References without DOI Percentage', 'refs_without_doi_pct', '{:.1f}%'),
+    ('Self-Citations', None, None),
+    ('Self-Citations Count', 'self_cites', None),
+    ('Self-Citations Percentage', 'self_cites_pct', '{:.1f}%'),
+    ('Single Author Articles', 'single_authors', None),
+    ('Articles with >10 Authors', 'multi_authors_gt10', None),
+    ('Minimum References', 'ref_min', None),
+    ('Maximum References', 'ref_max', None),
+    ('Average References', 'ref_mean', '{:.1f}'),
+    ('Median References', 'ref_median', None),
+    ('Minimum Authors', 'auth_min', None),
+    ('Maximum Authors', 'auth_max', None),
+    ('Average Authors', 'auth_mean', '{:.1f}'),
+    ('Median Authors', 'auth_median', None),
+    ('Single Country Articles', 'single_country_articles', None),
+    ('Single Country Articles Percentage', 'single_country_pct', '{:.1f}%'),
+    ('Multiple Country Articles', 'multi_country_articles', None),
+    ('Multiple Country Articles Percentage', 'multi_country_pct', '{:.1f}%'),
+    ('No Country Data Articles', 'no_country_articles', None),
+    ('No Country Data Articles Percentage', 'no_country_pct', '{:.1f}%'),
+    ('Total Affiliations', 'total_affiliations_count', None),
+    ('Unique Affiliations', 'unique_affiliations_count', None),
+    ('Unique Countries', 'unique_countries_count', None),
+    ('Unique Journals', 'unique_journals_count', None),
+    ('Unique Publishers', 'unique_publishers_count', None),
+    ('Articles with ≥10 citations', 'articles_with_10_citations', None),
+    ('Articles with ≥20 citations', 'articles_with_20_citations', None),
+    ('Articles with ≥30 citations', 'articles_with_30_citations', None),
+    ('Articles with ≥50 citations', 'articles_with_50_citations', None),
+)
+STATISTICS_METRIC_NAMES = tuple(metric for metric, _, _ in STATISTICS_METRICS)
+# Для цитирующих работ пороги цитирований не применимы
+STATISTICS_ANALYZED_ONLY_KEYS = frozenset({
+    'articles_with_10_citations', 'articles_with_20_citations',
+    'articles_with_30_citations', 'articles_with_50_citations'
+})
+
+def format_date_column(dates, date_format='%Y-%m-%d', missing='N/A'):
+    """Векторное форматирование списка дат (пустые значения -> missing)"""
+    # Часовой пояс отбрасываем, как и при форматировании каждой даты через strftime
+    naive_dates = [date.replace(tzinfo=None) if date else None for date in dates]
+    formatted = pd.to_datetime(pd.Series(naive_dates, dtype=object), errors='coerce').dt.strftime(date_format)
+    return formatted.fillna(missing).tolist()
+
+def write_rows_to_sheet(writer, sheet_name, columns, rows):
+    """Потоковая запись строк (кортежей) в лист Excel без промежуточного DataFrame.
+    
+    Пустые листы не создаются. Возвращает количество записанных строк данных.
+    """
+    rows = iter(rows)
+    first_row = next(rows, None)
+    if first_row is None:
+        return 0
+    
+    book = writer.book
+    row_count = 0
+    if writer.engine == 'xlsxwriter':
+        worksheet = book.add_worksheet(sheet_name)
+        worksheet.write_row(0, 0, columns, book.add_format({'bold': True}))
+        for row_count, row in enumerate(itertools.chain((first_row,), rows), 1):
+            worksheet.write_row(row_count, 0, row)
+    else:
+        worksheet = book.create_sheet(sheet_name)
+        # WriteOnlyCell: в режиме write_only к ячейкам уже записанных строк обратиться нельзя
+        header = [WriteOnlyCell(worksheet, value=column) for column in columns]
+        for cell in header:
+            cell.font = Font(bold=True)
+        worksheet.append(header)
+        for row_count, row in enumerate(itertools.chain((first_row,), rows), 1):
+            worksheet.append(row)
+    return row_count
+
+# Размер блока строк при потоковой записи DataFrame в лист
+EXCEL_ROW_CHUNK_SIZE = 5000
+
+# Бесконечности пишутся строкой, как раньше делал to_excel(inf_rep='inf'):
+# xlsxwriter на inf падает с TypeError, а openpyxl оставляет пустую ячейку
+EXCEL_INF_VALUES = {np.inf: 'inf', -np.inf: '-inf'}
+
+def excel_cell_value(value):
+    """Значение ячейки для write_rows_to_sheet: NaN -> пустая ячейка, ±inf -> 'inf'/'-inf'"""
+    if isinstance(value, float):
+        if value != value:
+            return None
+        if value in EXCEL_INF_VALUES:
+            return EXCEL_INF_VALUES[value]
+    return value
+
+def dataframe_rows(df, chunk_size=EXCEL_ROW_CHUNK_SIZE):
+    """Строки DataFrame по порядку (row-major) для write_rows_to_sheet; NaN -> пустая ячейка, ±inf -> 'inf'/'-inf'.
     
-    return {
-        'analyzed_precomputed': analyzed_precomputed,
-        'citing_precomputed': citing_precomputed,
-        'analyzed_articles_usage': analyzed_articles_usage,
-        'citing_articles_usage': citing_articles_usage
-    }
+    Приведение к object выполняется блоками: в памяти одновременно только копия текущего блока,
+    а не всего листа (важно для Citing_Works на десятках тысяч работ).
+    """
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start:start + chunk_size]
+        values = chunk.astype(object).where(chunk.notna(), None)
+        yield from values.replace(EXCEL_INF_VALUES).itertuples(index=False, name=None)
+
+def value_rows(*columns):
+    """Строки небольшого листа из параллельных списков значений (без DataFrame); NaN -> пустая ячейка, ±inf -> 'inf'/'-inf'"""
+    return [tuple(map(excel_cell_value, row)) for row in zip(*columns)]
 
 def create_enhanced_excel_report(analyzed_data, citing_data, analyzed_stats, citing_stats, enhanced_stats, citation_timing, overlap_details, fast_metrics, excel_buffer, additional_data):
-    """Create enhanced Excel report with error handling for large data"""
+    """Create enhanced Excel report with error handling for large data.
+
+    Returns the buffer holding the report (a fresh one if the simplified
+    fallback report had to be written) or None on failure.
+    """
     
     # ДОБАВИТЬ В НАЧАЛО ФУНКЦИИ:
     state = get_analysis_state()
@@ -4896,13 +5210,81 @@ def create_enhanced_excel_report(analyzed_data, citing_data, analyzed_stats, cit
         cleaned = [str(x).strip() for x in items if x is not None and str(x).strip()]
         result = sep.join(cleaned)
         return result[:max_len] if max_len else result
+    
+    # Независимые листы без обращений к Streamlit строятся в фоновых потоках: в excel_sheets
+    # на место листа кладется Future (порядок листов сохраняется), результат забирается при записи.
+    # Builder возвращает DataFrame или None (лист не создается).
+    # Пул закрывается в finally: при ошибке еще не начатые сборщики листов отменяются.
+    sheet_executor = ThreadPoolExecutor(max_workers=4)
             
     try:
-        with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-            # Sheet 1: Analyzed articles (with optimization)
-            analyzed_list = []
-            MAX_ROWS = 50000
-            
+        # Все листы сначала собираются (DataFrame или потоковые строки), затем записываются за один проход
+        excel_sheets = {}
+        
+        def add_sheet(sheet_name, rows, columns, percent_total=None):
+            """Лист из кортежей строк; пустые листы не создаются.
+            percent_total - знаменатель для колонки Percentage (считается векторно по Articles_Count)"""
+            if len(rows) == 0:
+                return
+            sheet_df = pd.DataFrame.from_records(rows, columns=columns)
+            if percent_total is not None:
+                add_percentage_column(sheet_df, percent_total)
+            excel_sheets[sheet_name] = sheet_df
+        
+        def build_combined_sheet(builder, *args):
+            sheet_df = pd.DataFrame(builder(*args))  # builder возвращает словарь колонок
+            return sheet_df if len(sheet_df) > 0 else None
+        
+        combined_args = {
+            # Sheet 9: Combined Authors (REPLACES All_Authors_Analyzed and All_Authors_Citing)
+            'Combined_Authors': (
+                create_combined_authors_sheet,
+                analyzed_stats['all_authors'],
+                citing_stats['all_authors'],
+                analyzed_stats['n_items'],
+                citing_stats['n_items']
+            ),
+            # Sheet 10: Combined Affiliations (REPLACES All_Affiliations_Analyzed and All_Affiliations_Citing)
+            'Combined_Affiliations': (
+                create_combined_affiliations_sheet,
+                analyzed_stats['all_affiliations'],
+                citing_stats['all_affiliations'],
+                int(count_array((count for _, count in analyzed_stats['all_affiliations']), len(analyzed_stats['all_affiliations'])).sum()),
+                int(count_array((count for _, count in citing_stats['all_affiliations']), len(citing_stats['all_affiliations'])).sum()),
+                state  # NEW: Pass state to access ROR settings
+            ),
+            # Sheet 11: Combined Countries (REPLACES All_Countries_Analyzed and All_Countries_Citing)
+            'Combined_Countries': (
+                create_combined_countries_sheet,
+                analyzed_stats['all_countries'],
+                citing_stats['all_countries'],
+                int(count_array((count for _, count in analyzed_stats['all_countries']), len(analyzed_stats['all_countries'])).sum()),
+                int(count_array((count for _, count in citing_stats['all_countries']), len(citing_stats['all_countries'])).sum())
+            )
+        }
+        # Combined_* стартуют сразу и считаются, пока основной поток собирает листы 1-8.
+        # С ROR-данными лист аффилиаций рисует прогресс-бар Streamlit - он строится в основном потоке.
+        combined_futures = {
+            sheet_name: sheet_executor.submit(build_combined_sheet, *args)
+            for sheet_name, args in combined_args.items()
+            if not (sheet_name == 'Combined_Affiliations' and state.include_ror_data)
+        }
+        
+        # Sheet 1: Analyzed articles (with optimization)
+        MAX_ROWS = 50000
+        
+        # Снимок additional_data: необязательные разделы извлекаются один раз (None - раздела нет)
+        state = get_analysis_state()
+        special_metrics = additional_data.get('special_analysis_metrics')
+        title_keywords = additional_data.get('title_keywords')
+        citation_seasonality = additional_data.get('citation_seasonality')
+        potential_reviewers_info = additional_data.get('potential_reviewers')
+        special_debug_info = special_metrics.get('debug_info', EMPTY_MAPPING) if special_metrics is not None else EMPTY_MAPPING
+        analyzed_articles_usage = special_debug_info.get('analyzed_articles_usage', {})
+        
+        def iter_analyzed_rows():
+            _sc, _sj = safe_convert, safe_join
+            _issn_join = '; '.join  # ISSN - чистые короткие строки, без промежуточного списка
             # ИСПОЛЬЗУЕМ ПРЕДВАРИТЕЛЬНО ВЫЧИСЛЕННЫЕ ДАННЫЕ
             for i, precomputed in enumerate(analyzed_precomputed):
                 if i >= MAX_ROWS:
@@ -4915,30 +5297,25 @@ def create_enhanced_excel_report(analyzed_data, citing_data, analyzed_stats, cit
                 analyzed_doi = cr.get('DOI', '')
                 usage_info = analyzed_articles_usage.get(analyzed_doi, {})
                 
-                analyzed_list.append({
-                    'DOI': safe_convert(cr.get('DOI', ''))[:100],
-                    'Title': (cr.get('title', [''])[0] if cr.get('title') else 'No title')[:200],
-                    'Authors_Crossref': safe_join([f"{a.get('given', '')} {a.get('family', '')}".strip() for a in cr.get('author', []) if a.get('given') or a.get('family')])[:300],
-                    'Authors_OpenAlex': safe_join(article_data['authors'])[:300],  # ИЗ КЭША
-                    'Affiliations': safe_join(article_data['affiliations'])[:500],  # ИЗ КЭША
-                    'Countries': safe_join(article_data['countries'])[:100],  # ИЗ КЭША
-                    'Publication_Year': safe_convert(cr.get('published', {}).get('date-parts', [[0]])[0][0]),
-                    'Journal': safe_convert(journal_info['journal_name'])[:100],  # ИЗ КЭША
-                    'Publisher': safe_convert(journal_info['publisher'])[:100],  # ИЗ КЭША
-                    'ISSN': safe_join([str(issn) for issn in journal_info['issn'] if issn])[:50],  # ИЗ КЭША
-                    'Reference_Count': safe_convert(cr.get('reference-count', 0)),
-                    'Citations_Crossref': safe_convert(cr.get('is-referenced-by-count', 0)),
-                    'Citations_OpenAlex': safe_convert(precomputed['oa'].get('cited_by_count', 0)) if precomputed['oa'] else 0,
-                    'Author_Count': safe_convert(len(cr.get('author', []))),
-                    'Work_Type': safe_convert(cr.get('type', ''))[:50],
-                    'Used for SC': '×' if usage_info.get('used_for_sc') else '',
-                    'Used for IF': '×' if usage_info.get('used_for_if') else ''
-                })
-            
-            # Get special analysis metrics if available
-            state = get_analysis_state()
-            special_metrics = additional_data.get('special_analysis_metrics', {})
-            analyzed_articles_usage = special_metrics.get('debug_info', {}).get('analyzed_articles_usage', {})
+                yield (
+                    (cr.get('DOI') or '')[:100],
+                    (cr.get('title', [''])[0] if cr.get('title') else 'No title')[:200],
+                    _sj([f"{a.get('given', '')} {a.get('family', '')}".strip() for a in cr.get('author', []) if a.get('given') or a.get('family')])[:300],
+                    _sj(article_data['authors'])[:300],  # ИЗ КЭША
+                    _sj(article_data['affiliations'])[:500],  # ИЗ КЭША
+                    _sj(article_data['countries'])[:100],  # ИЗ КЭША
+                    int(cr.get('published', {}).get('date-parts', [[0]])[0][0] or 0),
+                    _sc(journal_info['journal_name'])[:100],  # ИЗ КЭША
+                    _sc(journal_info['publisher'])[:100],  # ИЗ КЭША
+                    _issn_join(str(issn) for issn in journal_info['issn'] if issn)[:50],  # ИЗ КЭША
+                    int(cr.get('reference-count') or 0),
+                    int(cr.get('is-referenced-by-count') or 0),
+                    int(precomputed['oa'].get('cited_by_count') or 0) if precomputed['oa'] else 0,
+                    len(cr.get('author', [])),
+                    (cr.get('type') or '')[:50],
+                    '×' if usage_info.get('used_for_sc') else '',
+                    '×' if usage_info.get('used_for_if') else ''
+                )
             
             for i, item in enumerate(analyzed_data):
                 if i >= MAX_ROWS:
@@ -4946,592 +5323,489 @@ def create_enhanced_excel_report(analyzed_data, citing_data, analyzed_stats, cit
                 if item and item.get('crossref'):
                     cr = item['crossref']
                     oa = item.get('openalex', {})
-                    authors_list, affiliations_list, countries_list = extract_affiliations_and_countries(oa)
-                    journal_info = extract_journal_info(item)
+                    authors_list, affiliations_list, countries_list = cached_extract_authors(oa)
+                    journal_info = cached_extract_journal_info(item)
                     
                     analyzed_doi = cr.get('DOI', '')
                     usage_info = analyzed_articles_usage.get(analyzed_doi, {})
                     
-                    analyzed_list.append({
-                        'DOI': safe_convert(cr.get('DOI', ''))[:100],
-                        'Title': (cr.get('title', [''])[0] if cr.get('title') else 'No title')[:200],
-                        'Authors_Crossref': safe_join([f"{a.get('given', '')} {a.get('family', '')}".strip() for a in cr.get('author', []) if a.get('given') or a.get('family')])[:300],
-                        'Authors_OpenAlex': safe_join(authors_list)[:300],
-                        'Affiliations': safe_join(affiliations_list)[:500],
-                        'Countries': safe_join(countries_list)[:100],
-                        'Publication_Year': safe_convert(cr.get('published', {}).get('date-parts', [[0]])[0][0]),
-                        'Journal': safe_convert(journal_info['journal_name'])[:100],
-                        'Publisher': safe_convert(journal_info['publisher'])[:100],
-                        'ISSN': safe_join([str(issn) for issn in journal_info['issn'] if issn])[:50],
-                        'Reference_Count': safe_convert(cr.get('reference-count', 0)),
-                        'Citations_Crossref': safe_convert(cr.get('is-referenced-by-count', 0)),
-                        'Citations_OpenAlex': safe_convert(oa.get('cited_by_count', 0)) if oa else 0,
-                        'Author_Count': safe_convert(len(cr.get('author', []))),
-                        'Work_Type': safe_convert(cr.get('type', ''))[:50],
-                        'Used for SC': '×' if usage_info.get('used_for_sc') else '',
-                        'Used for IF': '×' if usage_info.get('used_for_if') else ''
-                    })
+                    yield (
+                        (cr.get('DOI') or '')[:100],
+                        (cr.get('title', [''])[0] if cr.get('title') else 'No title')[:200],
+                        _sj([f"{a.get('given', '')} {a.get('family', '')}".strip() for a in cr.get('author', []) if a.get('given') or a.get('family')])[:300],
+                        _sj(authors_list)[:300],
+                        _sj(affiliations_list)[:500],
+                        _sj(countries_list)[:100],
+                        int(cr.get('published', {}).get('date-parts', [[0]])[0][0] or 0),
+                        _sc(journal_info['journal_name'])[:100],
+                        _sc(journal_info['publisher'])[:100],
+                        _issn_join(str(issn) for issn in journal_info['issn'] if issn)[:50],
+                        int(cr.get('reference-count') or 0),
+                        int(cr.get('is-referenced-by-count') or 0),
+                        int(oa.get('cited_by_count') or 0) if oa else 0,
+                        len(cr.get('author', [])),
+                        (cr.get('type') or '')[:50],
+                        '×' if usage_info.get('used_for_sc') else '',
+                        '×' if usage_info.get('used_for_if') else ''
+                    )
+        
+        excel_sheets['Analyzed_Articles'] = (ANALYZED_ARTICLES_COLUMNS, iter_analyzed_rows())
+
+        # Sheet 2: Citing works (with optimization) - UPDATED WITH 4 NEW COLUMNS
+        
+        # Get citing articles usage from special analysis metrics - FIXED LOGIC
+        citing_usage_dict = {}
+        if special_metrics is not None:
+            citing_usage_dict = special_debug_info.get('citing_articles_usage', {})
+            print(f"🔍 DEBUG: Loaded citing_usage_dict with {len(citing_usage_dict)} entries for Citing_Works sheet")
+        
+        def flatten_citing_item(precomputed):
+            """Плоская запись цитирующей работы: одна колонка на поле (без обрезки строк)"""
+            cr = precomputed['cr']
+            oa = precomputed['oa']
+            article_data = precomputed['article_data']
+            journal_info = precomputed['journal_info']
+            
+            crossref_issns = cr.get('ISSN') or []
+            if isinstance(crossref_issns, str):
+                crossref_issns = [crossref_issns]
             
-            if analyzed_list:
-                analyzed_df = pd.DataFrame(analyzed_list)
-                analyzed_df.to_excel(writer, sheet_name='Analyzed_Articles', index=False)
+            return {
+                'DOI': cr.get('DOI') or '',
+                'Title': cr.get('title', [''])[0] if cr.get('title') else 'No title',
+                'Authors_Crossref': safe_join([f"{a.get('given', '')} {a.get('family', '')}".strip() for a in cr.get('author', []) if a.get('given') or a.get('family')]),
+                'Authors_OpenAlex': safe_join(article_data['authors']),  # ИЗ КЭША
+                'Affiliations': safe_join(article_data['affiliations']),  # ИЗ КЭША
+                'Countries': safe_join(article_data['countries']),  # ИЗ КЭША
+                'Publication_Year': int(cr.get('published', {}).get('date-parts', [[0]])[0][0] or 0),
+                'Journal': safe_convert(journal_info['journal_name']),
+                'Publisher': safe_convert(journal_info['publisher']),
+                'ISSN': '; '.join(str(issn) for issn in journal_info['issn'] if issn),
+                'Reference_Count': int(cr.get('reference-count') or 0),
+                'Citations_Crossref': int(cr.get('is-referenced-by-count') or 0),
+                'Citations_OpenAlex': int(oa.get('cited_by_count') or 0) if oa else 0,
+                'Author_Count': len(cr.get('author', [])),
+                'Work_Type': cr.get('type') or '',
+                # Служебные поля для листа All_Journals_Citing (только Crossref)
+                'Container_Title': cr.get('container-title', [''])[0] if cr.get('container-title') else '',
+                'Crossref_ISSNs': [str(issn).strip() for issn in crossref_issns if issn and isinstance(issn, str)]
+            }
+        
+        # Разворачиваем citing_precomputed в DataFrame один раз - его используют листы Citing_Works и All_Journals_Citing
+        citing_df = pd.DataFrame.from_records(map(flatten_citing_item, citing_precomputed), columns=CITING_FLAT_COLUMNS)
+        
+        citing_works_df = citing_df.head(MAX_ROWS)[list(CITING_WORKS_COLUMNS[:-4])].copy()
+        
+        # FIXED: Properly extract usage information from citing_usage_dict (по полному DOI, до обрезки)
+        citing_dois = citing_works_df['DOI']
+        for i, citing_doi in enumerate(citing_dois.head(5).tolist()):
+            if citing_doi:
+                print(f"🔍 Citing_Works DEBUG - Item {i}: DOI={citing_doi}, usage_info={citing_usage_dict.get(citing_doi, {})}")
+        
+        # FIXED: 4 columns for special analysis usage - маски по DOI вместо 4 проб словаря на строку
+        usage_columns = {}
+        for column, usage_key in (('Used for SC', 'used_for_sc'), ('Used for SC_corr', 'used_for_sc_corr'),
+                                  ('Used for IF', 'used_for_if'), ('Used for IF_corr', 'used_for_if_corr')):
+            used_dois = [doi for doi, usage_info in citing_usage_dict.items() if usage_info.get(usage_key)]
+            usage_columns[column] = np.where(citing_dois.isin(used_dois).to_numpy(), '×', '')
+        
+        # Обрезка длинных строк - векторно, по колонкам
+        for column, max_len in CITING_WORKS_TEXT_LIMITS.items():
+            citing_works_df[column] = citing_works_df[column].str.slice(0, max_len)
+        
+        for column, values in usage_columns.items():
+            citing_works_df[column] = values
+        
+        excel_sheets['Citing_Works'] = citing_works_df
+
+        # Sheet 3: Overlaps between analyzed and citing works
+        overlap_rows = (
+            (
+                safe_convert(overlap['analyzed_doi'])[:100],
+                safe_convert(overlap['citing_doi'])[:100],
+                safe_join(overlap['common_authors'])[:300],
+                safe_convert(overlap['common_authors_count']),
+                safe_join(overlap['common_affiliations'])[:500],
+                safe_convert(overlap['common_affiliations_count'])
+            )
+            for overlap in overlap_details
+        )
+        excel_sheets['Work_Overlaps'] = (WORK_OVERLAPS_COLUMNS, overlap_rows)
+
+        # Sheet 4: Time to first citation (С ИСКЛЮЧЕНИЕМ РЕДАКТОРСКИХ ЗАМЕТОК)
+        def build_first_citations_sheet():
+            # === ИСКЛЮЧЕНИЕ РЕДАКТОРСКИХ ЗАМЕТОК ===
+            # Не включаем записи с тем же префиксом и той же датой
+            first_citation_details = [
+                detail for detail in citation_timing.get('first_citation_details', [])
+                if not (detail.get('same_prefix', False) and detail.get('same_date', False))
+            ]
+        
+            if first_citation_details:
+                # Даты форматируются одним векторным вызовом для всего столбца
+                first_citation_df = pd.DataFrame({
+                    'Analyzed_DOI': [safe_convert(detail['analyzed_doi'])[:100] for detail in first_citation_details],
+                    'First_Citing_DOI': [safe_convert(detail['citing_doi'])[:100] for detail in first_citation_details],
+                    'Publication_Date': format_date_column([detail['analyzed_date'] for detail in first_citation_details]),
+                    'First_Citation_Date': format_date_column([detail['first_citation_date'] for detail in first_citation_details]),
+                    'Days_to_First_Citation': [safe_convert(detail['days_to_first_citation']) for detail in first_citation_details],
+                    'Same_DOI_Prefix': [detail.get('same_prefix', False) for detail in first_citation_details],
+                    'Same_Publication_Date': [detail.get('same_date', False) for detail in first_citation_details]
+                }, columns=FIRST_CITATIONS_COLUMNS)
+                return first_citation_df
+            return None
+        
+        excel_sheets['First_Citations'] = sheet_executor.submit(build_first_citations_sheet)
+
+        # Sheet 5: Combined Statistics (NEW - объединенный лист)
+        def statistics_values(stats, is_citing=False):
+            values = []
+            for metric, key, fmt in STATISTICS_METRICS:
+                if key is None:
+                    values.append(metric)
+                elif is_citing and key in STATISTICS_ANALYZED_ONLY_KEYS:
+                    values.append('N/A')
+                else:
+                    value = safe_convert(stats[key])
+                    values.append(fmt.format(value) if fmt else value)
+            return values
+        
+        # Небольшие листы метрик пишутся строками напрямую, без DataFrame
+        excel_sheets['Statistics'] = (
+            ('Metric', 'Value_Analyzed', 'Value_Citing'),
+            value_rows(STATISTICS_METRIC_NAMES, statistics_values(analyzed_stats), statistics_values(citing_stats, is_citing=True))
+        )
 
-            # Sheet 2: Citing works (with optimization) - UPDATED WITH 4 NEW COLUMNS
-            citing_list = []
+        # Sheet 6: Combined Citing Stats (NEW - объединенный лист Enhanced_Statistics и Citation_Timing)
+        citing_stats_data = {
+            'Metric': [
+                'H-index', 'Total Citations',
+                'Average Citations per Article', 'Maximum Citations',
+                'Minimum Citations', 'Articles with Citations',
+                'Articles without Citations',
+                'Minimum Days to First Citation',
+                'Maximum Days to First Citation', 
+                'Average Days to First Citation',
+                'Median Days to First Citation', 
+                'Articles with Citation Timing Data',
+                'Total Years Covered by Citation Data'
+            ],
+            'Value': [
+                safe_convert(enhanced_stats['h_index']),
+                safe_convert(enhanced_stats['total_citations']),
+                f"{safe_convert(enhanced_stats['avg_citations_per_article']):.1f}",
+                safe_convert(enhanced_stats['max_citations']),
+                safe_convert(enhanced_stats['min_citations']),
+                safe_convert(enhanced_stats['articles_with_citations']),
+                safe_convert(enhanced_stats['articles_without_citations']),
+                safe_convert(citation_timing['days_min']),
+                safe_convert(citation_timing['days_max']),
+                f"{safe_convert(citation_timing['days_mean']):.1f}",
+                safe_convert(citation_timing['days_median']),
+                safe_convert(citation_timing['articles_with_timing_data']),
+                safe_convert(citation_timing['total_years_covered'])
+            ]
+        }
+        excel_sheets['Citing_Stats'] = (('Metric', 'Value'), value_rows(citing_stats_data['Metric'], citing_stats_data['Value']))
+
+        # Sheet 7: Citations by year
+        yearly_citations_data = []
+        for yearly_stat in citation_timing['yearly_citations']:
+            yearly_citations_data.append((
+                safe_convert(yearly_stat['year']),
+                safe_convert(yearly_stat['citations_count'])
+            ))
+        
+        add_sheet('Citations_by_Year', yearly_citations_data, CITATIONS_BY_YEAR_COLUMNS)
+
+        # Sheet 8: Citation network (СОРТИРОВКА ПО ГОДАМ)
+        def build_citation_network_sheet():
+            citation_network = enhanced_stats.get('citation_network', {})
+            publication_years = np.repeat(
+                np.array([safe_convert(year) or 0 for year in citation_network], dtype=np.int64),
+                [len(citing_years) for citing_years in citation_network.values()]
+            )
+            citation_years = np.fromiter(
+                (citing_year or 0 for citing_years in citation_network.values() for citing_year in citing_years),
+                dtype=np.int64, count=len(publication_years)
+            )
+        
+            # === СОРТИРОВКА: сначала по году публикации, затем по году цитирования ===
+            # np.unique по строкам считает пары (год публикации, год цитирования) и возвращает их уже отсортированными
+            if len(publication_years):
+                year_pairs, pair_counts = np.unique(
+                    np.column_stack((publication_years, citation_years)), axis=0, return_counts=True
+                )
+                citation_network_df = pd.DataFrame({
+                    'Publication_Year': year_pairs[:, 0],
+                    'Citation_Year': year_pairs[:, 1],
+                    'Citations_Count': pair_counts
+                }, columns=CITATION_NETWORK_COLUMNS)
+                return citation_network_df
+            return None
+        
+        excel_sheets['Citation_Network'] = sheet_executor.submit(build_citation_network_sheet)
+
+        # === NEW COMBINED SHEETS ===
+
+        # Sheets 9-11: объединенные листы (Future из фоновых потоков или готовый DataFrame)
+        for sheet_name, args in combined_args.items():
+            excel_sheets[sheet_name] = combined_futures.get(sheet_name) or build_combined_sheet(*args)
+
+        # Sheet 12: All journals citing (with percentages) - UPDATED VERSION WITH CS DATA
+        if len(citing_stats['all_journals']) > 0:
+            all_citing_journals_data = []
+            total_citing_articles = safe_convert(citing_stats['n_items'])
             
-            # Get citing articles usage from special analysis metrics - FIXED LOGIC
-            citing_usage_dict = {}
-            if 'special_analysis_metrics' in additional_data:
-                debug_info = additional_data['special_analysis_metrics'].get('debug_info', {})
-                citing_usage_dict = debug_info.get('citing_articles_usage', {})
-                print(f"🔍 DEBUG: Loaded citing_usage_dict with {len(citing_usage_dict)} entries for Citing_Works sheet")
+            # Load metrics data if not already loaded
+            if get_analysis_state().if_data is None or get_analysis_state().cs_data is None:
+                load_metrics_data()
             
-            for i, item in enumerate(citing_data):
-                if i >= MAX_ROWS:
-                    break
-                if item and item.get('crossref'):
-                    cr = item['crossref']
-                    oa = item.get('openalex', {})
-                    authors_list, affiliations_list, countries_list = extract_affiliations_and_countries(oa)
-                    journal_info = extract_journal_info(item)
-                    
-                    citing_doi = cr.get('DOI', '')
-                    
-                    # FIXED: Properly extract usage information from citing_usage_dict
-                    usage_info = citing_usage_dict.get(citing_doi, {})
-                    
-                    # Debug output for first few records
-                    if i < 5 and citing_doi:
-                        print(f"🔍 Citing_Works DEBUG - Item {i}: DOI={citing_doi}, usage_info={usage_info}")
-                    
-                    citing_list.append({
-                        'DOI': safe_convert(cr.get('DOI', ''))[:100],
-                        'Title': (cr.get('title', [''])[0] if cr.get('title') else 'No title')[:200],
-                        'Authors_Crossref': safe_join([f"{a.get('given', '')} {a.get('family', '')}".strip() for a in cr.get('author', []) if a.get('given') or a.get('family')])[:300],
-                        'Authors_OpenAlex': safe_join(authors_list)[:300],
-                        'Affiliations': safe_join(affiliations_list)[:500],
-                        'Countries': safe_join(countries_list)[:100],
-                        'Publication_Year': safe_convert(cr.get('published', {}).get('date-parts', [[0]])[0][0]),
-                        'Journal': safe_convert(journal_info['journal_name'])[:100],
-                        'Publisher': safe_convert(journal_info['publisher'])[:100],
-                        'ISSN': safe_join([str(issn) for issn in journal_info['issn'] if issn])[:50],
-                        'Reference_Count': safe_convert(cr.get('reference-count', 0)),
-                        'Citations_Crossref': safe_convert(cr.get('is-referenced-by-count', 0)),
-                        'Citations_OpenAlex': safe_convert(oa.get('cited_by_count', 0)) if oa else 0,
-                        'Author_Count': safe_convert(len(cr.get('author', []))),
-                        'Work_Type': safe_convert(cr.get('type', ''))[:50],
-                        # FIXED: 4 columns for special analysis usage - using proper dictionary access
-                        'Used for SC': '×' if usage_info.get('used_for_sc') else '',
-                        'Used for SC_corr': '×' if usage_info.get('used_for_sc_corr') else '',
-                        'Used for IF': '×' if usage_info.get('used_for_if') else '',
-                        'Used for IF_corr': '×' if usage_info.get('used_for_if_corr') else ''
-                    })
+            # ISSN всех журналов из общего citing_df (уникальные, в порядке появления)
+            journal_issn_map = (
+                citing_df[['Container_Title', 'Crossref_ISSNs']]
+                .explode('Crossref_ISSNs')
+                .dropna(subset=['Crossref_ISSNs'])
+                .groupby('Container_Title', sort=False)['Crossref_ISSNs']
+                .unique()
+            )
             
-            if citing_list:
-                citing_df = pd.DataFrame(citing_list)
-                citing_df.to_excel(writer, sheet_name='Citing_Works', index=False)
-
-            # Sheet 3: Overlaps between analyzed and citing works
-            overlap_list = []
-            for overlap in overlap_details:
-                overlap_list.append({
-                    'Analyzed_DOI': safe_convert(overlap['analyzed_doi'])[:100],
-                    'Citing_DOI': safe_convert(overlap['citing_doi'])[:100],
-                    'Common_Authors': safe_join(overlap['common_authors'])[:300],
-                    'Common_Authors_Count': safe_convert(overlap['common_authors_count']),
-                    'Common_Affiliations': safe_join(overlap['common_affiliations'])[:500],
-                    'Common_Affiliations_Count': safe_convert(overlap['common_affiliations_count'])
-                })
+            for journal_info in citing_stats['all_journals']:
+                journal_name = journal_info[0]
+                count = journal_info[1]
+                
+                # ISSNs for this journal (already deduplicated)
+                journal_issns = list(journal_issn_map.get(journal_name, ()))
+                
+                # Get ISSNs for display
+                issn_1 = journal_issns[0] if len(journal_issns) > 0 else ""
+                issn_2 = journal_issns[1] if len(journal_issns) > 1 else ""
+                
+                # Get metrics for this journal - UPDATED WITH CS DATA
+                metrics = get_journal_metrics(journal_issns)
+                
+                all_citing_journals_data.append((
+                    safe_convert(journal_name),
+                    safe_convert(issn_1),
+                    safe_convert(issn_2),
+                    safe_convert(count),
+                    None,  # Percentage - считается векторно в add_sheet
+                    '',  # Empty column
+                    safe_convert(metrics['if_metrics'].get('if', '')) if metrics['if_metrics'] else '',
+                    safe_convert(metrics['if_metrics'].get('quartile', '')) if metrics['if_metrics'] else '',
+                    safe_convert(metrics['cs_metrics'].get('citescore', '')) if metrics['cs_metrics'] else '',
+                    safe_convert(metrics['cs_metrics'].get('quartile', '')) if metrics['cs_metrics'] else ''
+                ))
             
-            if overlap_list:
-                overlap_df = pd.DataFrame(overlap_list)
-                overlap_df.to_excel(writer, sheet_name='Work_Overlaps', index=False)
+            add_sheet('All_Journals_Citing', all_citing_journals_data, ALL_JOURNALS_CITING_COLUMNS, percent_total=total_citing_articles)
+
+        # Sheet 13: All publishers citing (with percentages)
+        if len(citing_stats['all_publishers']) > 0:
+            total_articles = safe_convert(citing_stats['n_items'])
+            all_citing_publishers_data = [
+                (safe_convert(publisher), safe_convert(count), None)
+                for publisher, count in citing_stats['all_publishers']
+            ]
+            add_sheet('All_Publishers_Citing', all_citing_publishers_data, ALL_PUBLISHERS_CITING_COLUMNS, percent_total=total_articles)
+
+        # Sheet 14: Fast metrics (NEW)
+        # fast_metrics.get связывается один раз; повторно используемые значения считаются заранее
+        fm_get = fast_metrics.get
+        ref_age_q25, ref_age_q75 = fm_get('ref_ages_25_75', NA_PAIR)[:2]
+        total_cites = safe_convert(fm_get('total_cites', 0))
+        fast_metric_names = [
+            'Reference Age (median)', 'Reference Age (mean)',
+            'Reference Age (25-75 percentile)', 'References Analyzed',
+            'Journal Self-Citation Rate (JSCR)', 'Journal Self-Citations',
+            'Total Citations for JSCR',
+            'Cited Half-Life (median)', 'Cited Half-Life (mean)',
+            'Articles with CHL Data',
+            'Field-Weighted Citation Impact (FWCI)', 'Total Citations',
+            'Expected Citations',
+            'Citation Velocity', 'Articles with Velocity Data',
+            'OA Impact Premium', 'OA Articles', 'Non-OA Articles',
+            'Average OA Citations', 'Average Non-OA Citations',
+            'Elite Index', 'Elite Articles', 'Citation Threshold',
+            'Author Gini Index', 'Total Authors',
+            'Average Articles per Author', 'Median Articles per Author',
+            'Diversity Balance Index (DBI)', 'Unique Concepts',
+            'Total Concept Mentions'
+        ]
+        fast_metric_values = [
+            safe_convert(fm_get('ref_median_age', 'N/A')),
+            safe_convert(fm_get('ref_mean_age', 'N/A')),
+            f"{safe_convert(ref_age_q25)}-{safe_convert(ref_age_q75)}",
+            safe_convert(fm_get('total_refs_analyzed', 0)),
+            f"{safe_convert(fm_get('JSCR', 0))}%",
+            safe_convert(fm_get('self_cites', 0)),
+            total_cites,
+            safe_convert(fm_get('cited_half_life_median', 'N/A')),
+            safe_convert(fm_get('cited_half_life_mean', 'N/A')),
+            safe_convert(fm_get('articles_with_chl', 0)),
+            safe_convert(fm_get('FWCI', 0)),
+            total_cites,
+            safe_convert(fm_get('expected_cites', 0)),
+            safe_convert(fm_get('citation_velocity', 0)),
+            safe_convert(fm_get('articles_with_velocity', 0)),
+            f"{safe_convert(fm_get('OA_impact_premium', 0))}%",
+            safe_convert(fm_get('OA_articles', 0)),
+            safe_convert(fm_get('non_OA_articles', 0)),
+            safe_convert(fm_get('OA_avg_citations', 0)),
+            safe_convert(fm_get('non_OA_avg_citations', 0)),
+            f"{safe_convert(fm_get('elite_index', 0))}%",
+            safe_convert(fm_get('elite_articles', 0)),
+            safe_convert(fm_get('citation_threshold', 0)),
+            safe_convert(fm_get('author_gini', 0)),
+            safe_convert(fm_get('total_authors', 0)),
+            safe_convert(fm_get('articles_per_author_avg', 0)),
+            safe_convert(fm_get('articles_per_author_median', 0)),
+            safe_convert(fm_get('DBI', 0)),
+            safe_convert(fm_get('unique_concepts', 0)),
+            safe_convert(fm_get('total_concept_mentions', 0))
+        ]
+        excel_sheets['Fast_Metrics'] = (('Metric', 'Value'), value_rows(fast_metric_names, fast_metric_values))
+
+        # Sheet 15: Top concepts (NEW) - РАСШИРЕНО ДО 10 ТЕРМИНОВ
+        if fast_metrics.get('top_concepts'):
+            # Приведение типов одним векторным вызовом на колонку вместо safe_convert на каждый элемент
+            concept_names, concept_counts = zip(*fast_metrics['top_concepts'])
+            excel_sheets['Top_Concepts'] = (('Concept', 'Mentions_Count'), value_rows(
+                pd.Series(concept_names, dtype=object).fillna('').tolist(),
+                pd.Series(concept_counts, dtype=object).fillna(0).astype(np.int64).tolist()
+            ))
 
-            # Sheet 4: Time to first citation (С ИСКЛЮЧЕНИЕМ РЕДАКТОРСКИХ ЗАМЕТОК)
-            first_citation_list = []
-            for detail in citation_timing.get('first_citation_details', []):
-                # === ИСКЛЮЧЕНИЕ РЕДАКТОРСКИХ ЗАМЕТОК ===
-                # Не включаем записи с тем же префиксом и той же датой
-                if detail.get('same_prefix', False) and detail.get('same_date', False):
-                    continue
-                    
-                first_citation_list.append({
-                    'Analyzed_DOI': safe_convert(detail['analyzed_doi'])[:100],
-                    'First_Citing_DOI': safe_convert(detail['citing_doi'])[:100],
-                    'Publication_Date': detail['analyzed_date'].strftime('%Y-%m-%d') if detail['analyzed_date'] else 'N/A',
-                    'First_Citation_Date': detail['first_citation_date'].strftime('%Y-%m-%d') if detail['first_citation_date'] else 'N/A',
-                    'Days_to_First_Citation': safe_convert(detail['days_to_first_citation']),
-                    'Same_DOI_Prefix': detail.get('same_prefix', False),
-                    'Same_Publication_Date': detail.get('same_date', False)
-                })
+        # === НОВЫЙ ЛИСТ: Объединенный анализ ключевых слов в названиях ===
+        # Sheet 16: Combined Title Keywords (NEW) - ИСПРАВЛЕНО: правильное имя листа
+        if title_keywords is not None:
+            def build_keywords_sheet(keywords_data):
+                normalized_keywords = normalize_keywords_data(keywords_data)
+                return pd.DataFrame.from_records(normalized_keywords, columns=KEYWORD_SHEET_COLUMNS) if normalized_keywords else None
             
-            if first_citation_list:
-                first_citation_df = pd.DataFrame(first_citation_list)
-                first_citation_df.to_excel(writer, sheet_name='First_Citations', index=False)
-
-            # Sheet 5: Combined Statistics (NEW - объединенный лист)
-            statistics_data = {
-                'Metric': [
-                    'Total Articles', 
-                    'Total References', 
-                    'References with DOI', 'References with DOI Count', 'References with DOI Percentage',
-                    'References without DOI', 'References without DOI Count', 'References without DOI Percentage',
-                    'Self-Citations', 'Self-Citations Count', 'Self-Citations Percentage',
-                    'Single Author Articles',
-                    'Articles with >10 Authors', 
-                    'Minimum References', 
-                    'Maximum References', 
-                    'Average References',
-                    'Median References', 
-                    'Minimum Authors',
-                    'Maximum Authors', 
-                    'Average Authors',
-                    'Median Authors', 
-                    'Single Country Articles', 'Single Country Articles Percentage',
-                    'Multiple Country Articles', 'Multiple Country Articles Percentage',
-                    'No Country Data Articles', 'No Country Data Articles Percentage',
-                    'Total Affiliations',
-                    'Unique Affiliations', 
-                    'Unique Countries',
-                    'Unique Journals',
-                    'Unique Publishers',
-                    'Articles with ≥10 citations',
-                    'Articles with ≥20 citations',
-                    'Articles with ≥30 citations',
-                    'Articles with ≥50 citations'
-                ],
-                'Value_Analyzed': [
-                    safe_convert(analyzed_stats['n_items']),
-                    safe_convert(analyzed_stats['total_refs']),
-                    'References with DOI', safe_convert(analyzed_stats['refs_with_doi']), f"{safe_convert(analyzed_stats['refs_with_doi_pct']):.1f}%",
-                    'References without DOI', safe_convert(analyzed_stats['refs_without_doi']), f"{safe_convert(analyzed_stats['refs_without_doi_pct']):.1f}%",
-                    'Self-Citations', safe_convert(analyzed_stats['self_cites']), f"{safe_convert(analyzed_stats['self_cites_pct']):.1f}%",
-                    safe_convert(analyzed_stats['single_authors']),
-                    safe_convert(analyzed_stats['multi_authors_gt10']),
-                    safe_convert(analyzed_stats['ref_min']),
-                    safe_convert(analyzed_stats['ref_max']),
-                    f"{safe_convert(analyzed_stats['ref_mean']):.1f}",
-                    safe_convert(analyzed_stats['ref_median']),
-                    safe_convert(analyzed_stats['auth_min']),
-                    safe_convert(analyzed_stats['auth_max']),
-                    f"{safe_convert(analyzed_stats['auth_mean']):.1f}",
-                    safe_convert(analyzed_stats['auth_median']),
-                    safe_convert(analyzed_stats['single_country_articles']), f"{safe_convert(analyzed_stats['single_country_pct']):.1f}%",
-                    safe_convert(analyzed_stats['multi_country_articles']), f"{safe_convert(analyzed_stats['multi_country_pct']):.1f}%",
-                    safe_convert(analyzed_stats['no_country_articles']), f"{safe_convert(analyzed_stats['no_country_pct']):.1f}%",
-                    safe_convert(analyzed_stats['total_affiliations_count']),
-                    safe_convert(analyzed_stats['unique_affiliations_count']),
-                    safe_convert(analyzed_stats['unique_countries_count']),
-                    safe_convert(analyzed_stats['unique_journals_count']),
-                    safe_convert(analyzed_stats['unique_publishers_count']),
-                    safe_convert(analyzed_stats['articles_with_10_citations']),
-                    safe_convert(analyzed_stats['articles_with_20_citations']),
-                    safe_convert(analyzed_stats['articles_with_30_citations']),
-                    safe_convert(analyzed_stats['articles_with_50_citations'])
-                ],
-                'Value_Citing': [
-                    safe_convert(citing_stats['n_items']),
-                    safe_convert(citing_stats['total_refs']),
-                    'References with DOI', safe_convert(citing_stats['refs_with_doi']), f"{safe_convert(citing_stats['refs_with_doi_pct']):.1f}%",
-                    'References without DOI', safe_convert(citing_stats['refs_without_doi']), f"{safe_convert(citing_stats['refs_without_doi_pct']):.1f}%",
-                    'Self-Citations', safe_convert(citing_stats['self_cites']), f"{safe_convert(citing_stats['self_cites_pct']):.1f}%",
-                    safe_convert(citing_stats['single_authors']),
-                    safe_convert(citing_stats['multi_authors_gt10']),
-                    safe_convert(citing_stats['ref_min']),
-                    safe_convert(citing_stats['ref_max']),
-                    f"{safe_convert(citing_stats['ref_mean']):.1f}",
-                    safe_convert(citing_stats['ref_median']),
-                    safe_convert(citing_stats['auth_min']),
-                    safe_convert(citing_stats['auth_max']),
-                    f"{safe_convert(citing_stats['auth_mean']):.1f}",
-                    safe_convert(citing_stats['auth_median']),
-                    safe_convert(citing_stats['single_country_articles']), f"{safe_convert(citing_stats['single_country_pct']):.1f}%",
-                    safe_convert(citing_stats['multi_country_articles']), f"{safe_convert(citing_stats['multi_country_pct']):.1f}%",
-                    safe_convert(citing_stats['no_country_articles']), f"{safe_convert(citing_stats['no_country_pct']):.1f}%",
-                    safe_convert(citing_stats['total_affiliations_count']),
-                    safe_convert(citing_stats['unique_affiliations_count']),
-                    safe_convert(citing_stats['unique_countries_count']),
-                    safe_convert(citing_stats['unique_journals_count']),
-                    safe_convert(citing_stats['unique_publishers_count']),
-                    'N/A',  # Articles with ≥10 citations (для цитирующих не применимо)
-                    'N/A',  # Articles with ≥20 citations
-                    'N/A',  # Articles with ≥30 citations
-                    'N/A'   # Articles with ≥50 citations
-                ]
-            }
-            statistics_df = pd.DataFrame(statistics_data)
-            statistics_df.to_excel(writer, sheet_name='Statistics', index=False)
-
-            # Sheet 6: Combined Citing Stats (NEW - объединенный лист Enhanced_Statistics и Citation_Timing)
-            citing_stats_data = {
-                'Metric': [
-                    'H-index', 'Total Citations',
-                    'Average Citations per Article', 'Maximum Citations',
-                    'Minimum Citations', 'Articles with Citations',
-                    'Articles without Citations',
-                    'Minimum Days to First Citation',
-                    'Maximum Days to First Citation', 
-                    'Average Days to First Citation',
-                    'Median Days to First Citation', 
-                    'Articles with Citation Timing Data',
-                    'Total Years Covered by Citation Data'
-                ],
-                'Value': [
-                    safe_convert(enhanced_stats['h_index']),
-                    safe_convert(enhanced_stats['total_citations']),
-                    f"{safe_convert(enhanced_stats['avg_citations_per_article']):.1f}",
-                    safe_convert(enhanced_stats['max_citations']),
-                    safe_convert(enhanced_stats['min_citations']),
-                    safe_convert(enhanced_stats['articles_with_citations']),
-                    safe_convert(enhanced_stats['articles_without_citations']),
-                    safe_convert(citation_timing['days_min']),
-                    safe_convert(citation_timing['days_max']),
-                    f"{safe_convert(citation_timing['days_mean']):.1f}",
-                    safe_convert(citation_timing['days_median']),
-                    safe_convert(citation_timing['articles_with_timing_data']),
-                    safe_convert(citation_timing['total_years_covered'])
-                ]
-            }
-            citing_stats_df = pd.DataFrame(citing_stats_data)
-            citing_stats_df.to_excel(writer, sheet_name='Citing_Stats', index=False)
-
-            # Sheet 7: Citations by year
-            yearly_citations_data = []
-            for yearly_stat in citation_timing['yearly_citations']:
-                yearly_citations_data.append({
-                    'Year': safe_convert(yearly_stat['year']),
-                    'Citations_Count': safe_convert(yearly_stat['citations_count'])
-                })
+            excel_sheets['Combined_Title_Keywords'] = sheet_executor.submit(build_keywords_sheet, title_keywords)
+
+        # Sheet 17: Citation seasonality - ИСПРАВЛЕНО: правильное имя листа
+        if citation_seasonality is not None:
+            citation_months = citation_seasonality['citation_months']
+            publication_months = citation_seasonality['publication_months']
             
-            if yearly_citations_data:
-                yearly_citations_df = pd.DataFrame(yearly_citations_data)
-                yearly_citations_df.to_excel(writer, sheet_name='Citations_by_Year', index=False)
-
-            # Sheet 8: Citation network (СОРТИРОВКА ПО ГОДАМ)
-            citation_network_data = []
-            for year, citing_years in enhanced_stats.get('citation_network', {}).items():
-                year_counts = Counter(citing_years)
-                for citing_year, count in year_counts.items():
-                    citation_network_data.append({
-                        'Publication_Year': safe_convert(year),
-                        'Citation_Year': safe_convert(citing_year),
-                        'Citations_Count': safe_convert(count)
-                    })
+            # Citation by month chart - все 12 месяцев одним построением DataFrame
+            seasonality_df = pd.DataFrame({
+                'Month_Number': np.arange(1, 13),
+                'Month_Name': MONTH_NAMES,
+                'Citation_Count': count_array((citation_months.get(month, 0) for month in range(1, 13)), 12),
+                'Publication_Count': count_array((publication_months.get(month, 0) for month in range(1, 13)), 12)
+            })
+            excel_sheets['Citation_Seasonality'] = seasonality_df
+        
+            # Optimal publication months - ИСПРАВЛЕНО: создаем отдельный лист
+            if len(citation_seasonality['optimal_publication_months']) > 0:
+                optimal_months_data = []
+                for optimal in citation_seasonality['optimal_publication_months']:
+                    optimal_months_data.append((
+                        MONTH_NAMES[int(optimal['citation_month']) - 1],
+                        safe_convert(optimal['citation_count']),
+                        MONTH_NAMES[int(optimal['recommended_publication_month']) - 1],
+                        safe_convert(optimal['reasoning'])
+                    ))
+                
+                add_sheet('Optimal_Publication_Months', optimal_months_data, OPTIMAL_PUBLICATION_MONTHS_COLUMNS)
+          
+        # Sheet 18: Potential reviewers - ИСПРАВЛЕНО: правильное имя листа
+        if potential_reviewers_info is not None:
+            reviewers = potential_reviewers_info['potential_reviewers']
             
-            # === СОРТИРОВКА: сначала по году публикации, затем по году цитирования ===
-            if citation_network_data:
-                citation_network_df = pd.DataFrame(citation_network_data)
-                citation_network_df = citation_network_df.sort_values(['Publication_Year', 'Citation_Year'])
-                citation_network_df.to_excel(writer, sheet_name='Citation_Network', index=False)
-
-            # === NEW COMBINED SHEETS ===
-
-            # Sheet 9: Combined Authors (REPLACES All_Authors_Analyzed and All_Authors_Citing)
-            combined_authors_data = create_combined_authors_sheet(
-                analyzed_stats['all_authors'],
-                citing_stats['all_authors'],
-                analyzed_stats['n_items'],
-                citing_stats['n_items']
-            )
-            if combined_authors_data:
-                combined_authors_df = pd.DataFrame(combined_authors_data)
-                combined_authors_df.to_excel(writer, sheet_name='Combined_Authors', index=False)
-
-            # Sheet 10: Combined Affiliations (REPLACES All_Affiliations_Analyzed and All_Affiliations_Citing)
-            combined_affiliations_data = create_combined_affiliations_sheet(
-                analyzed_stats['all_affiliations'],
-                citing_stats['all_affiliations'],
-                sum(count for _, count in analyzed_stats['all_affiliations']),
-                sum(count for _, count in citing_stats['all_affiliations']),
-                state  # NEW: Pass state to access ROR settings
-            )
-            if combined_affiliations_data:
-                combined_affiliations_df = pd.DataFrame(combined_affiliations_data)
-                combined_affiliations_df.to_excel(writer, sheet_name='Combined_Affiliations', index=False)
-
-            # Sheet 11: Combined Countries (REPLACES All_Countries_Analyzed and All_Countries_Citing)
-            combined_countries_data = create_combined_countries_sheet(
-                analyzed_stats['all_countries'],
-                citing_stats['all_countries'],
-                sum(count for _, count in analyzed_stats['all_countries']),
-                sum(count for _, count in citing_stats['all_countries'])
+            # Строки отдаются генератором прямо в write_rows_to_sheet - без промежуточного списка и DataFrame
+            def iter_reviewer_rows():
+                for reviewer in reviewers:
+                    citing_dois = reviewer['citing_dois']
+                    if not citing_dois:
+                        continue
+                    # Create separate rows for each DOI; author name and count only in the first row.
+                    # None вместо '' - в строках-продолжениях ячейки автора и счетчика не создаются вовсе
+                    yield (safe_convert(reviewer['author']), safe_convert(reviewer['citation_count']), safe_convert(citing_dois[0]))
+                    for doi in itertools.islice(citing_dois, 1, None):
+                        yield (None, None, safe_convert(doi))
+            
+            excel_sheets['Potential_Reviewers'] = (POTENTIAL_REVIEWERS_COLUMNS, iter_reviewer_rows())
+
+        # Sheet 19: Special Analysis Metrics (NEW) - ИСПРАВЛЕНО: правильное имя листа
+        if special_metrics is not None:
+            debug_info = special_debug_info
+            # Значения метрик разбираются в локальные переменные один раз
+            sm_get = special_metrics.get
+            debug_get = debug_info.get
+            
+            special_metric_names = (
+                'CiteScore (A/B)',
+                'CiteScore Corrected (C/B)', 
+                'Impact Factor (E/D)',
+                'Impact Factor Corrected (F/D)',
+                'B (Articles for CiteScore)',
+                'A (Citations for CiteScore)',
+                'C (Scopus Citations for CiteScore)',
+                'D (Articles for Impact Factor)',
+                'E (Citations for Impact Factor)',
+                'F (WoS Citations for Impact Factor)'
             )
-            if combined_countries_data:
-                combined_countries_df = pd.DataFrame(combined_countries_data)
-                combined_countries_df.to_excel(writer, sheet_name='Combined_Countries', index=False)
-
-            # Sheet 12: All journals citing (with percentages) - UPDATED VERSION WITH CS DATA
-            if citing_stats['all_journals']:
-                all_citing_journals_data = []
-                total_citing_articles = safe_convert(citing_stats['n_items'])
-                
-                # Load metrics data if not already loaded
-                if get_analysis_state().if_data is None or get_analysis_state().cs_data is None:
-                    load_metrics_data()
-                
-                for journal_info in citing_stats['all_journals']:
-                    journal_name = journal_info[0]
-                    count = journal_info[1]
-                    percentage = (safe_convert(count) / total_citing_articles * 100) if total_citing_articles > 0 else 0
-                    
-                    # Extract ISSNs for this journal from citing data
-                    journal_issns = []
-                    for citing_item in citing_data:
-                        if citing_item and citing_item.get('crossref'):
-                            cr = citing_item['crossref']
-                            container_title = cr.get('container-title', [''])[0] if cr.get('container-title') else ''
-                            if container_title == journal_name:
-                                issns = cr.get('ISSN', [])
-                                if issns is None:
-                                    issns = []
-                                if isinstance(issns, str):
-                                    issns = [issns]
-                                issns = [str(issn).strip() for issn in issns if issn and isinstance(issn, str)]
-                                journal_issns.extend(issns)
-                    
-                    # Remove duplicates
-                    journal_issns = list(set(journal_issns))
-                    
-                    # Get ISSNs for display
-                    issn_1 = journal_issns[0] if len(journal_issns) > 0 else ""
-                    issn_2 = journal_issns[1] if len(journal_issns) > 1 else ""
-                    
-                    # Get metrics for this journal - UPDATED WITH CS DATA
-                    metrics = get_journal_metrics(journal_issns)
-                    
-                    all_citing_journals_data.append({
-                        'Journal': safe_convert(journal_name),
-                        'ISSN_1': safe_convert(issn_1),
-                        'ISSN_2': safe_convert(issn_2),
-                        'Articles_Count': safe_convert(count),
-                        'Percentage': round(percentage, 2),
-                        '': '',  # Empty column
-                        'IF (WoS)': safe_convert(metrics['if_metrics'].get('if', '')) if metrics['if_metrics'] else '',
-                        'Q(WoS)': safe_convert(metrics['if_metrics'].get('quartile', '')) if metrics['if_metrics'] else '',
-                        'SC(Scopus)': safe_convert(metrics['cs_metrics'].get('citescore', '')) if metrics['cs_metrics'] else '',
-                        'Q(Scopus)': safe_convert(metrics['cs_metrics'].get('quartile', '')) if metrics['cs_metrics'] else ''
-                    })
-                
-                all_citing_journals_df = pd.DataFrame(all_citing_journals_data)
-                all_citing_journals_df.to_excel(writer, sheet_name='All_Journals_Citing', index=False)
-
-            # Sheet 13: All publishers citing (with percentages)
-            if citing_stats['all_publishers']:
-                all_citing_publishers_data = []
-                total_articles = safe_convert(citing_stats['n_items'])
-                for publisher, count in citing_stats['all_publishers']:
-                    percentage = (safe_convert(count) / total_articles * 100) if total_articles > 0 else 0
-                    all_citing_publishers_data.append({
-                        'Publisher': safe_convert(publisher),
-                        'Articles_Count': safe_convert(count),
-                        'Percentage': round(percentage, 2)
-                    })
-                all_citing_publishers_df = pd.DataFrame(all_citing_publishers_data)
-                all_citing_publishers_df.to_excel(writer, sheet_name='All_Publishers_Citing', index=False)
-
-            # Sheet 14: Fast metrics (NEW)
-            fast_metrics_data = {
-                'Metric': [
-                    'Reference Age (median)', 'Reference Age (mean)',
-                    'Reference Age (25-75 percentile)', 'References Analyzed',
-                    'Journal Self-Citation Rate (JSCR)', 'Journal Self-Citations',
-                    'Total Citations for JSCR',
-                    'Cited Half-Life (median)', 'Cited Half-Life (mean)',
-                    'Articles with CHL Data',
-                    'Field-Weighted Citation Impact (FWCI)', 'Total Citations',
-                    'Expected Citations',
-                    'Citation Velocity', 'Articles with Velocity Data',
-                    'OA Impact Premium', 'OA Articles', 'Non-OA Articles',
-                    'Average OA Citations', 'Average Non-OA Citations',
-                    'Elite Index', 'Elite Articles', 'Citation Threshold',
-                    'Author Gini Index', 'Total Authors',
-                    'Average Articles per Author', 'Median Articles per Author',
-                    'Diversity Balance Index (DBI)', 'Unique Concepts',
-                    'Total Concept Mentions'
-                ],
-                'Value': [
-                    safe_convert(fast_metrics.get('ref_median_age', 'N/A')),
-                    safe_convert(fast_metrics.get('ref_mean_age', 'N/A')),
-                    f"{safe_convert(fast_metrics.get('ref_ages_25_75', ['N/A', 'N/A'])[0])}-{safe_convert(fast_metrics.get('ref_ages_25_75', ['N/A', 'N/A'])[1])}",
-                    safe_convert(fast_metrics.get('total_refs_analyzed', 0)),
-                    f"{safe_convert(fast_metrics.get('JSCR', 0))}%",
-                    safe_convert(fast_metrics.get('self_cites', 0)),
-                    safe_convert(fast_metrics.get('total_cites', 0)),
-                    safe_convert(fast_metrics.get('cited_half_life_median', 'N/A')),
-                    safe_convert(fast_metrics.get('cited_half_life_mean', 'N/A')),
-                    safe_convert(fast_metrics.get('articles_with_chl', 0)),
-                    safe_convert(fast_metrics.get('FWCI', 0)),
-                    safe_convert(fast_metrics.get('total_cites', 0)),
-                    safe_convert(fast_metrics.get('expected_cites', 0)),
-                    safe_convert(fast_metrics.get('citation_velocity', 0)),
-                    safe_convert(fast_metrics.get('articles_with_velocity', 0)),
-                    f"{safe_convert(fast_metrics.get('OA_impact_premium', 0))}%",
-                    safe_convert(fast_metrics.get('OA_articles', 0)),
-                    safe_convert(fast_metrics.get('non_OA_articles', 0)),
-                    safe_convert(fast_metrics.get('OA_avg_citations', 0)),
-                    safe_convert(fast_metrics.get('non_OA_avg_citations', 0)),
-                    f"{safe_convert(fast_metrics.get('elite_index', 0))}%",
-                    safe_convert(fast_metrics.get('elite_articles', 0)),
-                    safe_convert(fast_metrics.get('citation_threshold', 0)),
-                    safe_convert(fast_metrics.get('author_gini', 0)),
-                    safe_convert(fast_metrics.get('total_authors', 0)),
-                    safe_convert(fast_metrics.get('articles_per_author_avg', 0)),
-                    safe_convert(fast_metrics.get('articles_per_author_median', 0)),
-                    safe_convert(fast_metrics.get('DBI', 0)),
-                    safe_convert(fast_metrics.get('unique_concepts', 0)),
-                    safe_convert(fast_metrics.get('total_concept_mentions', 0))
-                ]
-            }
-            fast_metrics_df = pd.DataFrame(fast_metrics_data)
-            fast_metrics_df.to_excel(writer, sheet_name='Fast_Metrics', index=False)
-
-            # Sheet 15: Top concepts (NEW) - РАСШИРЕНО ДО 10 ТЕРМИНОВ
-            if fast_metrics.get('top_concepts'):
-                top_concepts_data = {
-                    'Concept': [safe_convert(concept[0]) for concept in fast_metrics['top_concepts']],
-                    'Mentions_Count': [safe_convert(concept[1]) for concept in fast_metrics['top_concepts']]
-                }
-                top_concepts_df = pd.DataFrame(top_concepts_data)
-                top_concepts_df.to_excel(writer, sheet_name='Top_Concepts', index=False)
-
-            # === НОВЫЙ ЛИСТ: Объединенный анализ ключевых слов в названиях ===
-            # Sheet 16: Combined Title Keywords (NEW) - ИСПРАВЛЕНО: правильное имя листа
-            if 'title_keywords' in additional_data:
-                keywords_data = additional_data['title_keywords']
-                normalized_keywords = normalize_keywords_data(keywords_data)
-                
-                if normalized_keywords:
-                    keywords_df = pd.DataFrame(normalized_keywords)
-                    keywords_df.to_excel(writer, sheet_name='Combined_Title_Keywords', index=False)
-
-            # Sheet 17: Citation seasonality - ИСПРАВЛЕНО: правильное имя листа
-            if 'citation_seasonality' in additional_data:
-                seasonality_data = []
-                citation_seasonality = additional_data['citation_seasonality']
-                
-                # Citation by month chart
-                for month in range(1, 13):
-                    month_name = datetime(2023, month, 1).strftime('%B')
-                    citation_count = safe_convert(citation_seasonality['citation_months'].get(month, 0))
-                    publication_count = safe_convert(citation_seasonality['publication_months'].get(month, 0))
-                    
-                    seasonality_data.append({
-                        'Month_Number': safe_convert(month),
-                        'Month_Name': safe_convert(month_name),
-                        'Citation_Count': citation_count,
-                        'Publication_Count': publication_count
-                    })
-                
-                if seasonality_data:
-                    seasonality_df = pd.DataFrame(seasonality_data)
-                    seasonality_df.to_excel(writer, sheet_name='Citation_Seasonality', index=False)
+            special_metric_values = [
+                safe_convert(sm_get(key, 0))
+                for key in ('cite_score', 'cite_score_corrected', 'impact_factor', 'impact_factor_corrected')
+            ] + [safe_convert(debug_get(key, 0)) for key in 'BACDEF']
+            excel_sheets['Special_Analysis_Metrics'] = (('Metric', 'Value'), value_rows(special_metric_names, special_metric_values))
+
+        # === NEW SHEET: Author ID Data ===
+        # Sheet 20: Author_ID_data (NEW)
+        if state.include_author_id_data:
+            author_id_data = create_author_id_sheet(analyzed_data, citing_data, state)
+            if author_id_data:
+                author_id_df = pd.DataFrame(author_id_data)
+                excel_sheets['Author_ID_data'] = author_id_df
+
+        # Все листы пишутся построчно через write_rows_to_sheet: DataFrame.to_excel заполняет ячейки
+        # по столбцам, что несовместимо с constant_memory. Пустые листы write_rows_to_sheet пропускает.
+        with pd.ExcelWriter(excel_buffer, engine=EXCEL_ENGINE, engine_kwargs=EXCEL_ENGINE_KWARGS) as writer:
+            for sheet_name, sheet in excel_sheets.items():
+                if isinstance(sheet, Future):
+                    sheet = sheet.result()  # лист из фонового потока
+                if sheet is None:
+                    continue
+                if isinstance(sheet, pd.DataFrame):
+                    write_rows_to_sheet(writer, sheet_name, tuple(sheet.columns), dataframe_rows(sheet))
+                else:
+                    write_rows_to_sheet(writer, sheet_name, *sheet)
             
-                # Optimal publication months - ИСПРАВЛЕНО: создаем отдельный лист
-                if citation_seasonality['optimal_publication_months']:
-                    optimal_months_data = []
-                    for optimal in citation_seasonality['optimal_publication_months']:
-                        optimal_months_data.append({
-                            'High_Citation_Month': datetime(2023, safe_convert(optimal['citation_month']), 1).strftime('%B'),
-                            'Citation_Count': safe_convert(optimal['citation_count']),
-                            'Recommended_Publication_Month': datetime(2023, safe_convert(optimal['recommended_publication_month']), 1).strftime('%B'),
-                            'Reasoning': safe_convert(optimal['reasoning'])
-                        })
-                    
-                    optimal_months_df = pd.DataFrame(optimal_months_data)
-                    optimal_months_df.to_excel(writer, sheet_name='Optimal_Publication_Months', index=False)
-              
-            # Sheet 18: Potential reviewers - ИСПРАВЛЕНО: правильное имя листа
-            if 'potential_reviewers' in additional_data:
-                reviewers_data = []
-                potential_reviewers_info = additional_data['potential_reviewers']
-                
-                for reviewer in potential_reviewers_info['potential_reviewers']:
-                    # Create separate rows for each DOI
-                    for i, doi in enumerate(reviewer['citing_dois']):
-                        reviewers_data.append({
-                            'Author': safe_convert(reviewer['author']) if i == 0 else '',  # Only show author name in first row
-                            'Citation_Count': safe_convert(reviewer['citation_count']) if i == 0 else '',
-                            'Citing_DOI': safe_convert(doi)
-                        })
-                
-                if reviewers_data:
-                    reviewers_df = pd.DataFrame(reviewers_data)
-                    reviewers_df.to_excel(writer, sheet_name='Potential_Reviewers', index=False)
-
-            # Sheet 19: Special Analysis Metrics (NEW) - ИСПРАВЛЕНО: правильное имя листа
-            if 'special_analysis_metrics' in additional_data:
-                special_metrics = additional_data['special_analysis_metrics']
-                debug_info = special_metrics.get('debug_info', {})
-                
-                special_metrics_data = {
-                    'Metric': [
-                        'CiteScore (A/B)',
-                        'CiteScore Corrected (C/B)', 
-                        'Impact Factor (E/D)',
-                        'Impact Factor Corrected (F/D)',
-                        'B (Articles for CiteScore)',
-                        'A (Citations for CiteScore)',
-                        'C (Scopus Citations for CiteScore)',
-                        'D (Articles for Impact Factor)',
-                        'E (Citations for Impact Factor)',
-                        'F (WoS Citations for Impact Factor)'
-                    ],
-                    'Value': [
-                        safe_convert(special_metrics.get('cite_score', 0)),
-                        safe_convert(special_metrics.get('cite_score_corrected', 0)),
-                        safe_convert(special_metrics.get('impact_factor', 0)),
-                        safe_convert(special_metrics.get('impact_factor_corrected', 0)),
-                        safe_convert(debug_info.get('B', 0)),
-                        safe_convert(debug_info.get('A', 0)),
-                        safe_convert(debug_info.get('C', 0)),
-                        safe_convert(debug_info.get('D', 0)),
-                        safe_convert(debug_info.get('E', 0)),
-                        safe_convert(debug_info.get('F', 0))
-                    ]
-                }
-                special_metrics_df = pd.DataFrame(special_metrics_data)
-                special_metrics_df.to_excel(writer, sheet_name='Special_Analysis_Metrics', index=False)
-
-            # === NEW SHEET: Author ID Data ===
-            # Sheet 20: Author_ID_data (NEW)
-            if state.include_author_id_data:
-                author_id_data = create_author_id_sheet(analyzed_data, citing_data, state)
-                if author_id_data:
-                    author_id_df = pd.DataFrame(author_id_data)
-                    author_id_df.to_excel(writer, sheet_name='Author_ID_data', index=False)
-
             # Ensure at least one sheet exists
             if len(writer.sheets) == 0:
-                summary_df = pd.DataFrame({
-                    'Status': ['Analysis completed'],
-                    'Message': ['No data matched the criteria. Check ISSN and period.']
-                })
-                summary_df.to_excel(writer, sheet_name='Summary', index=False)
+                write_rows_to_sheet(writer, 'Summary', ('Status', 'Message'), [
+                    ('Analysis completed', 'No data matched the criteria. Check ISSN and period.')
+                ])
 
         excel_buffer.seek(0)
-        return True
+        return excel_buffer
 
     except Exception as e:
         st.error(translation_manager.get_text('excel_creation_error').format(error=str(e)))
         # Create minimal report with error
         try:
-            excel_buffer.seek(0)
-            excel_buffer.truncate(0)
+            # Частично записанный буфер не очищаем (truncate копирует данные) - берём новый
+            excel_buffer = io.BytesIO()
             
-            with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-                error_df = pd.DataFrame({
-                    'Error': [f'{translation_manager.get_text("failed_create_full_report")}: {str(e)}'],
-                    'Recommendation': [translation_manager.get_text('try_reduce_data_or_period')]
-                })
-                error_df.to_excel(writer, sheet_name='Information', index=False)
+            with pd.ExcelWriter(excel_buffer, engine=EXCEL_ENGINE, engine_kwargs=EXCEL_ENGINE_KWARGS) as writer:
+                write_rows_to_sheet(writer, 'Information', ('Error', 'Recommendation'), [(
+                    f'{translation_manager.get_text("failed_create_full_report")}: {str(e)}',
+                    translation_manager.get_text('try_reduce_data_or_period')
+                )])
             
             excel_buffer.seek(0)
             st.warning(translation_manager.get_text('simplified_report_created'))
-            return True
+            return excel_buffer
             
         except Exception as e2:
             st.error(translation_manager.get_text('critical_excel_error').format(error=str(e2)))
-            return False
+            return None
+    
+    finally:
+        sheet_executor.shutdown(cancel_futures=True)
 
 def precompute_excel_data(analyzed_data, citing_data, analyzed_stats, citing_stats, enhanced_stats, citation_timing, overlap_details, fast_metrics, additional_data, state):
     """Предварительный расчет всех данных для Excel отчетов"""
@@ -5583,9 +5857,9 @@ def precompute_excel_data(analyzed_data, citing_data, analyzed_stats, citing_sta
     citing_precomputed = process_data_in_chunks(citing_data, 500, process_citing_chunk)
     
     # Предварительно вычисляем usage данные для Special Analysis
-    special_metrics = additional_data.get('special_analysis_metrics', {})
-    analyzed_articles_usage = special_metrics.get('debug_info', {}).get('analyzed_articles_usage', {})
-    citing_articles_usage = special_metrics.get('debug_info', {}).get('citing_articles_usage', {})
+    debug_info = additional_data.get('special_analysis_metrics', EMPTY_MAPPING).get('debug_info', EMPTY_MAPPING)
+    analyzed_articles_usage = debug_info.get('analyzed_articles_usage', {})
+    citing_articles_usage = debug_info.get('citing_articles_usage', {})
     
     return {
         'analyzed_precomputed': analyzed_precomputed,
@@ -5595,19 +5869,107 @@ def precompute_excel_data(analyzed_data, citing_data, analyzed_stats, citing_sta
     }
 
 # === 18. Data Visualization ===
-def create_visualizations(analyzed_stats, citing_stats, enhanced_stats, citation_timing, overlap_details, fast_metrics, additional_data, is_special_analysis=False):
-    """Create visualizations for dashboard"""
-    
-    # Create tabs for different visualization types
-    tab1, tab2, tab3, tab4 = st.tabs([
-        translation_manager.get_text('tab_main_metrics'), 
-        translation_manager.get_text('tab_authors_organizations'), 
-        translation_manager.get_text('tab_geography'), 
-        translation_manager.get_text('tab_citations')
-    ])
+
+# Спецификации графиков кэшируются в JSON: при rerun с теми же данными фигура не строится заново
+# (ключ - только данные и подписи осей, заголовок добавляет figure_from_json).
+# Фигуры строятся напрямую через graph_objects - без промежуточного DataFrame plotly.express
+QUALITATIVE_COLORS = ('#636EFA', '#EF553B', '#00CC96', '#AB63FA', '#FFA15A',
+                      '#19D3F3', '#FF6692', '#B6E880', '#FF97FF', '#FECB52')
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def cached_bar_figure_json(x_values, y_values, x_label, y_label, orientation='v', color_label=None):
+    """JSON столбчатой диаграммы по двум колонкам значений"""
+    x_values, y_values = list(x_values), list(y_values)
+    marker = None
+    if color_label is not None:
+        color_values = x_values if color_label == x_label else y_values
+        if all(isinstance(value, (int, float, np.number)) for value in color_values):
+            # Числовой цвет - непрерывная шкала, как у px
+            marker = dict(color=color_values, colorscale='Plasma', showscale=True, colorbar=dict(title=color_label))
+        else:
+            marker = dict(color=[QUALITATIVE_COLORS[i % len(QUALITATIVE_COLORS)] for i in range(len(color_values))])
+    fig = go.Figure(go.Bar(x=x_values, y=y_values, orientation=orientation, marker=marker))
+    fig.update_layout(xaxis_title=x_label, yaxis_title=y_label)
+    return fig.to_json()
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def cached_pie_figure_json(values, names, value_label, name_label):
+    """JSON круговой диаграммы по значениям и подписям"""
+    fig = go.Figure(go.Pie(
+        values=list(values),
+        labels=list(names),
+        hovertemplate=f'{name_label}=%{{label}}<br>{value_label}=%{{value}}<extra></extra>'
+    ))
+    return fig.to_json()
+
+def figure_from_json(figure_json, title=None):
+    """Фигура из кэшированного JSON; заголовок задается после кэша и не входит в его ключ"""
+    fig = go.Figure(json.loads(figure_json))
+    if title is not None:
+        fig.update_layout(title=title)
+    return fig
+
+# Идентификатор результатов анализа: готовые фигуры дашборда кэшируются в сессии по нему,
+# без хеширования входных данных и повторной сборки go.Figure на каждом rerun.
+# uuid4, а не счетчик модуля: модуль выполняется заново при каждом rerun
+def new_results_id():
+    return uuid.uuid4().hex
+
+def dashboard_figure(results_id, name, build):
+    """Фигура дашборда из кэша сессии по (id результатов, язык, имя); build() вызывается только при промахе"""
+    if results_id is None:
+        return build()
+    figure_cache = get_analysis_state().figure_cache
+    key = (results_id, translation_manager.current_language, name)
+    fig = figure_cache.get(key)
+    if fig is None:
+        fig = figure_cache[key] = build()
+    return fig
+
+# Карточки метрик Special Analysis: (подпись, ключ в special_analysis_metrics, подсказка)
+SPECIAL_METRIC_CARDS = (
+    ("CiteScore", 'cite_score', "A/B: Total citations (A) / Total articles (B) in Special Analysis period"),
+    ("CiteScore Corrected", 'cite_score_corrected', "C/B: Scopus-indexed citations (C) / Total articles (B)"),
+    ("Impact Factor", 'impact_factor', "E/D: Total citations (E) / Total articles (D) in IF calculation period"),
+    ("Impact Factor Corrected", 'impact_factor_corrected', "F/D: WoS-indexed citations (F) / Total articles (D)"),
+)
+
+@ui_fragment
+def create_visualizations(analyzed_stats, citing_stats, enhanced_stats, citation_timing, overlap_details, fast_metrics, additional_data, is_special_analysis=False, results_id=None):
+    """Create visualizations for dashboard (fragment: switching sections reruns only the dashboard)"""
+    
+    # Переводы и подсказки связываются локально один раз за рендер: одни и те же ключи
+    # запрашиваются десятки раз, а функция выполняется на каждом rerun Streamlit
+    _t = translation_manager.tr
+    _tip = cached_tooltip
+    tab_titles = [_t('tab_main_metrics'), _t('tab_authors_organizations'), _t('tab_geography'), _t('tab_citations')]
+    label_author = _t('author')
+    label_authors = _t('authors')
+    label_articles = _t('articles')
+    label_category = _t('category')
+    label_current_value = _t('current_value')
+    label_interpretation = _t('interpretation')
+    label_affiliation = _t('affiliation')
+    label_mentions = _t('mentions')
+    label_country = _t('country')
+    label_type = _t('type')
+    label_threshold = _t('threshold')
+    label_status = _t('status')
+    label_count = _t('count')
+    
+    # Разделы переключаются radio вместо st.tabs: st.tabs выполняет код всех вкладок на каждом rerun,
+    # здесь графики строятся только для выбранного раздела
+    selected_view = st.radio(
+        "View:",
+        options=range(len(tab_titles)),
+        format_func=tab_titles.__getitem__,
+        horizontal=True,
+        label_visibility="collapsed",
+        key="dashboard_view"
+    )
     
-    with tab1:
-        st.subheader(translation_manager.get_text('tab_main_metrics'))
+    if selected_view == 0:
+        st.subheader(tab_titles[0])
         
         # Check if we're in Special Analysis mode and show additional metrics
         if is_special_analysis and 'special_analysis_metrics' in additional_data:
@@ -5615,137 +5977,131 @@ def create_visualizations(analyzed_stats, citing_stats, enhanced_stats, citation
             
             special_metrics = additional_data['special_analysis_metrics']
             debug_info = special_metrics.get('debug_info', {})
+            # Значения для расшифровки расчета разбираются один раз
+            cite_score = special_metrics.get('cite_score', 0)
+            impact_factor = special_metrics.get('impact_factor', 0)
+            count_a, count_b, count_c, count_d, count_e, count_f = (debug_info.get(key, 0) for key in 'ABCDEF')
             
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric(
-                    "CiteScore", 
-                    f"{special_metrics.get('cite_score', 0):.2f}",
-                    help="A/B: Total citations (A) / Total articles (B) in Special Analysis period"
-                )
-            with col2:
-                st.metric(
-                    "CiteScore Corrected", 
-                    f"{special_metrics.get('cite_score_corrected', 0):.2f}",
-                    help="C/B: Scopus-indexed citations (C) / Total articles (B)"
-                )
-            with col3:
-                st.metric(
-                    "Impact Factor", 
-                    f"{special_metrics.get('impact_factor', 0):.2f}",
-                    help="E/D: Total citations (E) / Total articles (D) in IF calculation period"
-                )
-            with col4:
-                st.metric(
-                    "Impact Factor Corrected", 
-                    f"{special_metrics.get('impact_factor_corrected', 0):.2f}",
-                    help="F/D: WoS-indexed citations (F) / Total articles (D)"
-                )
+            metric_cols = st.columns(4)
+            for col, (label, key, help_text) in zip(metric_cols, SPECIAL_METRIC_CARDS):
+                col.metric(label, f"{special_metrics.get(key, 0):.2f}", help=help_text)
     
-            # Show debug information in expander
+            # Show debug information in expander (один раз, под последней карточкой)
+            with metric_cols[-1]:
                 with st.expander("📊 Special Analysis Details", expanded=False):
                     col1, col2 = st.columns(2)
+                    # Каждая колонка - один markdown-блок вместо отдельного элемента на строку
                     with col1:
-                        st.write("**CiteScore Calculation:**")
-                        st.write(f"- B (Articles): {debug_info.get('B', 0)}")
-                        st.write(f"- A (Citations): {debug_info.get('A', 0)}")
-                        st.write(f"- C (Scopus Citations): {debug_info.get('C', 0)}")
-                        st.write(f"- CiteScore: {debug_info.get('A', 0)} / {debug_info.get('B', 0)} = {special_metrics.get('cite_score', 0):.2f}")
+                        st.markdown(
+                            "**CiteScore Calculation:**\n\n"
+                            f"- B (Articles): {count_b}\n"
+                            f"- A (Citations): {count_a}\n"
+                            f"- C (Scopus Citations): {count_c}\n"
+                            f"- CiteScore: {count_a} / {count_b} = {cite_score:.2f}"
+                        )
                     
                     with col2:
-                        st.write("**Impact Factor Calculation:**")
-                        st.write(f"- D (Articles): {debug_info.get('D', 0)}")
-                        st.write(f"- E (Citations): {debug_info.get('E', 0)}")
-                        st.write(f"- F (WoS Citations): {debug_info.get('F', 0)}")
-                        st.write(f"- Impact Factor: {debug_info.get('E', 0)} / {debug_info.get('D', 0)} = {special_metrics.get('impact_factor', 0):.2f}")
+                        st.markdown(
+                            "**Impact Factor Calculation:**\n\n"
+                            f"- D (Articles): {count_d}\n"
+                            f"- E (Citations): {count_e}\n"
+                            f"- F (WoS Citations): {count_f}\n"
+                            f"- Impact Factor: {count_e} / {count_d} = {impact_factor:.2f}"
+                        )
         
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
             st.metric(
-                translation_manager.get_text('h_index'), 
+                _t('h_index'), 
                 enhanced_stats['h_index'],
-                help=glossary.get_tooltip('H-index')
+                help=_tip('H-index')
             )
         with col2:
             st.metric(
-                translation_manager.get_text('total_articles'), 
+                _t('total_articles'), 
                 analyzed_stats['n_items'],
-                help=glossary.get_tooltip('Crossref')
+                help=_tip('Crossref')
             )
         with col3:
             st.metric(
-                translation_manager.get_text('total_citations'), 
+                _t('total_citations'), 
                 enhanced_stats['total_citations'],
-                help=translation_manager.get_text('total_citations_tooltip')
+                help=_t('total_citations_tooltip')
             )
         with col4:
             st.metric(
-                translation_manager.get_text('average_citations'), 
+                _t('average_citations'), 
                 f"{enhanced_stats['avg_citations_per_article']:.1f}",
-                help=translation_manager.get_text('average_citations_tooltip')
+                help=_t('average_citations_tooltip')
             )
         
-        col5, col6, col7, col8 = st.columns(4)
+        # Вторая строка метрик складывается в те же колонки (без второго st.columns)
+        col5, col6, col7, col8 = col1, col2, col3, col4
         
         with col5:
             st.metric(
-                translation_manager.get_text('articles_with_citations'), 
+                _t('articles_with_citations'), 
                 enhanced_stats['articles_with_citations'],
-                help=translation_manager.get_text('articles_with_citations_tooltip')
+                help=_t('articles_with_citations_tooltip')
             )
         with col6:
             st.metric(
-                translation_manager.get_text('self_citations'), 
+                _t('self_citations'), 
                 f"{analyzed_stats['self_cites_pct']:.1f}%",
-                help=glossary.get_tooltip('Self-Cites')
+                help=_tip('Self-Cites')
             )
         with col7:
             st.metric(
-                translation_manager.get_text('international_articles'), 
+                _t('international_articles'), 
                 f"{analyzed_stats['multi_country_pct']:.1f}%",
-                help=glossary.get_tooltip('International Collaboration')
+                help=_tip('International Collaboration')
             )
         with col8:
             st.metric(
-                translation_manager.get_text('unique_affiliations'), 
+                _t('unique_affiliations'), 
                 analyzed_stats['unique_affiliations_count'],
-                help=translation_manager.get_text('unique_affiliations_tooltip')
+                help=_t('unique_affiliations_tooltip')
             )
         
         # Contextual tooltip for H-index
-        with st.expander("❓ " + translation_manager.get_text('what_is_h_index'), expanded=False):
-            h_info = glossary.get_detailed_info('H-index')
+        with st.expander("❓ " + _t('what_is_h_index'), expanded=False):
+            h_info = cached_detailed_info('H-index')
             if h_info:
-                st.write(f"**{h_info['term']}** - {h_info['definition']}")
-                st.write(f"**Calculation:** {h_info['calculation']}")
-                st.write(f"**Interpretation:** {h_info['interpretation']}")
-                st.write(f"**Example:** {h_info['example']}")
-                st.write(f"**Category:** {h_info['category']}")
+                st.markdown(
+                    f"**{h_info['term']}** - {h_info['definition']}\n\n"
+                    f"**Calculation:** {h_info['calculation']}\n\n"
+                    f"**Interpretation:** {h_info['interpretation']}\n\n"
+                    f"**Example:** {h_info['example']}\n\n"
+                    f"**Category:** {h_info['category']}"
+                )
         
         # Citations by year chart
         if citation_timing['yearly_citations']:
             years = [item['year'] for item in citation_timing['yearly_citations']]
             citations = [item['citations_count'] for item in citation_timing['yearly_citations']]
             
-            fig = go.Figure()
-            fig.add_trace(go.Bar(
-                x=years, 
-                y=citations, 
-                name=translation_manager.get_text('citations'),
-                marker_color='lightblue'
-            ))
-            fig.update_layout(
-                title=translation_manager.get_text('citations_by_year'),
-                xaxis_title=translation_manager.get_text('year'),
-                yaxis_title=translation_manager.get_text('citations_count'),
-                showlegend=False
-            )
+            def build_yearly_figure():
+                fig = go.Figure()
+                fig.add_trace(go.Bar(
+                    x=years, 
+                    y=citations, 
+                    name=_t('citations'),
+                    marker_color='lightblue'
+                ))
+                fig.update_layout(
+                    title=_t('citations_by_year'),
+                    xaxis_title=_t('year'),
+                    yaxis_title=_t('citations_count'),
+                    showlegend=False
+                )
+                return fig
+            
+            fig = dashboard_figure(results_id, 'yearly_citations', build_yearly_figure)
             st.plotly_chart(fig, use_container_width=True)
     
-    with tab2:
-        st.subheader(translation_manager.get_text('tab_authors_organizations'))
+    elif selected_view == 1:
+        st.subheader(tab_titles[1])
         
         col1, col2 = st.columns(2)
         
@@ -5753,323 +6109,234 @@ def create_visualizations(analyzed_stats, citing_stats, enhanced_stats, citation
             # Top authors of analyzed articles
             if analyzed_stats['all_authors']:
                 top_authors = analyzed_stats['all_authors'][:15]
-                authors_df = pd.DataFrame(top_authors, columns=[translation_manager.get_text('author'), translation_manager.get_text('articles')])
-                fig = px.bar(
-                    authors_df, 
-                    x=translation_manager.get_text('articles'), 
-                    y=translation_manager.get_text('author'), 
-                    orientation='h',
-                    title=translation_manager.get_text('top_15_authors_analyzed')
-                )
+                authors, article_counts = zip(*top_authors)
+                fig = dashboard_figure(results_id, 'top_authors', lambda: figure_from_json(cached_bar_figure_json(
+                    article_counts, authors, label_articles, label_author,
+                    orientation='h'
+                ), _t('top_15_authors_analyzed')))
                 st.plotly_chart(fig, use_container_width=True)
         
         with col2:
             # Author count distribution
-            author_counts_data = {
-                translation_manager.get_text('category'): ['1 ' + translation_manager.get_text('author'), '2-5 ' + translation_manager.get_text('authors'), '6-10 ' + translation_manager.get_text('authors'), '>10 ' + translation_manager.get_text('authors')],
-                translation_manager.get_text('articles'): [
-                    analyzed_stats['single_authors'],
-                    analyzed_stats['n_items'] - analyzed_stats['single_authors'] - analyzed_stats['multi_authors_gt10'],
-                    analyzed_stats['multi_authors_gt10'],
-                    0  # Can add additional categorization
-                ]
-            }
-            fig = px.pie(
-                author_counts_data, 
-                values=translation_manager.get_text('articles'), 
-                names=translation_manager.get_text('category'),
-                title=translation_manager.get_text('author_count_distribution')
+            author_categories = ('1 ' + label_author, '2-5 ' + label_authors, '6-10 ' + label_authors, '>10 ' + label_authors)
+            author_category_counts = (
+                analyzed_stats['single_authors'],
+                analyzed_stats['n_items'] - analyzed_stats['single_authors'] - analyzed_stats['multi_authors_gt10'],
+                analyzed_stats['multi_authors_gt10'],
+                0  # Can add additional categorization
             )
+            fig = dashboard_figure(results_id, 'author_distribution', lambda: figure_from_json(cached_pie_figure_json(
+                author_category_counts, author_categories, label_articles, label_category
+            ), _t('author_count_distribution')))
             st.plotly_chart(fig, use_container_width=True)
         
         # Contextual tooltip for Author Gini
-        if fast_metrics.get('author_gini', 0) > 0:
-            with st.expander("🎯 " + translation_manager.get_text('author_gini_meaning'), expanded=False):
-                gini_info = glossary.get_detailed_info('Author Gini')
+        author_gini = fast_metrics.get('author_gini', 0)
+        if author_gini > 0:
+            with st.expander("🎯 " + _t('author_gini_meaning'), expanded=False):
+                gini_info = cached_detailed_info('Author Gini')
                 if gini_info:
-                    st.write(f"**{translation_manager.get_text('current_value')}:** {fast_metrics['author_gini']}")
-                    st.write(f"**{translation_manager.get_text('interpretation')}:** {gini_info['interpretation']}")
-                    st.progress(min(fast_metrics['author_gini'], 1.0))
+                    st.markdown(f"**{label_current_value}:** {author_gini}\n\n**{label_interpretation}:** {gini_info['interpretation']}")
+                    st.progress(min(author_gini, 1.0))
         
         # Top affiliations
         if analyzed_stats['all_affiliations']:
             top_affiliations = analyzed_stats['all_affiliations'][:10]
-            aff_df = pd.DataFrame(top_affiliations, columns=[translation_manager.get_text('affiliation'), translation_manager.get_text('mentions')])
-            fig = px.bar(
-                aff_df, 
-                x=translation_manager.get_text('mentions'), 
-                y=translation_manager.get_text('affiliation'), 
-                orientation='h',
-                title=translation_manager.get_text('top_10_affiliations_analyzed'),
-                color=translation_manager.get_text('mentions')
-            )
+            affiliations, mention_counts = zip(*top_affiliations)
+            fig = dashboard_figure(results_id, 'top_affiliations', lambda: figure_from_json(cached_bar_figure_json(
+                mention_counts, affiliations, label_mentions, label_affiliation,
+                orientation='h', color_label=label_mentions
+            ), _t('top_10_affiliations_analyzed')))
             st.plotly_chart(fig, use_container_width=True)
     
-    with tab3:
-        st.subheader(translation_manager.get_text('tab_geography'))
+    elif selected_view == 2:
+        st.subheader(tab_titles[2])
         
         col1, col2 = st.columns(2)
         
         with col1:
             # Country distribution
             if analyzed_stats['all_countries']:
-                countries_df = pd.DataFrame(analyzed_stats['all_countries'], columns=[translation_manager.get_text('country'), translation_manager.get_text('articles')])
-                fig = px.pie(
-                    countries_df, 
-                    values=translation_manager.get_text('articles'), 
-                    names=translation_manager.get_text('country'),
-                    title=translation_manager.get_text('article_country_distribution')
-                )
+                countries, country_counts = zip(*analyzed_stats['all_countries'])
+                fig = dashboard_figure(results_id, 'country_distribution', lambda: figure_from_json(cached_pie_figure_json(
+                    country_counts, countries, label_articles, label_country
+                ), _t('article_country_distribution')))
                 st.plotly_chart(fig, use_container_width=True)
         
         with col2:
             # International collaboration
-            collaboration_data = {
-                translation_manager.get_text('type'): [translation_manager.get_text('single_country'), translation_manager.get_text('multiple_countries'), translation_manager.get_text('no_data')],
-                translation_manager.get_text('articles'): [
-                    analyzed_stats['single_country_articles'],
-                    analyzed_stats['multi_country_articles'],
-                    analyzed_stats['no_country_articles']
-                ]
-            }
-            fig = px.bar(
-                collaboration_data, 
-                x=translation_manager.get_text('type'), 
-                y=translation_manager.get_text('articles'),
-                title=translation_manager.get_text('international_collaboration'),
-                color=translation_manager.get_text('type')
+            collaboration_types = (_t('single_country'), _t('multiple_countries'), _t('no_data'))
+            collaboration_counts = (
+                analyzed_stats['single_country_articles'],
+                analyzed_stats['multi_country_articles'],
+                analyzed_stats['no_country_articles']
             )
+            fig = dashboard_figure(results_id, 'international_collaboration', lambda: figure_from_json(cached_bar_figure_json(
+                collaboration_types, collaboration_counts, label_type, label_articles,
+                color_label=label_type
+            ), _t('international_collaboration')))
             st.plotly_chart(fig, use_container_width=True)
         
         # Contextual tooltip for international collaboration
-        with st.expander("🌐 " + translation_manager.get_text('about_international_collaboration'), expanded=False):
-            collab_info = glossary.get_detailed_info('International Collaboration')
+        with st.expander("🌐 " + _t('about_international_collaboration'), expanded=False):
+            collab_info = cached_detailed_info('International Collaboration')
             if collab_info:
-                st.write(f"**{translation_manager.get_text('definition')}:** {collab_info['definition']}")
-                st.write(f"**{translation_manager.get_text('significance_for_science')}:** " + translation_manager.get_text('high_international_articles_indicator'))
+                st.markdown(
+                    f"**{_t('definition')}:** {collab_info['definition']}\n\n"
+                    f"**{_t('significance_for_science')}:** {_t('high_international_articles_indicator')}"
+                )
     
-    with tab4:
-        st.subheader(translation_manager.get_text('tab_citations'))
+    elif selected_view == 3:
+        st.subheader(tab_titles[3])
         
         col1, col2 = st.columns(2)
         
         with col1:
             # Citations by thresholds
-            citation_thresholds = {
-                translation_manager.get_text('threshold'): ['≥10', '≥20', '≥30', '≥50'],
-                translation_manager.get_text('articles'): [
-                    analyzed_stats['articles_with_10_citations'],
-                    analyzed_stats['articles_with_20_citations'],
-                    analyzed_stats['articles_with_30_citations'],
-                    analyzed_stats['articles_with_50_citations']
-                ]
-            }
-            fig = px.bar(
-                citation_thresholds, 
-                x=translation_manager.get_text('threshold'), 
-                y=translation_manager.get_text('articles'),
-                title=translation_manager.get_text('articles_by_citation_thresholds'),
-                color=translation_manager.get_text('threshold')
+            threshold_counts = (
+                analyzed_stats['articles_with_10_citations'],
+                analyzed_stats['articles_with_20_citations'],
+                analyzed_stats['articles_with_30_citations'],
+                analyzed_stats['articles_with_50_citations']
             )
+            fig = dashboard_figure(results_id, 'citation_thresholds', lambda: figure_from_json(cached_bar_figure_json(
+                ('≥10', '≥20', '≥30', '≥50'), threshold_counts, label_threshold, label_articles,
+                color_label=label_threshold
+            ), _t('articles_by_citation_thresholds')))
             st.plotly_chart(fig, use_container_width=True)
         
         with col2:
             # Articles with/without citations
-            citation_status = {
-                translation_manager.get_text('status'): [translation_manager.get_text('with_citations'), translation_manager.get_text('without_citations')],
-                translation_manager.get_text('count'): [
-                    enhanced_stats['articles_with_citations'],
-                    enhanced_stats['articles_without_citations']
-                ]
-            }
-            fig = px.pie(
-                citation_status, 
-                values=translation_manager.get_text('count'), 
-                names=translation_manager.get_text('status'),
-                title=translation_manager.get_text('articles_by_citation_status')
+            citation_status_counts = (
+                enhanced_stats['articles_with_citations'],
+                enhanced_stats['articles_without_citations']
             )
+            fig = dashboard_figure(results_id, 'citation_status', lambda: figure_from_json(cached_pie_figure_json(
+                citation_status_counts, (_t('with_citations'), _t('without_citations')), label_count, label_status
+            ), _t('articles_by_citation_status')))
             st.plotly_chart(fig, use_container_width=True)
         
         # Contextual tooltip for JSCR
-        if fast_metrics.get('JSCR', 0) > 0:
-            with st.expander("🔍 " + translation_manager.get_text('jscr_explanation'), expanded=False):
-                jscr_info = glossary.get_detailed_info('JSCR')
+        jscr_value = fast_metrics.get('JSCR', 0)
+        if jscr_value > 0:
+            with st.expander("🔍 " + _t('jscr_explanation'), expanded=False):
+                jscr_info = cached_detailed_info('JSCR')
                 if jscr_info:
-                    st.write(f"**{translation_manager.get_text('current_value')}:** {fast_metrics['JSCR']}%")
-                    st.write(f"**{translation_manager.get_text('interpretation')}:** {jscr_info['interpretation']}")
+                    st.markdown(f"**{label_current_value}:** {jscr_value}%\n\n**{label_interpretation}:** {jscr_info['interpretation']}")
                     
                     # Visual indication
-                    jscr_value = fast_metrics['JSCR']
                     if jscr_value < 10:
-                        st.success("✅ " + translation_manager.get_text('low_self_citations_excellent'))
+                        st.success("✅ " + _t('low_self_citations_excellent'))
                     elif jscr_value < 20:
-                        st.info("ℹ️ " + translation_manager.get_text('moderate_self_citations_normal'))
+                        st.info("ℹ️ " + _t('moderate_self_citations_normal'))
                     elif jscr_value < 30:
-                        st.warning("⚠️ " + translation_manager.get_text('elevated_self_citations_attention'))
+                        st.warning("⚠️ " + _t('elevated_self_citations_attention'))
                     else:
-                        st.error("❌ " + translation_manager.get_text('high_self_citations_problems'))
+                        st.error("❌ " + _t('high_self_citations_problems'))
 
 # =============================================================================
 # 19. OPTIMIZED MAIN ANALYSIS FUNCTION
 # =============================================================================
 
-def analyze_journal_optimized(issn, period_str, special_analysis=False, include_ror_data=False, include_author_id_data=False):
-    """Optimized version of analyze_journal with parallel processing and caching"""
-    global delayer
-    delayer = AdaptiveDelayer()
-
-    analysis_start_time = time.time()
-    
-    # Создаем контейнер для счетчика общего времени
-    timer_container = st.empty()
-    timer_container.info("⏱️ Starting analysis...")
-    
-    state = get_analysis_state()
-    state.analysis_complete = False
-    
-    # Функция для обновления счетчика общего времени
-    def update_timer():
-        elapsed_time = time.time() - analysis_start_time
-        minutes = int(elapsed_time // 60)
-        seconds = int(elapsed_time % 60)
-        timer_container.info(f"⏱️ Total analysis time: {minutes:02d}:{seconds:02d}")
-    
-    # Запускаем обновление таймера в отдельном потоке
-    import threading
-    stop_timer = False
-    
-    def timer_thread():
-        while not stop_timer:
-            update_timer()
-            time.sleep(1)  # Обновляем каждую секунду
-    
-    timer_thread = threading.Thread(target=timer_thread, daemon=True)
-    timer_thread.start()
-    
-    # Set analysis modes
-    state.is_special_analysis = special_analysis
-    state.include_ror_data = include_ror_data
-    state.include_author_id_data = include_author_id_data
-    
-    # Predictive cache warmup
-    predictive_cache_warmup(issn)
-    
-    # Load metrics data in background
-    load_metrics_data()
-    
-    # Overall progress
-    overall_progress = st.progress(0)
-    overall_status = st.empty()
-    
-    # Period parsing
-    overall_status.text(translation_manager.get_text('parsing_period'))
-    
-    if state.is_special_analysis:
-        current_date = datetime.now()
-        from_date = (current_date - timedelta(days=1580)).strftime('%Y-%m-%d')
-        until_date = (current_date - timedelta(days=120)).strftime('%Y-%m-%d')
-        years = [current_date.year - 4, current_date.year - 3, current_date.year - 2, current_date.year - 1]
-        st.info(f"🔬 Special Analysis Mode: Using fixed period {from_date} to {until_date}")
-    else:
-        years = parse_period(period_str)
-        if not years:
-            return
-        from_date = f"{min(years)}-01-01"
-        until_date = f"{max(years)}-12-31"
-    
-    overall_progress.progress(0.1)
-    
-    # Journal name (optimized with caching)
-    overall_status.text(translation_manager.get_text('getting_journal_name'))
-    journal_name = optimized_get_journal_name(issn)
-    st.success(translation_manager.get_text('journal_found').format(journal_name=journal_name, issn=issn))
-    overall_progress.progress(0.2)
-    
+def run_analysis_pipeline(issn, from_date, until_date, state, overall_progress, overall_status):
+    """Загрузка статей и цитирований и расчет всех метрик (без Excel); None - если статьи не найдены"""
+    _t = translation_manager.tr
     # Article retrieval
-    overall_status.text(translation_manager.get_text('loading_articles'))
+    overall_status.text(_t('loading_articles'))
     items = fetch_articles_by_issn_period(issn, from_date, until_date)
     if not items:
-        st.error(translation_manager.get_text('no_articles_found'))
-        return
+        st.error(_t('no_articles_found'))
+        return None
 
     n_analyzed = len(items)
-    st.success(translation_manager.get_text('articles_found').format(count=n_analyzed))
+    st.success(_t('articles_found').format(count=n_analyzed))
     overall_progress.progress(0.3)
     
     # Data validation
-    overall_status.text(translation_manager.get_text('validating_data'))
+    overall_status.text(_t('validating_data'))
     validated_items = validate_and_clean_data(items)
     journal_prefix = get_doi_prefix(validated_items[0].get('DOI', '')) if validated_items else ''
     overall_progress.progress(0.4)
     
     # PARALLEL: Analyzed articles processing
-    overall_status.text(translation_manager.get_text('processing_articles'))
+    overall_status.text(_t('processing_articles'))
     
-    analyzed_metadata = []
-    dois = [item.get('DOI') for item in validated_items if item.get('DOI')]
+    all_dois = [item.get('DOI') for item in validated_items if item.get('DOI')]
+    # Повторяющиеся DOI загружаются один раз; результаты раскладываются по всем записям через словарь
+    dois = list(dict.fromkeys(all_dois))
+    if len(all_dois) > len(dois):
+        st.caption(_t('duplicate_dois_skipped').format(count=len(all_dois) - len(dois)))
+    metadata_by_doi = {}
     
-    # Use parallel metadata loading
+    # Пакетная предзагрузка: дальнейшие запросы по одному DOI берутся из кэша
+    overall_status.text(_t('getting_metadata'))
+    prefetch_metadata_batches(dois, state)
+    
+    # Use parallel metadata loading (счетчик выводится в подписи самого прогресс-бара)
     meta_progress = st.progress(0)
-    meta_status = st.empty()
     
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        futures = {executor.submit(parallel_metadata_loading, doi, state): doi for doi in dois}
+    meta_label = _t('getting_metadata')
+    executor = get_fetch_executor()
+    futures = {executor.submit(parallel_metadata_loading, doi, state): doi for doi in dois}
         
-        for i, future in enumerate(as_completed(futures)):
-            doi = futures[future]
-            try:
-                result = future.result()
-                analyzed_metadata.append({
-                    'doi': doi,
-                    'crossref': result['crossref'],
-                    'openalex': result['openalex']
-                })
-            except Exception as e:
-                st.error(f"Error processing DOI {doi}: {e}")
-            
-            progress = (i + 1) / len(dois)
-            meta_progress.progress(progress)
-            meta_status.text(f"{translation_manager.get_text('getting_metadata')}: {i + 1}/{len(dois)}")
+    for i, future in enumerate(as_completed(futures)):
+        doi = futures[future]
+        try:
+            result = future.result()
+            metadata_by_doi[doi] = {
+                'doi': doi,
+                'crossref': result['crossref'],
+                'openalex': result['openalex']
+            }
+        except Exception as e:
+            st.error(f"Error processing DOI {doi}: {e}")
+        
+        if should_update_progress(i, len(dois)):
+            meta_progress.progress((i + 1) / len(dois), text=f"{meta_label}: {i + 1}/{len(dois)}")
     
     meta_progress.empty()
-    meta_status.empty()
+    analyzed_metadata = [metadata_by_doi[doi] for doi in all_dois if doi in metadata_by_doi]
     overall_progress.progress(0.6)
     
     # PARALLEL: Citing works retrieval and processing
-    overall_status.text(translation_manager.get_text('collecting_citations'))
+    overall_status.text(_t('collecting_citations'))
     
-    all_citing_metadata = []
-    analyzed_dois = [am['doi'] for am in analyzed_metadata if am.get('doi')]
+    all_analyzed_dois = [am['doi'] for am in analyzed_metadata if am.get('doi')]
+    analyzed_dois = list(dict.fromkeys(all_analyzed_dois))
+    citings_by_doi = {}
     
     citing_progress = st.progress(0)
-    citing_status = st.empty()
+    citing_label = _t('collecting_citations_progress')
     
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        futures = {executor.submit(get_citing_dois_and_metadata, (doi, state)): doi for doi in analyzed_dois}
+    executor = get_fetch_executor()
+    futures = {executor.submit(get_citing_dois_and_metadata, (doi, state)): doi for doi in analyzed_dois}
         
-        for i, future in enumerate(as_completed(futures)):
-            doi = futures[future]
-            try:
-                citings = future.result()
-                all_citing_metadata.extend(citings)
-            except Exception as e:
-                st.error(f"Error collecting citations for {doi}: {e}")
-            
-            progress = (i + 1) / len(analyzed_dois)
-            citing_progress.progress(progress)
-            citing_status.text(f"{translation_manager.get_text('collecting_citations_progress')}: {i + 1}/{len(analyzed_dois)}")
+    for i, future in enumerate(as_completed(futures)):
+        doi = futures[future]
+        try:
+            citings_by_doi[doi] = future.result()
+        except Exception as e:
+            st.error(f"Error collecting citations for {doi}: {e}")
+        
+        if should_update_progress(i, len(analyzed_dois)):
+            citing_progress.progress((i + 1) / len(analyzed_dois), text=f"{citing_label}: {i + 1}/{len(analyzed_dois)}")
     
     citing_progress.empty()
-    citing_status.empty()
+    all_citing_metadata = [citing for doi in all_analyzed_dois for citing in citings_by_doi.get(doi, ())]
     
     # Unique citing works
-    unique_citing_dois = set(c['doi'] for c in all_citing_metadata if c.get('doi'))
+    # Один .get на запись; регистр и префикс https://doi.org/ нормализуются, чтобы дубли не завышали счет
+    unique_citing_dois = {
+        doi.lower().removeprefix('https://doi.org/')
+        for doi in (c.get('doi') for c in all_citing_metadata)
+        if doi
+    }
     n_citing = len(unique_citing_dois)
-    st.success(translation_manager.get_text('unique_citing_works').format(count=n_citing))
+    st.success(_t('unique_citing_works').format(count=n_citing))
     overall_progress.progress(0.7)
     
     # PARALLEL: Statistics and metrics calculation
-    overall_status.text(translation_manager.get_text('calculating_statistics'))
+    overall_status.text(_t('calculating_statistics'))
     
     # Use parallel metrics calculation
     stats_progress = st.progress(0)
@@ -6119,10 +6386,158 @@ def analyze_journal_optimized(issn, period_str, special_analysis=False, include_
     if state.is_special_analysis and 'special_analysis' in additional_data:
         additional_data['special_analysis_metrics'] = additional_data['special_analysis']
     
+    return {
+        'n_analyzed': n_analyzed,
+        'n_citing': n_citing,
+        'analyzed_metadata': analyzed_metadata,
+        'all_citing_metadata': all_citing_metadata,
+        'analyzed_stats': analyzed_stats,
+        'citing_stats': citing_stats,
+        'enhanced_stats': enhanced_stats,
+        'citation_timing': citation_timing,
+        'overlap_details': overlap_details,
+        'fast_metrics': fast_metrics,
+        'additional_data': additional_data
+    }
+
+# Сырые списки метаданных хранятся в кэше сессии одним bytes-блоком,
+# а не тысячами вложенных dict (распаковываются только при повторном запуске)
+PACKED_PIPELINE_KEYS = ('analyzed_metadata', 'all_citing_metadata')
+
+def pack_records(records):
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(records)
+    return json.dumps(records, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def unpack_records(blob):
+    if ORJSON_AVAILABLE:
+        return orjson.loads(blob)
+    return json.loads(blob)
+
+def pack_pipeline(pipeline):
+    packed = dict(pipeline)
+    for key in PACKED_PIPELINE_KEYS:
+        packed[key] = pack_records(pipeline[key])
+    return packed
+
+def unpack_pipeline(packed):
+    pipeline = dict(packed)
+    for key in PACKED_PIPELINE_KEYS:
+        pipeline[key] = unpack_records(packed[key])
+    return pipeline
+
+def store_pipeline_cache(pipeline_cache, pipeline_key, pipeline):
+    """Положить результат в кэш сессии: устаревшие записи удаляются, старейшие сверх лимита вытесняются"""
+    now = time.time()
+    for key in [key for key, (cached_at, _) in pipeline_cache.items() if now - cached_at >= PIPELINE_CACHE_TTL]:
+        del pipeline_cache[key]
+    # dict хранит порядок вставки: повторный ключ переносим в конец
+    pipeline_cache.pop(pipeline_key, None)
+    while len(pipeline_cache) >= PIPELINE_CACHE_MAX_ENTRIES:
+        del pipeline_cache[next(iter(pipeline_cache))]
+    pipeline_cache[pipeline_key] = (now, pack_pipeline(pipeline))
+
+def analyze_journal_optimized(issn, period_str, special_analysis=False, include_ror_data=False, include_author_id_data=False):
+    """Optimized version of analyze_journal with parallel processing and caching"""
+    _t = translation_manager.tr
+    clear_work_caches()
+
+    analysis_start_time = time.time()
+    
+    # Создаем контейнер для счетчика общего времени
+    timer_container = st.empty()
+    timer_container.info("⏱️ Starting analysis...")
+    
+    state = get_analysis_state()
+    state.analysis_complete = False
+    
+    # Функция для обновления счетчика общего времени
+    def update_timer():
+        elapsed_time = time.time() - analysis_start_time
+        minutes = int(elapsed_time // 60)
+        seconds = int(elapsed_time % 60)
+        timer_container.info(f"⏱️ Total analysis time: {minutes:02d}:{seconds:02d}")
+    
+    # Запускаем обновление таймера в отдельном потоке
+    import threading
+    stop_timer = False
+    
+    def timer_thread():
+        while not stop_timer:
+            update_timer()
+            time.sleep(1)  # Обновляем каждую секунду
+    
+    timer_thread = threading.Thread(target=timer_thread, daemon=True)
+    timer_thread.start()
+    
+    # Set analysis modes
+    state.is_special_analysis = special_analysis
+    state.include_ror_data = include_ror_data
+    state.include_author_id_data = include_author_id_data
+    
+    # Predictive cache warmup
+    predictive_cache_warmup(issn)
+    
+    # Load metrics data in background
+    load_metrics_data()
+    
+    # Overall progress
+    overall_progress = st.progress(0)
+    overall_status = st.empty()
+    
+    # Period parsing
+    overall_status.text(_t('parsing_period'))
+    
+    if state.is_special_analysis:
+        current_date = datetime.now()
+        from_date = (current_date - timedelta(days=1580)).strftime('%Y-%m-%d')
+        until_date = (current_date - timedelta(days=120)).strftime('%Y-%m-%d')
+        years = [current_date.year - 4, current_date.year - 3, current_date.year - 2, current_date.year - 1]
+        st.info(f"🔬 Special Analysis Mode: Using fixed period {from_date} to {until_date}")
+    else:
+        years = parse_period(period_str)
+        if not years:
+            return
+        from_date = f"{min(years)}-01-01"
+        until_date = f"{max(years)}-12-31"
+    
+    overall_progress.progress(0.1)
+    
+    # Journal name (optimized with caching)
+    overall_status.text(_t('getting_journal_name'))
+    journal_name = optimized_get_journal_name(issn)
+    st.success(_t('journal_found').format(journal_name=journal_name, issn=issn))
+    overall_progress.progress(0.2)
+    
+    # Результаты расчета кэшируются в сессии по ISSN, периоду и режимам анализа:
+    # повторный запуск с теми же параметрами не загружает данные заново
+    pipeline_key = (issn, from_date, until_date, state.is_special_analysis, state.include_ror_data, state.include_author_id_data)
+    cached_pipeline = state.pipeline_cache.get(pipeline_key)
+    if cached_pipeline and time.time() - cached_pipeline[0] < PIPELINE_CACHE_TTL:
+        pipeline = unpack_pipeline(cached_pipeline[1])
+        st.info("♻️ " + _t('using_cached_analysis_results'))
+    else:
+        pipeline = run_analysis_pipeline(issn, from_date, until_date, state, overall_progress, overall_status)
+        if pipeline is None:
+            return
+        store_pipeline_cache(state.pipeline_cache, pipeline_key, pipeline)
+    
+    n_analyzed = pipeline['n_analyzed']
+    n_citing = pipeline['n_citing']
+    analyzed_metadata = pipeline['analyzed_metadata']
+    all_citing_metadata = pipeline['all_citing_metadata']
+    analyzed_stats = pipeline['analyzed_stats']
+    citing_stats = pipeline['citing_stats']
+    enhanced_stats = pipeline['enhanced_stats']
+    citation_timing = pipeline['citation_timing']
+    overlap_details = pipeline['overlap_details']
+    fast_metrics = pipeline['fast_metrics']
+    additional_data = pipeline['additional_data']
+    
     overall_progress.progress(0.9)
     
     # Report creation
-    overall_status.text(translation_manager.get_text('creating_report'))
+    overall_status.text(_t('creating_report'))
 
     analysis_end_time = time.time()
     analysis_duration = analysis_end_time - analysis_start_time
@@ -6134,8 +6549,9 @@ def analyze_journal_optimized(issn, period_str, special_analysis=False, include_
     
     excel_start_time = time.time()  # Таймер для генерации Excel
     
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f'journal_analysis_{issn}_{timestamp}.xlsx'
+    # Имя файла фиксируется один раз на анализ и не меняется при rerun
+    timestamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(excel_start_time))
+    state.excel_filename = f'journal_analysis_{issn}_{timestamp}.xlsx'
     
     # Create Excel file in memory
     excel_buffer = io.BytesIO()
@@ -6157,7 +6573,7 @@ def analyze_journal_optimized(issn, period_str, special_analysis=False, include_
         'additional': additional_data
     }
     
-    create_enhanced_excel_report(
+    excel_buffer = create_enhanced_excel_report(
         analyzed_metadata, 
         all_citing_metadata, 
         analyzed_stats, 
@@ -6170,7 +6586,8 @@ def analyze_journal_optimized(issn, period_str, special_analysis=False, include_
         additional_data
     )
     
-    excel_buffer.seek(0)
+    if excel_buffer is not None:
+        excel_buffer.seek(0)
     state.excel_buffer = excel_buffer
 
     excel_end_time = time.time()
@@ -6183,7 +6600,7 @@ def analyze_journal_optimized(issn, period_str, special_analysis=False, include_
     excel_seconds = int(excel_duration % 60)
     
     overall_progress.progress(1.0)
-    overall_status.text(translation_manager.get_text('analysis_complete'))
+    overall_status.text(_t('analysis_complete'))
 
     st.success(f"🎉 Complete analysis finished in {total_minutes}m {total_seconds}s")
     st.info(f"⏱️ Breakdown: Data analysis - {minutes}m {seconds}s, Excel generation - {excel_minutes}m {excel_seconds}s")
@@ -6204,8 +6621,10 @@ def analyze_journal_optimized(issn, period_str, special_analysis=False, include_
         'issn': issn,
         'period': period_str,
         'n_analyzed': n_analyzed,
-        'n_citing': n_citing
+        'n_citing': n_citing,
+        'results_id': new_results_id()
     }
+    state.figure_cache.clear()
     
     # Add special analysis metrics to results if available
     if state.is_special_analysis:
@@ -6234,11 +6653,75 @@ def analyze_journal_optimized(issn, period_str, special_analysis=False, include_
 # 20. UPDATED MAIN INTERFACE WITH OPTIMIZED ANALYSIS
 # =============================================================================
 
+# Статичные тексты информационного блока боковой панели (собираются один раз при импорте)
+CAPABILITY_KEYS = tuple(f'capability_{i}' for i in range(1, 9))
+NOTE_KEYS = tuple(f'note_text_{i}' for i in range(1, 6))
+NEW_FEATURES_MD = (
+    "- **NEW:** Special Analysis metrics (CiteScore & Impact Factor)\n"
+    "- **NEW:** ROR organization data integration\n"
+    "- **NEW:** Author ID data (ORCID, Scopus ID, WoS ID)\n"
+)
+
+@ui_fragment
+def render_term_dictionary():
+    """Словарь терминов в боковой панели и прогресс изучения"""
+    _t = translation_manager.tr
+    glossary = get_glossary()
+    
+    # Dictionary term search widget
+    search_term = st.selectbox(
+        _t('select_term_to_learn'),
+        options=[""] + list(glossary.terms.keys()),
+        format_func=lambda x: _t('choose_term') if x == "" else glossary.term_labels[x],
+        help=_t('study_metric_meanings')
+    )
+    
+    # Термин изменился только если выбор отличается от последнего показанного
+    term_changed = search_term != st.session_state.get('_last_term')
+    if term_changed:
+        st.session_state['_last_term'] = search_term
+    
+    if search_term:
+        term_info = cached_detailed_info(search_term)
+        if term_info:
+            st.info(f"**{term_info['term']}**\n\n{term_info['definition']}")
+            st.caption(f"**{_t('calculation')}:** {term_info['calculation']}")
+            st.caption(f"**{_t('interpretation')}:** {term_info['interpretation']}")
+            st.caption(f"**{_t('example')}:** {term_info['example']}")
+            st.caption(f"**{_t('category')}:** {term_info['category']}")
+            
+            # Mark viewed term
+            if term_changed and search_term not in st.session_state.viewed_terms:
+                st.session_state.viewed_terms.add(search_term)
+                st.toast(_t('learned_term_toast').format(term=search_term), icon="🎯")
+            
+            # "I understood" button
+            if st.button(_t('term_understood'), key=f"understand_{search_term}"):
+                if search_term not in st.session_state.learned_terms:
+                    st.session_state.learned_terms.add(search_term)
+                    st.success(_t('term_added_success').format(term=search_term))
+                    st.balloons()
+    
+    # Learned terms statistics
+    if st.session_state.learned_terms:
+        st.markdown("---")
+        st.header("🎓 " + _t('your_progress'))
+        learned_count = len(st.session_state.learned_terms)
+        total_terms = len(glossary.terms)
+        progress = learned_count / total_terms
+        
+        st.write(f"{_t('learned_terms')}: **{learned_count}/{total_terms}**")
+        st.progress(progress)
+        
+        if learned_count >= 5:
+            st.success(_t('progress_great').format(count=learned_count))
+        elif learned_count >= 2:
+            st.info(_t('progress_good'))
+
 def main_optimized():
     """Optimized main interface using enhanced analysis"""
     initialize_analysis_state()
     state = get_analysis_state()
-    
     # Language selector in sidebar
     with st.sidebar:
         st.header("🌍 Language")
@@ -6250,18 +6733,22 @@ def main_optimized():
         )
         translation_manager.set_language(selected_language)
     
+    # Локальная ссылка на переводы: интерфейс обращается к ним десятки раз за rerun.
+    # translation_manager.tr привязан к словарю текущего языка - берется только после set_language
+    _t = translation_manager.tr
+    
     # Header
-    st.title("🔬 " + translation_manager.get_text('app_title'))
+    st.title("🔬 " + _t('app_title'))
     st.markdown("---")
     
     # Sidebar with data input
     with st.sidebar:
-        st.header("📝 " + translation_manager.get_text('analysis_parameters'))
+        st.header("📝 " + _t('analysis_parameters'))
         
         issn = st.text_input(
-            translation_manager.get_text('journal_issn'),
+            _t('journal_issn'),
             value="2411-1414",
-            help=glossary.get_tooltip('ISSN')
+            help=cached_tooltip('ISSN')
         )
         
         # Special Analysis checkbox
@@ -6273,9 +6760,9 @@ def main_optimized():
         
         # Period input - disabled when Special Analysis is active
         period = st.text_input(
-            translation_manager.get_text('analysis_period'),
+            _t('analysis_period'),
             value="2022-2025",
-            help=translation_manager.get_text('period_examples'),
+            help=_t('period_examples'),
             disabled=special_analysis
         )
         
@@ -6301,53 +6788,19 @@ def main_optimized():
         if include_author_id_data:
             st.info("👤 Author ID Data: Author identifiers (ORCID, Scopus ID, WoS ID) will be included in Author_ID_data sheet")
         
+        if st.button("🗑️ " + _t('clear_doi_cache')):
+            state.doi_cache.clear()
+            clear_work_caches()
+            state.crossref_cache.clear()
+            state.openalex_cache.clear()
+            state.citing_cache.clear()
+            state.pipeline_cache.clear()
+            st.success(_t('doi_cache_cleared'))
+        
         st.markdown("---")
-        st.header("📚 " + translation_manager.get_text('dictionary_of_terms'))
-        
-        # Dictionary term search widget
-        search_term = st.selectbox(
-            translation_manager.get_text('select_term_to_learn'),
-            options=[""] + list(glossary.terms.keys()),
-            format_func=lambda x: translation_manager.get_text('choose_term') if x == "" else f"{x} ({glossary.terms[x]['category']})",
-            help=translation_manager.get_text('study_metric_meanings')
-        )
+        st.header("📚 " + _t('dictionary_of_terms'))
         
-        if search_term:
-            term_info = glossary.get_detailed_info(search_term)
-            if term_info:
-                st.info(f"**{term_info['term']}**\n\n{term_info['definition']}")
-                st.caption(f"**{translation_manager.get_text('calculation')}:** {term_info['calculation']}")
-                st.caption(f"**{translation_manager.get_text('interpretation')}:** {term_info['interpretation']}")
-                st.caption(f"**{translation_manager.get_text('example')}:** {term_info['example']}")
-                st.caption(f"**{translation_manager.get_text('category')}:** {term_info['category']}")
-                
-                # Mark viewed term
-                if search_term not in st.session_state.viewed_terms:
-                    st.session_state.viewed_terms.add(search_term)
-                    st.toast(translation_manager.get_text('learned_term_toast').format(term=search_term), icon="🎯")
-                
-                # "I understood" button
-                if st.button(translation_manager.get_text('term_understood'), key=f"understand_{search_term}"):
-                    if search_term not in st.session_state.learned_terms:
-                        st.session_state.learned_terms.add(search_term)
-                        st.success(translation_manager.get_text('term_added_success').format(term=search_term))
-                        st.balloons()
-        
-        # Learned terms statistics
-        if st.session_state.learned_terms:
-            st.markdown("---")
-            st.header("🎓 " + translation_manager.get_text('your_progress'))
-            learned_count = len(st.session_state.learned_terms)
-            total_terms = len(glossary.terms)
-            progress = learned_count / total_terms
-            
-            st.write(f"{translation_manager.get_text('learned_terms')}: **{learned_count}/{total_terms}**")
-            st.progress(progress)
-            
-            if learned_count >= 5:
-                st.success(translation_manager.get_text('progress_great').format(count=learned_count))
-            elif learned_count >= 2:
-                st.info(translation_manager.get_text('progress_good'))
+        render_term_dictionary()
         
         # Documentation download
         st.markdown("---")
@@ -6376,57 +6829,44 @@ def main_optimized():
         st.caption("Contains detailed instructions and information about the application")
         
         st.markdown("---")
-        st.header("💡 " + translation_manager.get_text('information'))
-        
-        st.info("**" + translation_manager.get_text('analysis_capabilities') + ":**\n" +
-                "- " + translation_manager.get_text('capability_1') + "\n" +
-                "- " + translation_manager.get_text('capability_2') + "\n" + 
-                "- " + translation_manager.get_text('capability_3') + "\n" +
-                "- " + translation_manager.get_text('capability_4') + "\n" +
-                "- " + translation_manager.get_text('capability_5') + "\n" +
-                "- " + translation_manager.get_text('capability_6') + "\n" +
-                "- " + translation_manager.get_text('capability_7') + "\n" +
-                "- " + translation_manager.get_text('capability_8') + "\n" +
-                "- **NEW:** Special Analysis metrics (CiteScore & Impact Factor)\n" +
-                "- **NEW:** ROR organization data integration\n" +
-                "- **NEW:** Author ID data (ORCID, Scopus ID, WoS ID)\n")
-        
-        st.warning("**" + translation_manager.get_text('note') + ":** \n" +
-                  "- " + translation_manager.get_text('note_text_1') + "\n" +
-                  "- " + translation_manager.get_text('note_text_2') + "\n" +
-                  "- " + translation_manager.get_text('note_text_3') + "\n" +
-                  "- " + translation_manager.get_text('note_text_4') + "\n" +
-                  "- " + translation_manager.get_text('note_text_5') + "\n")
+        st.header("💡 " + _t('information'))
+        
+        st.info("**" + _t('analysis_capabilities') + ":**\n" +
+                "".join(f"- {_t(key)}\n" for key in CAPABILITY_KEYS) +
+                NEW_FEATURES_MD)
+        
+        st.warning("**" + _t('note') + ":** \n" +
+                  "".join(f"- {_t(key)}\n" for key in NOTE_KEYS))
     
     # Main area
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        st.subheader("🚀 " + translation_manager.get_text('start_analysis'))
+        st.subheader("🚀 " + _t('start_analysis'))
         
         # Use optimized analysis function
         if st.button("🚀 Start Optimized Analysis", type="primary", use_container_width=True):
             if not issn:
-                st.error(translation_manager.get_text('issn_required'))
+                st.error(_t('issn_required'))
                 return
                 
             if not period and not special_analysis:
-                st.error(translation_manager.get_text('period_required'))
+                st.error(_t('period_required'))
                 return
                 
             with st.spinner("Starting optimized analysis with parallel processing..."):
                 analyze_journal_optimized(issn, period, special_analysis, include_ror_data, include_author_id_data)
     
     with col2:
-        st.subheader("📤 " + translation_manager.get_text('results'))
+        st.subheader("📤 " + _t('results'))
         
         if state.analysis_complete and state.excel_buffer is not None:
             results = state.analysis_results
             
             st.download_button(
-                label="📥 " + translation_manager.get_text('download_excel_report'),
+                label="📥 " + _t('download_excel_report'),
                 data=state.excel_buffer,
-                file_name=f"journal_analysis_{results['issn']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+                file_name=state.excel_filename,
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                 use_container_width=True
             )
@@ -6434,26 +6874,27 @@ def main_optimized():
     # Results display (same as original)
     if state.analysis_complete:
         st.markdown("---")
-        st.header("📊 " + translation_manager.get_text('analysis_results'))
+        st.header("📊 " + _t('analysis_results'))
         
         results = state.analysis_results
+        analysis_duration = results.get('analysis_duration')
 
-        if 'analysis_duration' in results:
-            total_minutes = int(results['analysis_duration'] // 60)
-            total_seconds = int(results['analysis_duration'] % 60)
+        if analysis_duration is not None:
+            total_minutes = int(analysis_duration // 60)
+            total_seconds = int(analysis_duration % 60)
             st.success(f"⏱️ Total processing time: {total_minutes}m {total_seconds}s")
         
         # Summary information
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric(translation_manager.get_text('journal'), results['journal_name'])
+            st.metric(_t('journal'), results['journal_name'])
         with col2:
-            st.metric(translation_manager.get_text('issn'), results['issn'])
+            st.metric(_t('issn'), results['issn'])
         with col3:
-            st.metric(translation_manager.get_text('period'), results['period'])
+            st.metric(_t('period'), results['period'])
         with col4:
-            st.metric(translation_manager.get_text('articles_analyzed'), results['n_analyzed'])
+            st.metric(_t('articles_analyzed'), results['n_analyzed'])
         
         # Visualizations
         create_visualizations(
@@ -6464,7 +6905,8 @@ def main_optimized():
             results['overlap_details'],
             results.get('fast_metrics', {}),
             results.get('additional_data', {}),
-            getattr(state, 'is_special_analysis', False) or results.get('special_analysis_metrics', {}).get('is_special_analysis', False)
+            getattr(state, 'is_special_analysis', False) or results.get('special_analysis_metrics', {}).get('is_special_analysis', False),
+            results.get('results_id')
         )
 
 # =============================================================================
@@ -3,47 +3,110 @@
 Мультиязычная поддержка для Advanced Journal Analysis Tool
 """
 
+import sys
+from collections import ChainMap
+from types import MappingProxyType
+
+# Поддерживаемые языки: код -> название для селектора (неизменяемое, общее для всех экземпляров)
+LANGUAGES = MappingProxyType({
+    'english': 'English 🇺🇸',
+    'russian': 'Русский 🇷🇺', 
+    'german': 'Deutsch 🇩🇪',
+    'spanish': 'Español 🇪🇸',
+    'italian': 'Italiano 🇮🇹',
+    'arabic': 'العربية 🇸🇦',
+    'chinese': '中文 🇨🇳',
+    'japanese': '日本語 🇯🇵'
+})
+
+# Загруженные словари переводов по коду языка - общие для всех экземпляров TranslationManager:
+# литерал каждого языка выполняется не более одного раза на процесс
+_LOADED_TRANSLATIONS = {}
+
+class _ResolvedTexts(dict):
+    """Разрешенные строки одного языка: промах разрешается через цепочку переводов и запоминается"""
+    __slots__ = ('lookup',)
+    
+    def __init__(self, lookup):
+        super().__init__()
+        self.lookup = lookup
+    
+    def __missing__(self, key):
+        text = self[key] = self.lookup.get(key, key)
+        return text
+
 class TranslationManager:
+    # Фиксированный набор атрибутов: без __dict__ у экземпляра, доступ по смещению слота
+    __slots__ = (
+        'languages', '_loaders', 'translations', '_chains', 'current_language',
+        '_text_cache', '_active_text_cache', 'tr'
+    )
+    
     def __init__(self):
-        self.languages = {
-            'english': 'English 🇺🇸',
-            'russian': 'Русский 🇷🇺', 
-            'german': 'Deutsch 🇩🇪',
-            'spanish': 'Español 🇪🇸',
-            'italian': 'Italiano 🇮🇹',
-            'arabic': 'العربية 🇸🇦',
-            'chinese': '中文 🇨🇳',
-            'japanese': '日本語 🇯🇵'
-        }
+        self.languages = LANGUAGES
         
-        self.translations = {
-            'english': self._get_english_translations(),
-            'russian': self._get_russian_translations(),
-            'german': self._get_german_translations(),
-            'spanish': self._get_spanish_translations(),
-            'italian': self._get_italian_translations(),
-            'arabic': self._get_arabic_translations(),
-            'chinese': self._get_chinese_translations(),
-            'japanese': self._get_japanese_translations()
+        # Словари переводов строятся лениво при первом обращении к языку
+        self._loaders = {
+            'english': self._get_english_translations,
+            'russian': self._get_russian_translations,
+            'german': self._get_german_translations,
+            'spanish': self._get_spanish_translations,
+            'italian': self._get_italian_translations,
+            'arabic': self._get_arabic_translations,
+            'chinese': self._get_chinese_translations,
+            'japanese': self._get_japanese_translations
         }
+        self.translations = _LOADED_TRANSLATIONS
+        # Цепочка поиска "язык -> английский" на язык (для английского - сам словарь)
+        self._chains = {}
         
-        self.current_language = 'english'
+        # Разрешенные строки: отдельный словарь на язык, активный выбирается в set_language
+        # (при смене языка кэш не сбрасывается, ключ поиска - сама строка без кортежа)
+        self._text_cache = {}
+        self._activate('english')
     
     def get_language_name(self, code):
-        return self.languages.get(code, code)
+        return LANGUAGES.get(code, code)
     
     def set_language(self, language_code):
-        if language_code in self.languages:
-            self.current_language = language_code
-        else:
-            self.current_language = 'english'
+        self._activate(language_code if language_code in self.languages else 'english')
     
-    def get_text(self, key):
-        """Получить перевод для указанного ключа"""
+    def _activate(self, language_code):
+        """Сделать язык текущим; tr - связанный __getitem__ его словаря строк (один вызов на C при попадании)"""
+        self.current_language = language_code
+        texts = self._text_cache.get(language_code)
+        if texts is None:
+            texts = self._text_cache[language_code] = _ResolvedTexts(self._chain_for(language_code))
+        self._active_text_cache = texts
+        self.tr = texts.__getitem__
+    
+    def _ensure_loaded(self, language_code):
+        """Словарь переводов языка (загружается при первом обращении)"""
+        try:
+            return self.translations[language_code]
+        except KeyError:
+            # Ключи интернируются один раз при загрузке: сравнение в словарях сводится к сравнению указателей;
+            # значения тоже - одинаковые во всех языках строки (названия, URL) хранятся одним объектом
+            translations = self.translations[language_code] = {
+                sys.intern(key): sys.intern(text) if isinstance(text, str) else text
+                for key, text in self._loaders[language_code]().items()
+            }
+            return translations
+    
+    def _chain_for(self, language_code):
+        """Переводы языка с откатом на английский одним отображением"""
         try:
-            return self.translations[self.current_language].get(key, self.translations['english'].get(key, key))
-        except:
-            return key
+            return self._chains[language_code]
+        except KeyError:
+            translations = self._ensure_loaded(language_code)
+            if language_code != 'english':
+                translations = ChainMap(translations, self._ensure_loaded('english'))
+            self._chains[language_code] = translations
+            return translations
+    
+    def get_text(self, key):
+        """Получить перевод для указанного ключа (в горячих местах - translation_manager.tr после set_language)"""
+        return self._active_text_cache[key]
     
     def _get_english_translations(self):
         return {
@@ -196,7 +259,6 @@ class TranslationManager:
             # Analysis details
             'total_references': 'Total References',
             'single_author_articles': 'Single Author Articles',
-            'international_collaboration': 'International Collaboration',
             'unique_countries': 'Unique Countries',
             'articles_10_citations': 'Articles with ≥10 citations',
             'unique_journals': 'Unique Journals',
@@ -205,7 +267,6 @@ class TranslationManager:
             'average_references_per_article': 'Average references per article',
             
             # No data messages
-            'no_overlaps_found': '❌ No overlaps between analyzed and citing works found',
             'no_data_for_report': 'No data for report',
             
             # Open access premium message
@@ -214,7 +275,6 @@ class TranslationManager:
             # Additional terms needed
             'language_selection': 'Language Selection',
             'select_language': 'Select language:',
-            'analysis_starting': 'Starting analysis...',
             'loaded_articles': 'Loaded {count} articles...',
             'articles_loaded': 'Loaded {count} articles',
             'and': 'and',
@@ -292,6 +352,10 @@ class TranslationManager:
             # Progress and learning
             'learned_terms': 'Learned terms',
             'analysis_starting': 'Starting analysis...',
+            'clear_doi_cache': 'Clear DOI cache',
+            'doi_cache_cleared': 'DOI metadata cache cleared',
+            'duplicate_dois_skipped': '{count} duplicate DOIs skipped',
+            'using_cached_analysis_results': 'Using cached analysis results for this ISSN and period',
             
             # Citations by year
             'citations_by_year': 'Citations by Year',
@@ -301,7 +365,6 @@ class TranslationManager:
             # Top authors
             'top_15_authors_analyzed': 'Top 15 Authors (Analyzed Articles)',
             'author': 'Author',
-            'articles': 'Articles',
             
             # Author count distribution
             'author_count_distribution': 'Author Count Distribution',
@@ -514,7 +577,6 @@ class TranslationManager:
             # Analysis details
             'total_references': 'Общее количество ссылок',
             'single_author_articles': 'Статьи с одним автором',
-            'international_collaboration': 'Международные статьи',
             'unique_countries': 'Уникальных стран',
             'articles_10_citations': 'Статьи с ≥10 цитированиями',
             'unique_journals': 'Уникальных журналов',
@@ -523,7 +585,6 @@ class TranslationManager:
             'average_references_per_article': 'Среднее ссылок на статью',
             
             # No data messages
-            'no_overlaps_found': '❌ Пересечения между анализируемыми и цитирующими работами не найдены',
             'no_data_for_report': 'Нет данных для отчета',
             
             # Open access premium message
@@ -532,7 +593,6 @@ class TranslationManager:
             # Additional terms needed
             'language_selection': 'Выбор языка',
             'select_language': 'Выберите язык:',
-            'analysis_starting': 'Запуск анализа...',
             'loaded_articles': 'Загружено {count} статей...',
             'articles_loaded': 'Загружено {count} статей',
             'and': 'и',
@@ -610,6 +670,10 @@ class TranslationManager:
             # Progress and learning
             'learned_terms': 'Изучено терминов',
             'analysis_starting': 'Запуск анализа...',
+            'clear_doi_cache': 'Очистить кэш DOI',
+            'doi_cache_cleared': 'Кэш метаданных DOI очищен',
+            'duplicate_dois_skipped': 'Пропущено повторяющихся DOI: {count}',
+            'using_cached_analysis_results': 'Используются сохраненные результаты анализа для этого ISSN и периода',
             
             # Citations by year
             'citations_by_year': 'Цитирования по годам',
@@ -619,7 +683,6 @@ class TranslationManager:
             # Top authors
             'top_15_authors_analyzed': 'Топ-15 авторов (анализируемые статьи)',
             'author': 'Автор',
-            'articles': 'Статьи',
             
             # Author count distribution
             'author_count_distribution': 'Распределение по количеству авторов',
@@ -832,7 +895,6 @@ class TranslationManager:
             # Analysis details
             'total_references': 'Gesamtreferenzen',
             'single_author_articles': 'Einzelautorenartikel',
-            'international_collaboration': 'Internationale Zusammenarbeit',
             'unique_countries': 'Einzigartige Länder',
             'articles_10_citations': 'Artikel mit ≥10 Zitationen',
             'unique_journals': 'Einzigartige Journals',
@@ -841,7 +903,6 @@ class TranslationManager:
             'average_references_per_article': 'Durchschnittliche Referenzen pro Artikel',
             
             # No data messages
-            'no_overlaps_found': '❌ Keine Überschneidungen zwischen analysierten und zitierenden Arbeiten gefunden',
             'no_data_for_report': 'Keine Daten für Bericht',
             
             # Open access premium message
@@ -850,7 +911,6 @@ class TranslationManager:
             # Additional terms needed
             'language_selection': 'Sprachauswahl',
             'select_language': 'Sprache auswählen:',
-            'analysis_starting': 'Analyse wird gestartet...',
             'loaded_articles': '{count} Artikel geladen...',
             'articles_loaded': '{count} Artikel geladen',
             'and': 'und',
@@ -928,6 +988,10 @@ class TranslationManager:
             # Progress and learning
             'learned_terms': 'Gelernte Begriffe',
             'analysis_starting': 'Analyse wird gestartet...',
+            'clear_doi_cache': 'DOI-Cache leeren',
+            'doi_cache_cleared': 'DOI-Metadaten-Cache geleert',
+            'duplicate_dois_skipped': '{count} doppelte DOIs übersprungen',
+            'using_cached_analysis_results': 'Zwischengespeicherte Analyseergebnisse für diese ISSN und diesen Zeitraum werden verwendet',
             
             # Citations by year
             'citations_by_year': 'Zitationen nach Jahr',
@@ -937,7 +1001,6 @@ class TranslationManager:
             # Top authors
             'top_15_authors_analyzed': 'Top 15 Autoren (analysierte Artikel)',
             'author': 'Autor',
-            'articles': 'Artikel',
             
             # Author count distribution
             'author_count_distribution': 'Autorenanzahl-Verteilung',
@@ -1150,7 +1213,6 @@ class TranslationManager:
             # Analysis details
             'total_references': 'Referencias Totales',
             'single_author_articles': 'Artículos de Autor Único',
-            'international_collaboration': 'Colaboración Internacional',
             'unique_countries': 'Países Únicos',
             'articles_10_citations': 'Artículos con ≥10 citas',
             'unique_journals': 'Revistas Únicas',
@@ -1159,7 +1221,6 @@ class TranslationManager:
             'average_references_per_article': 'Promedio de referencias por artículo',
             
             # No data messages
-            'no_overlaps_found': '❌ No se encontraron superposiciones entre trabajos analizados y citantes',
             'no_data_for_report': 'No hay datos para el informe',
             
             # Open access premium message
@@ -1168,7 +1229,6 @@ class TranslationManager:
             # Additional terms needed
             'language_selection': 'Selección de Idioma',
             'select_language': 'Seleccione idioma:',
-            'analysis_starting': 'Iniciando análisis...',
             'loaded_articles': 'Cargados {count} artículos...',
             'articles_loaded': 'Cargados {count} artículos',
             'and': 'y',
@@ -1246,6 +1306,10 @@ class TranslationManager:
             # Progress and learning
             'learned_terms': 'Términos aprendidos',
             'analysis_starting': 'Iniciando análisis...',
+            'clear_doi_cache': 'Borrar caché de DOI',
+            'doi_cache_cleared': 'Caché de metadatos de DOI borrada',
+            'duplicate_dois_skipped': '{count} DOI duplicados omitidos',
+            'using_cached_analysis_results': 'Usando resultados de análisis en caché para este ISSN y período',
             
             # Citations by year
             'citations_by_year': 'Citas por Año',
@@ -1255,7 +1319,6 @@ class TranslationManager:
             # Top authors
             'top_15_authors_analyzed': 'Top 15 Autores (Artículos Analizados)',
             'author': 'Autor',
-            'articles': 'Artículos',
             
             # Author count distribution
             'author_count_distribution': 'Distribución de Conteo de Autores',
@@ -1468,7 +1531,6 @@ class TranslationManager:
             # Analysis details
             'total_references': 'Riferimenti Totali',
             'single_author_articles': 'Articoli Autore Singolo',
-            'international_collaboration': 'Collaborazione Internazionale',
             'unique_countries': 'Paesi Unici',
             'articles_10_citations': 'Articoli con ≥10 citazioni',
             'unique_journals': 'Riviste Uniche',
@@ -1477,7 +1539,6 @@ class TranslationManager:
             'average_references_per_article': 'Media riferimenti per articolo',
             
             # No data messages
-            'no_overlaps_found': '❌ Nessuna sovrapposizione trovata tra lavori analizzati e citanti',
             'no_data_for_report': 'Nessun dato per il report',
             
             # Open access premium message
@@ -1486,7 +1547,6 @@ class TranslationManager:
             # Additional terms needed
             'language_selection': 'Selezione Lingua',
             'select_language': 'Seleziona lingua:',
-            'analysis_starting': 'Avvio analisi...',
             'loaded_articles': 'Caricati {count} articoli...',
             'articles_loaded': 'Caricati {count} articoli',
             'and': 'e',
@@ -1564,6 +1624,10 @@ class TranslationManager:
             # Progress and learning
             'learned_terms': 'Termini imparati',
             'analysis_starting': 'Avvio analisi...',
+            'clear_doi_cache': 'Svuota cache DOI',
+            'doi_cache_cleared': 'Cache dei metadati DOI svuotata',
+            'duplicate_dois_skipped': '{count} DOI duplicati ignorati',
+            'using_cached_analysis_results': 'Utilizzo dei risultati di analisi in cache per questo ISSN e periodo',
             
             # Citations by year
             'citations_by_year': 'Citazioni per Anno',
@@ -1573,7 +1637,6 @@ class TranslationManager:
             # Top authors
             'top_15_authors_analyzed': 'Top 15 Autori (Articoli Analizzati)',
             'author': 'Autore',
-            'articles': 'Articoli',
             
             # Author count distribution
             'author_count_distribution': 'Distribuzione Conteggio Autori',
@@ -1804,7 +1867,6 @@ class TranslationManager:
             # Additional terms needed
             'language_selection': 'اختيار اللغة',
             'select_language': 'اختر اللغة:',
-            'analysis_starting': 'بدء التحليل...',
             'loaded_articles': 'تم تحميل {count} مقال...',
             'articles_loaded': 'تم تحميل {count} مقال',
             'and': 'و',
@@ -1881,7 +1943,11 @@ class TranslationManager:
             
             # Progress and learning
             'learned_terms': 'المصطلحات التي تم تعلمها',
-            'analysis_starting': 'بدء التحليل...'
+            'analysis_starting': 'بدء التحليل...',
+            'clear_doi_cache': 'مسح ذاكرة التخزين المؤقت لـ DOI',
+            'doi_cache_cleared': 'تم مسح ذاكرة التخزين المؤقت لبيانات DOI الوصفية',
+            'duplicate_dois_skipped': 'تم تخطي {count} من معرفات DOI المكررة',
+            'using_cached_analysis_results': 'استخدام نتائج التحليل المخزنة مؤقتًا لهذا ISSN والفترة'
         }
     
     def _get_chinese_translations(self):
@@ -2053,7 +2119,6 @@ class TranslationManager:
             # Additional terms needed
             'language_selection': '语言选择',
             'select_language': '选择语言:',
-            'analysis_starting': '开始分析...',
             'loaded_articles': '已加载 {count} 篇文章...',
             'articles_loaded': '已加载 {count} 篇文章',
             'and': '和',
@@ -2130,7 +2195,11 @@ class TranslationManager:
             
             # Progress and learning
             'learned_terms': '已学习术语',
-            'analysis_starting': '开始分析...'
+            'analysis_starting': '开始分析...',
+            'clear_doi_cache': '清除 DOI 缓存',
+            'doi_cache_cleared': 'DOI 元数据缓存已清除',
+            'duplicate_dois_skipped': '已跳过 {count} 个重复 DOI',
+            'using_cached_analysis_results': '使用此 ISSN 和期间的缓存分析结果'
         }
     
     def _get_japanese_translations(self):
@@ -2302,7 +2371,6 @@ class TranslationManager:
             # Additional terms needed
             'language_selection': '言語選択',
             'select_language': '言語を選択:',
-            'analysis_starting': '分析を開始...',
             'loaded_articles': '{count} 記事を読み込みました...',
             'articles_loaded': '{count} 記事を読み込みました',
             'and': 'と',
@@ -2379,7 +2447,11 @@ class TranslationManager:
             
             # Progress and learning
             'learned_terms': '学習した用語',
-            'analysis_starting': '分析を開始...'
+            'analysis_starting': '分析を開始...',
+            'clear_doi_cache': 'DOIキャッシュをクリア',
+            'doi_cache_cleared': 'DOIメタデータのキャッシュをクリアしました',
+            'duplicate_dois_skipped': '重複した DOI {count} 件をスキップしました',
+            'using_cached_analysis_results': 'このISSNと期間のキャッシュされた分析結果を使用しています'
         }
 
 # Global translation manager instance
@@ -0,0 +1,45 @@
+import io
+import os
+import sys
+
+import openpyxl
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip('streamlit')
+pytest.importorskip('plotly')
+app = pytest.importorskip('app')
+
+
+@pytest.mark.parametrize('engine', ['xlsxwriter', 'openpyxl'])
+def test_sheet_with_inf_ratio(engine):
+    """Отношение с нулевым знаменателем (inf) записывается строкой 'inf', а не падает / теряется"""
+    if engine == 'xlsxwriter':
+        pytest.importorskip('xlsxwriter')
+        engine_kwargs = {'options': {'constant_memory': True}}
+    else:
+        engine_kwargs = {'write_only': True}
+
+    keywords = pd.DataFrame({
+        'Keyword': ['graphene', 'catalysis'],
+        'Share': [float('nan'), -float('inf')],
+        'Ratio': [1.5, float('inf')],
+    })
+
+    excel_buffer = io.BytesIO()
+    with pd.ExcelWriter(excel_buffer, engine=engine, engine_kwargs=engine_kwargs) as writer:
+        app.write_rows_to_sheet(writer, 'Keywords', tuple(keywords.columns), app.dataframe_rows(keywords))
+        app.write_rows_to_sheet(writer, 'Ratios', ('Keyword', 'Ratio'),
+                                app.value_rows(['graphene'], [float('inf')]))
+
+    excel_buffer.seek(0)
+    # Читаем сырые значения ячеек: read_excel сам превращает строку 'inf' обратно в float
+    workbook = openpyxl.load_workbook(excel_buffer, read_only=True)
+    assert list(workbook['Keywords'].values) == [
+        ('Keyword', 'Share', 'Ratio'),
+        ('graphene', None, 1.5),
+        ('catalysis', '-inf', 'inf'),
+    ]
+    assert list(workbook['Ratios'].values) == [('Keyword', 'Ratio'), ('graphene', 'inf')]